@@ -1,47 +1,109 @@
-from typing import TYPE_CHECKING, Callable, Iterable, Tuple, List, Optional
+import time
+from typing import TYPE_CHECKING, Callable, Tuple, Optional
 
 from ModularChess.artificial_intelligence.AI import AI
+from ModularChess.artificial_intelligence.MoveOrdering import MoveOrdering, sort_captures, TACTICAL, player_index
+from ModularChess.artificial_intelligence.SearchStatistics import SearchStatistics, PhaseProfiler, Phase
+from ModularChess.artificial_intelligence.TranspositionTable import TranspositionTable, Bound
+from ModularChess.movements.MoveEncoding import encode_move
 from ModularChess.movements.Promotion import Promotion
+from ModularChess.pieces.King import King
+from ModularChess.pieces.Pawn import Pawn
+from ModularChess.utils.Exceptions import InvalidMoveException, SearchTimeoutException
 
 if TYPE_CHECKING:
     from ModularChess.artificial_intelligence.Evaluator import Evaluator
     from ModularChess.movements.Movement import Movement
     from ModularChess.controller.Player import Player
+    from ModularChess.controller.Timer import Timer
 
-
-def sort_moves(moves: Iterable['Movement']) -> Iterable['Movement']:
-    sorted_moves: List[Tuple[float, "Movement"]] = []
-    for move in moves:
-        move_score = 0.0
-
-        # Prioritizes the move captures the most valuable piece with the least valuable piece
-        if move.piece_is_captured():
-            move_score += 10.0 * sum(piece.piece_value() for piece in move.captured_pieces()) - move.piece.piece_value()
-
-        # Prioritizes promotion moves
-        if isinstance(move, Promotion):
-            move_score += 10.0 * move.promoted_piece.piece_value()
-
-        # Prioritizes castling moves
-
-        # Penalize moves where enemy piece can capture
-
-        # Prioritize checks
-
-        sorted_moves.append((move_score, move))
-
-    return iter(move for _, move in sorted(sorted_moves, key=lambda x: x[0], reverse=True))
+# Width of the window of the null move searches, which only check if the score reaches beta (or alpha)
+NULL_WINDOW = 1e-6
+# Minimum remaining depth to reduce late moves
+REDUCTION_DEPTH = 3
 
 
 class BasicAI(AI):
 
-    def __init__(self, max_depth: int, player: "Player", evaluator: "Evaluator"):
+    def __init__(self, max_depth: int, player: "Player", evaluator: "Evaluator",
+                 transposition_table_size: float = 16., timer: Optional["Timer"] = None, moves_to_go: int = 30,
+                 quiescence: bool = True, delta_margin: Optional[float] = None,
+                 move_ordering: Optional[MoveOrdering] = None, null_move: bool = True, null_move_reduction: int = 2,
+                 late_move_reductions: bool = True, late_move_index: int = 3,
+                 aspiration_window: Optional[float] = 0.5, profile: bool = False,
+                 callback: Optional[Callable[[SearchStatistics], None]] = None, callback_nodes: int = 10000):
+        """
+        :param max_depth: Number of plies searched
+        :param player: Player controlled by the AI
+        :param evaluator: Evaluator of the positions of the game
+        :param transposition_table_size: Memory budget of the transposition table in MB, kept between moves
+        :param timer: Clock of the player. With a clock, moves are searched with iterative deepening (up to the maximum
+            depth) until the time budget of the move runs out
+        :param moves_to_go: Expected number of moves left, the remaining time is split between them
+        :param quiescence: Whether the leaves of the search are resolved with a quiescence search (only captures and
+            promotions) instead of being evaluated directly
+        :param delta_margin: Delta pruning of the quiescence search: captures that can't raise the score above alpha
+            by this margin (in piece values) are skipped. None disables it
+        :param move_ordering: Order of the moves searched, by default `MoveOrdering` with its default settings
+        :param null_move: Null-move pruning: the player passes the turn and, if a search with reduced depth still
+            reaches beta, the position is pruned. It isn't tried in check, after another null move or without pieces
+            other than pawns and kings (zugzwang positions, where passing would be the best move)
+        :param null_move_reduction: Plies the null move search is reduced (apart from the null move)
+        :param late_move_reductions: Quiet moves late in the ordering, which rarely are the best ones, are searched
+            one ply less, and searched again with full depth if they improve the score. Moves in check or giving
+            check aren't reduced
+        :param late_move_index: Number of moves of each position searched before reducing the rest
+        :param aspiration_window: Iterative deepening searches each iteration with a window of this width (in piece
+            values) around the score of the previous one, and searches again if the score falls outside. None
+            disables it
+        :param profile: Measures the time spent in each phase of the search (see `PhaseProfiler`), which slows it down
+        :param callback: Receives the statistics of the search while it runs (every `callback_nodes` nodes and after
+            each iteration) and when it finishes
+        :param callback_nodes: Nodes searched between calls to the callback
+        """
         self.max_depth = max_depth
+        self.transposition_table = TranspositionTable(transposition_table_size)
+        self.timer = timer
+        self.moves_to_go = moves_to_go
+        # Depth of the current search (root position) and time when it must be aborted
+        self.search_depth = max_depth
+        self.deadline: Optional[float] = None
+        # Set by `stop` to abort the current search
+        self.stopped = False
+        # Best move of the last completed iteration, searched first at the root
+        self.root_move: Optional[int] = None
+        self.quiescence = quiescence
+        self.delta_margin = delta_margin
+        self.move_ordering = MoveOrdering() if move_ordering is None else move_ordering
+        self.null_move = null_move
+        self.null_move_reduction = null_move_reduction
+        self.late_move_reductions = late_move_reductions
+        self.late_move_index = late_move_index
+        self.aspiration_window = aspiration_window
+        self.statistics = SearchStatistics()
+        self.profile = profile
+        self.profiler = PhaseProfiler(lambda: self.statistics)
+        self.callback = callback
+        self.callback_nodes = callback_nodes
+        # Number of nodes of the next call to the callback
+        self.next_report = float('inf')
         super().__init__(player, evaluator)
 
+    def make_move(self, move: "Movement") -> None:
+        """
+        Makes a move of the search and passes the turn. Searched moves are already legal, so they are made without
+        validating them again, as in `GameMode.perft`.
+        """
+        game_mode = self.evaluator.game_mode
+        game_mode.force_move(move)
+        game_mode.current_player_turn = next(game_mode.order)
+
     def decide_alpha_beta_path(self, move: "Movement") -> Callable[[float, float, int],
                                                                    Tuple[Optional["Movement"], float]]:
-        self.evaluator.game_mode.move(move)
+        self.make_move(move)
+        return self.alpha_beta_path()
+
+    def alpha_beta_path(self) -> Callable[[float, float, int], Tuple[Optional["Movement"], float]]:
         next_turn_player = self.evaluator.game_mode.current_player_turn
         if next_turn_player in self.player.allies:
             return self.alpha_beta_max
@@ -49,42 +111,377 @@ class BasicAI(AI):
             return self.alpha_beta_min
         raise Exception("Movement of piece which is not an ally nor an enemy")
 
+    def decide_quiescence_path(self, move: "Movement") -> Callable[[float, float], float]:
+        self.make_move(move)
+        next_turn_player = self.evaluator.game_mode.current_player_turn
+        if next_turn_player in self.player.allies:
+            return self.quiescence_max
+        elif next_turn_player in self.player.enemies:
+            return self.quiescence_min
+        raise Exception("Movement of piece which is not an ally nor an enemy")
+
+    def check_deadline(self) -> None:
+        """:raises SearchTimeoutException: if the deadline of the search has passed or the search was stopped"""
+        if self.deadline is not None and (self.stopped or time.perf_counter() >= self.deadline):
+            raise SearchTimeoutException("Search time budget exceeded")
+
+    def stop(self) -> None:
+        """
+        Aborts the iterative deepening search running in another thread, which returns the best move of the deepest
+        completed iteration (the first iteration is always completed).
+        """
+        self.stopped = True
+
+    def probe(self, alpha: float, beta: float, depth_left: int) -> Tuple[Optional[float], Optional[int]]:
+        """
+        Looks up the position in the transposition table.
+
+        :return: Score if the stored search makes the search unnecessary, and the stored best move
+        :raises SearchTimeoutException: if the deadline of the search has passed
+        """
+        self.check_deadline()
+        entry = self.transposition_table.probe(self.evaluator.game_mode.position_key)
+        if entry is None:
+            return None, self.root_move if depth_left == self.search_depth else None
+        self.statistics.transposition_hits += 1
+        hash_move = entry.move
+        # The root position is always searched, as its best move is needed
+        if depth_left == self.search_depth:
+            return None, hash_move if self.root_move is None else self.root_move
+        if entry.depth >= depth_left:
+            return entry.cutoff_score(alpha, beta), hash_move
+        return None, hash_move
+
+    def can_null_move(self, depth_left: int) -> bool:
+        """Checks the guards of null-move pruning (the bounds are checked by the caller)."""
+        game_mode = self.evaluator.game_mode
+        if not self.null_move or not self.null_move_reduction < depth_left < self.search_depth or \
+                game_mode.last_move_is_null():
+            return False
+        pieces = game_mode.board.pieces[game_mode.current_player_turn]
+        return any(pieces_of_type for piece_type, pieces_of_type in pieces.items()
+                   if not issubclass(piece_type, (Pawn, King))) and not game_mode.is_in_check()
+
+    def null_move_score(self, alpha: float, beta: float, depth_left: int) -> float:
+        """Score of the position after passing the turn, searched with reduced depth."""
+        game_mode = self.evaluator.game_mode
+        n_moves = len(game_mode.moves)
+        self.statistics.null_move_searches += 1
+        game_mode.make_null_move()
+        try:
+            return self.alpha_beta_path()(alpha, beta, depth_left - 1 - self.null_move_reduction)[1]
+        finally:
+            # The moves of an aborted search are still made
+            if len(game_mode.moves) != n_moves:
+                game_mode.undo_move(len(game_mode.moves) - n_moves)
+            game_mode.undo_null_move()
+
+    def search_move(self, code: int, move: "Movement", index: int, alpha: float, beta: float, depth_left: int,
+                    in_check: bool) -> float:
+        """
+        Makes the move, searches it and undoes it. Late quiet moves are first searched with reduced depth, and only
+        searched again with full depth if the reduced search doesn't fail low for the player of the move.
+
+        :param index: Position of the move in the ordering
+        :param in_check: Whether the player of the move is in check
+        """
+        game_mode = self.evaluator.game_mode
+        path = self.decide_alpha_beta_path(move)
+        if self.late_move_reductions and index >= self.late_move_index and depth_left >= REDUCTION_DEPTH and \
+                not code & TACTICAL and not in_check and not game_mode.is_in_check():
+            self.statistics.reduced_searches += 1
+            score = path(alpha, beta, depth_left - 2)[1]
+            if score <= alpha if move.player in self.player.allies else score >= beta:
+                game_mode.undo_move(1)
+                return score
+            self.statistics.reduction_researches += 1
+        score = path(alpha, beta, depth_left - 1)[1]
+        game_mode.undo_move(1)
+        return score
+
+    def is_futile(self, move: "Movement", stand_pat: float, bound: float, maximizing: bool) -> bool:
+        """Delta pruning: checks if the material won by the move plus the margin can't reach the bound."""
+        if self.delta_margin is None:
+            return False
+        gain = sum(piece.piece_value() for piece in move.captured_pieces()) + self.delta_margin
+        if isinstance(move, Promotion):
+            gain += move.promoted_piece.piece_value() - move.piece.piece_value()
+        return stand_pat + gain <= bound if maximizing else stand_pat - gain >= bound
+
+    def quiescence_max(self, alpha: float, beta: float) -> float:
+        """
+        Resolves the captures and promotions of the position (of an ally of the player) before evaluating it, so the
+        search doesn't stop in the middle of an exchange. The player can decline the captures (stand pat).
+        """
+        self.check_deadline()
+        stand_pat = self.evaluator.score(self.player)
+        if stand_pat >= beta:
+            return beta
+        alpha = max(alpha, stand_pat)
+
+        for move in sort_captures(self.evaluator.game_mode.generate_captures()):
+            if self.is_futile(move, stand_pat, alpha, True):
+                continue
+            self.count_node(quiescence=True)
+            score = self.decide_quiescence_path(move)(alpha, beta)
+            self.evaluator.game_mode.undo_move(1)
+            if score >= beta:
+                return beta  # pruning
+            alpha = max(alpha, score)
+        return alpha
+
+    def quiescence_min(self, alpha: float, beta: float) -> float:
+        """Quiescence search of a position of an enemy of the player, see `quiescence_max`."""
+        self.check_deadline()
+        stand_pat = self.evaluator.score(self.player)
+        if stand_pat <= alpha:
+            return alpha
+        beta = min(beta, stand_pat)
+
+        for move in sort_captures(self.evaluator.game_mode.generate_captures()):
+            if self.is_futile(move, stand_pat, beta, False):
+                continue
+            self.count_node(quiescence=True)
+            score = self.decide_quiescence_path(move)(alpha, beta)
+            self.evaluator.game_mode.undo_move(1)
+            if score <= alpha:
+                return alpha  # pruning
+            beta = min(beta, score)
+        return beta
+
     def alpha_beta_max(self, alpha: float, beta: float, depth_left: int) -> Tuple[Optional["Movement"], float]:
+        self.count_node()
         if depth_left == 0:
-            return None, self.evaluator.score(self.player)
+            return None, self.quiescence_max(alpha, beta) if self.quiescence else self.evaluator.score(self.player)
+
+        score, hash_move = self.probe(alpha, beta, depth_left)
+        if score is not None:
+            return None, score
 
+        game_mode = self.evaluator.game_mode
+        key = game_mode.position_key
+        if beta != float('inf') and self.can_null_move(depth_left) and self.evaluator.score(self.player) >= beta and \
+                self.null_move_score(beta - NULL_WINDOW, beta, depth_left) >= beta:
+            self.statistics.null_move_cutoffs += 1
+            self.transposition_table.store(key, depth_left, beta, Bound.LOWER, None)
+            return None, beta  # pruning
+
+        ply = self.search_depth - depth_left
+        in_check = self.late_move_reductions and depth_left >= REDUCTION_DEPTH and game_mode.is_in_check()
         best_move: Optional["Movement"] = None
-        for move in sort_moves(self.evaluator.game_mode.generate_moves()):
-            score = self.decide_alpha_beta_path(move)(alpha, beta, depth_left - 1)[1]
-            self.evaluator.game_mode.undo_move(1)
+        best_code: Optional[int] = None
+        for index, (code, move) in enumerate(self.move_ordering.order(game_mode, ply, hash_move)):
+            score = self.search_move(code, move, index, alpha, beta, depth_left, in_check)
             if score >= beta:
+                self.count_cutoff(index)
+                self.transposition_table.store(key, depth_left, beta, Bound.LOWER, code)
+                self.move_ordering.update(code, player_index(game_mode, move.player), ply, depth_left)
                 return None, beta  # pruning
             if score > alpha:
                 alpha = score
-                best_move = move
+                best_move, best_code = move, code
+        self.transposition_table.store(key, depth_left, alpha, Bound.UPPER if best_move is None else Bound.EXACT,
+                                       best_code)
         return best_move, alpha
 
     def alpha_beta_min(self, alpha: float, beta: float, depth_left: int) -> Tuple[Optional["Movement"], float]:
+        self.count_node()
         if depth_left == 0:
-            return None, self.evaluator.score(self.player)
+            return None, self.quiescence_min(alpha, beta) if self.quiescence else self.evaluator.score(self.player)
+
+        score, hash_move = self.probe(alpha, beta, depth_left)
+        if score is not None:
+            return None, score
 
+        game_mode = self.evaluator.game_mode
+        key = game_mode.position_key
+        if alpha != float('-inf') and self.can_null_move(depth_left) and self.evaluator.score(self.player) <= alpha \
+                and self.null_move_score(alpha, alpha + NULL_WINDOW, depth_left) <= alpha:
+            self.statistics.null_move_cutoffs += 1
+            self.transposition_table.store(key, depth_left, alpha, Bound.UPPER, None)
+            return None, alpha  # pruning
+
+        ply = self.search_depth - depth_left
+        in_check = self.late_move_reductions and depth_left >= REDUCTION_DEPTH and game_mode.is_in_check()
         best_move: Optional["Movement"] = None
-        for move in sort_moves(self.evaluator.game_mode.generate_moves()):
-            score = self.decide_alpha_beta_path(move)(alpha, beta, depth_left - 1)[1]
-            self.evaluator.game_mode.undo_move(1)
+        best_code: Optional[int] = None
+        for index, (code, move) in enumerate(self.move_ordering.order(game_mode, ply, hash_move)):
+            score = self.search_move(code, move, index, alpha, beta, depth_left, in_check)
             if score <= alpha:
+                self.count_cutoff(index)
+                self.transposition_table.store(key, depth_left, alpha, Bound.UPPER, code)
+                self.move_ordering.update(code, player_index(game_mode, move.player), ply, depth_left)
                 return None, alpha  # pruning
             if score < beta:
                 beta = score
-                best_move = move
+                best_move, best_code = move, code
+        self.transposition_table.store(key, depth_left, beta, Bound.LOWER if best_move is None else Bound.EXACT,
+                                       best_code)
         return best_move, beta
 
+    def count_node(self, quiescence: bool = False) -> None:
+        statistics = self.statistics
+        if quiescence:
+            statistics.quiescence_nodes += 1
+        else:
+            statistics.nodes += 1
+        if statistics.nodes + statistics.quiescence_nodes >= self.next_report:
+            self.report()
+
+    def count_cutoff(self, index: int) -> None:
+        self.statistics.cutoffs += 1
+        if index == 0:
+            self.statistics.first_move_cutoffs += 1
+
+    def report(self) -> None:
+        """Sends the statistics of the current search to the callback."""
+        self.statistics.update_time()
+        if self.callback is not None:
+            self.callback(self.statistics)
+            self.next_report = self.statistics.nodes + self.statistics.quiescence_nodes + self.callback_nodes
+
+    def set_player(self, player: "Player") -> None:
+        """
+        Changes the player controlled by the AI. The transposition table is cleared if it's another player, as its
+        scores are relative to the previous one.
+        """
+        if player is not self.player:
+            self.transposition_table.clear()
+        self.player = player
+
+    def new_game(self) -> None:
+        """Forgets the transposition table and the move ordering state, which belong to the previous game."""
+        self.transposition_table.clear()
+        self.move_ordering.new_game()
+
+    def new_search(self) -> None:
+        """Resets the statistics and the move ordering state of the previous search, and starts profiling it."""
+        self.move_ordering.new_search()
+        self.statistics = SearchStatistics()
+        self.next_report = self.callback_nodes if self.callback is not None else float('inf')
+        if self.profile and not self.profiler.wrapped:
+            game_mode = self.evaluator.game_mode
+            for name in ("generate_encoded_moves", "generate_captures", "decode_move"):
+                self.profiler.wrap(game_mode, name, Phase.MOVE_GENERATION)
+            for name in ("is_legal_encoded_move", "check_valid_move"):
+                self.profiler.wrap(game_mode, name, Phase.LEGALITY)
+            for name in ("score", "evaluate_player"):
+                self.profiler.wrap(self.evaluator, name, Phase.EVALUATION)
+            self.profiler.wrap_generator(self.move_ordering, "order", Phase.ORDERING)
+
+    def finish_search(self) -> None:
+        """Stops profiling the search and reports its final statistics."""
+        self.profiler.restore()
+        self.next_report = float('inf')
+        self.report()
+
+    def aspiration_search(self, depth: int, previous_score: Optional[float]) -> Tuple[Optional["Movement"], float]:
+        """
+        Searches the root position with a window around the score of the previous iteration. If the score falls
+        outside the window, the side that failed is opened and the position searched again.
+
+        :param depth: Depth of the iteration
+        :param previous_score: Score of the previous iteration, None to search with the full window
+        :return: Best move and score
+        """
+        alpha, beta = float('-inf'), float('inf')
+        if self.aspiration_window is not None and previous_score is not None:
+            alpha, beta = previous_score - self.aspiration_window, previous_score + self.aspiration_window
+            self.statistics.aspiration_searches += 1
+        while True:
+            move, score = self.alpha_beta_max(alpha, beta, depth)
+            if score <= alpha and alpha != float('-inf'):
+                alpha = float('-inf')
+            elif score >= beta and beta != float('inf'):
+                beta = float('inf')
+            else:
+                return move, score
+            self.statistics.aspiration_researches += 1
+
     def score(self) -> float:
-        return self.alpha_beta_max(float('-inf'), float('inf'), self.max_depth)[1]
+        return self.fixed_depth_search()[1]
+
+    def fixed_depth_search(self) -> Tuple[Optional["Movement"], float]:
+        """Searches the current position with the maximum depth."""
+        self.search_depth, self.root_move = self.max_depth, None
+        self.new_search()
+        try:
+            move, score = self.alpha_beta_max(float('-inf'), float('inf'), self.max_depth)
+            self.statistics.depth, self.statistics.score = self.max_depth, score
+            self.statistics.best_move = None if move is None else encode_move(move)
+            return move, score
+        finally:
+            self.finish_search()
+
+    def time_budget(self) -> float:
+        """Seconds to search the next move: a share of the remaining time of the clock plus the increment."""
+        assert self.timer is not None
+        return self.allocate_time(self.timer.remaining_time().total_seconds(), self.timer.increment.total_seconds(),
+                                  self.moves_to_go)
+
+    @staticmethod
+    def allocate_time(remaining: float, increment: float, moves_to_go: int) -> float:
+        """
+        Splits the remaining time between the moves left, never using more than half of it.
+
+        :param remaining: Seconds left in the clock
+        :param increment: Seconds added after each move
+        :param moves_to_go: Expected number of moves left
+        :return: Seconds to search the next move
+        """
+        return max(min(remaining / moves_to_go + increment, remaining / 2), 0.)
+
+    def iterative_deepening(self, time_budget: float) -> Optional["Movement"]:
+        """
+        Searches with increasing depth (up to the maximum depth) until the time budget runs out. Each iteration
+        searches first the best move of the previous one. An iteration that runs out of time is aborted, and the moves
+        made by it are undone. The first iteration is always completed, so there is a move to play.
+
+        :param time_budget: Seconds to search
+        :return: Best move of the deepest completed iteration, None if there are no moves
+        """
+        game_mode = self.evaluator.game_mode
+        n_moves = len(game_mode.moves)
+        start = time.perf_counter()
+        best_move: Optional["Movement"] = None
+        score: Optional[float] = None
+        self.root_move = None
+        # A stop sent after the previous search finished doesn't abort this one
+        self.stopped = False
+        self.new_search()
+        try:
+            for depth in range(1, self.max_depth + 1):
+                self.search_depth = depth
+                self.deadline = start + time_budget if depth > 1 else None
+                move, score = self.aspiration_search(depth, score)
+                if move is None:
+                    break
+                best_move = move
+                self.root_move = encode_move(move)
+                self.statistics.depth, self.statistics.score, self.statistics.best_move = depth, score, self.root_move
+                self.report()
+        except SearchTimeoutException:
+            game_mode.undo_move(len(game_mode.moves) - n_moves)
+        finally:
+            self.deadline = None
+            self.stopped = False
+            self.finish_search()
+        return best_move
 
     def get_next_move(self) -> "Movement":
-        tmp = self.alpha_beta_max(float('-inf'), float('inf'), self.max_depth)
-        if tmp[0] is None:
-            tmp = self.alpha_beta_max(float('-inf'), float('inf'), self.max_depth)
-            raise Exception("No moves available")
-        return tmp[0]
+        return self.search()[0]
+
+    def search(self) -> Tuple["Movement", SearchStatistics]:
+        """
+        Searches the best move of the player, with iterative deepening if it has a clock.
+
+        :return: Best move and statistics of the search
+        :raises InvalidMoveException: if there are no moves
+        """
+        if self.timer is None:
+            best_move = self.fixed_depth_search()[0]
+        else:
+            best_move = self.iterative_deepening(self.time_budget())
+        if best_move is None:
+            raise InvalidMoveException("No moves available")
+        return best_move, self.statistics
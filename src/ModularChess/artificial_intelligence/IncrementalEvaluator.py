@@ -0,0 +1,111 @@
+from typing import TYPE_CHECKING, Callable, Dict, Optional, Tuple, Type, Iterable, Set, List
+
+import numpy as np
+import numpy.typing as npt
+
+from ModularChess.artificial_intelligence.Evaluator import Evaluator
+from ModularChess.controller.BoardObserver import BoardObserver
+
+if TYPE_CHECKING:
+    from ModularChess.controller.Player import Player
+    from ModularChess.game_modes.GameMode import GameMode
+    from ModularChess.pieces.Piece import Piece
+
+# Builds the bonus of a piece type in each square of a board shape, from the point of view of the first player
+PieceSquareTable = Callable[[Tuple[int, ...]], npt.NDArray[np.float64]]
+
+
+def centralization(weight: float) -> PieceSquareTable:
+    """Bonus decreasing linearly with the distance (in every axis) to the center of the board, 0 in the corners."""
+    def table(shape: Tuple[int, ...]) -> npt.NDArray[np.float64]:
+        distance = sum(np.abs(coordinates - (size - 1) / 2) / max((size - 1) / 2, 1)
+                       for coordinates, size in zip(np.indices(shape), shape))
+        bonus: npt.NDArray[np.float64] = weight * (len(shape) - distance)
+        return bonus
+
+    return table
+
+
+def advancement(weight: float) -> PieceSquareTable:
+    """Bonus increasing linearly with the first coordinate (towards the enemy), `weight` in the last row."""
+    def table(shape: Tuple[int, ...]) -> npt.NDArray[np.float64]:
+        bonus: npt.NDArray[np.float64] = weight * np.indices(shape)[0] / max(shape[0] - 1, 1)
+        return bonus
+
+    return table
+
+
+# Tables by the name of the piece type (or any of its base classes), in piece values
+DEFAULT_PIECE_SQUARE_TABLES: Dict[str, PieceSquareTable] = {
+    "Pawn": advancement(0.5),
+    "Knight": centralization(0.1),
+    "Bishop": centralization(0.05),
+    "Queen": centralization(0.02),
+}
+
+
+class IncrementalEvaluator(Evaluator, BoardObserver):
+    """
+    Material and piece-square evaluation kept up to date by the board: every addition, removal and movement of a piece
+    adds or subtracts the value of the piece in its square, so evaluating a player is a lookup. Each player except the
+    first one sees the tables flipped along the first axis (its pieces start in the other side of the board).
+    """
+
+    def __init__(self, game_mode: "GameMode", tables: Optional[Dict[str, PieceSquareTable]] = None,
+                 flipped_players: Optional[Iterable["Player"]] = None):
+        """
+        :param game_mode: Game to evaluate, the evaluator observes its board
+        :param tables: Piece-square tables by piece type name, by default `DEFAULT_PIECE_SQUARE_TABLES`
+        :param flipped_players: Players that see the tables flipped, by default all the players except the first one
+        """
+        super().__init__(game_mode)
+        self.tables = DEFAULT_PIECE_SQUARE_TABLES if tables is None else tables
+        self.flipped_players: Set["Player"] = set(game_mode.players[1:] if flipped_players is None else
+                                                  flipped_players)
+        # Value of each piece type of each player in each square
+        self.values: Dict[Tuple["Player", Type["Piece"]], List[float]] = {}
+        self.scores: Dict["Player", float] = {}
+        self.attach()
+
+    def piece_values(self, piece: "Piece") -> List[float]:
+        """Value of the piece (material and piece-square bonus) in each square, built the first time it's needed."""
+        key = (piece.player, type(piece))
+        values = self.values.get(key)
+        if values is None:
+            shape = self.game_mode.board.shape
+            table = next((self.tables[cls.__name__] for cls in type(piece).__mro__ if cls.__name__ in self.tables),
+                         None)
+            bonus = np.zeros(shape) if table is None else table(shape)
+            if piece.player in self.flipped_players:
+                bonus = np.flip(bonus, axis=0)
+            values = self.values[key] = (piece.piece_value() + bonus).reshape(-1).tolist()
+        return values
+
+    def attach(self) -> None:
+        """Computes the scores of the current position and starts observing the board."""
+        board = self.game_mode.board
+        self.scores = {player: 0. for player in self.game_mode.players}
+        for player, pieces_by_type in board.pieces.items():
+            for pieces in pieces_by_type.values():
+                for piece in pieces:
+                    self.piece_added(piece, board.tables.square_index(piece.position))
+        if self not in board.observers:
+            board.observers.append(self)
+
+    def detach(self) -> None:
+        """Stops observing the board."""
+        if self in self.game_mode.board.observers:
+            self.game_mode.board.observers.remove(self)
+
+    def piece_added(self, piece: "Piece", square: int) -> None:
+        self.scores[piece.player] = self.scores.get(piece.player, 0.) + self.piece_values(piece)[square]
+
+    def piece_removed(self, piece: "Piece", square: int) -> None:
+        self.scores[piece.player] -= self.piece_values(piece)[square]
+
+    def piece_moved(self, piece: "Piece", origin: int, destination: int) -> None:
+        values = self.piece_values(piece)
+        self.scores[piece.player] += values[destination] - values[origin]
+
+    def evaluate_player(self, player: "Player") -> float:
+        return self.scores.get(player, 0.)
@@ -0,0 +1,371 @@
+import random
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Optional, List, Tuple, Type, Dict, Sequence
+
+import numpy as np
+import numpy.typing as npt
+
+from ModularChess.artificial_intelligence.AI import AI
+from ModularChess.artificial_intelligence.MoveOrdering import TACTICAL
+from ModularChess.artificial_intelligence.ParallelAI import GameSetup
+from ModularChess.artificial_intelligence.PlaneEvaluator import PlaneEvaluator
+from ModularChess.movements.MoveEncoding import encode_move
+from ModularChess.utils.Exceptions import InvalidArgumentsError, InvalidMoveException
+
+if TYPE_CHECKING:
+    from ModularChess.artificial_intelligence.Evaluator import Evaluator
+    from ModularChess.controller.Player import Player
+    from ModularChess.movements.Movement import Movement
+
+FloatArray = npt.NDArray[np.float64]
+NO_NODE = -1
+
+
+class MCTSTree:
+    """
+    Search tree stored in NumPy arrays indexed by node (the root is the node 0), which grow by doubling. The children
+    of a node are contiguous, so they are selected with vectorized operations. Each node stores the encoded move that
+    leads to it, the index of the player of that move, and the visits and total reward of that player.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        capacity = max(capacity, 1)
+        self.size = 1
+        self.parent = np.full(capacity, NO_NODE, dtype=np.int32)
+        self.code = np.full(capacity, -1, dtype=np.int64)
+        self.player = np.full(capacity, -1, dtype=np.int16)
+        self.first_child = np.full(capacity, NO_NODE, dtype=np.int32)
+        self.n_children = np.zeros(capacity, dtype=np.int32)
+        self.terminal = np.zeros(capacity, dtype=np.bool_)
+        self.visits = np.zeros(capacity, dtype=np.float64)
+        self.value = np.zeros(capacity, dtype=np.float64)
+        self.prior = np.ones(capacity, dtype=np.float64)
+
+    ARRAYS = ("parent", "code", "player", "first_child", "n_children", "terminal", "visits", "value", "prior")
+
+    def __len__(self) -> int:
+        return self.size
+
+    def reserve(self, n_nodes: int) -> None:
+        capacity = len(self.parent)
+        if self.size + n_nodes <= capacity:
+            return
+        while capacity < self.size + n_nodes:
+            capacity *= 2
+        defaults = {"parent": NO_NODE, "code": -1, "player": -1, "first_child": NO_NODE, "prior": 1}
+        for name in self.ARRAYS:
+            array = getattr(self, name)
+            grown = np.full(capacity, defaults.get(name, 0), dtype=array.dtype)
+            grown[:self.size] = array[:self.size]
+            setattr(self, name, grown)
+
+    def expand(self, node: int, codes: Sequence[int], player: int, priors: FloatArray) -> None:
+        """Adds the moves of the player as children of the node."""
+        if not codes:
+            self.terminal[node] = True
+            return
+        self.reserve(len(codes))
+        start, end = self.size, self.size + len(codes)
+        self.parent[start:end] = node
+        self.code[start:end] = codes
+        self.player[start:end] = player
+        self.prior[start:end] = priors
+        self.first_child[node], self.n_children[node] = start, len(codes)
+        self.size = end
+
+    def children(self, node: int) -> slice:
+        start = int(self.first_child[node])
+        return slice(start, start + int(self.n_children[node]))
+
+    def select_child(self, node: int, exploration: float, puct: bool) -> int:
+        """
+        Child with the highest upper confidence bound: UCT (unvisited children first) or, with `puct`, PUCT (the
+        exploration of each child is weighted by its prior).
+        """
+        children = self.children(node)
+        visits, value = self.visits[children], self.value[children]
+        parent_visits = max(self.visits[node], 1.)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mean = np.where(visits > 0, value / visits, 0.5 if puct else np.inf)
+            if puct:
+                bound = mean + exploration * self.prior[children] * np.sqrt(parent_visits) / (1 + visits)
+            else:
+                bound = mean + exploration * np.sqrt(np.log(parent_visits) / visits)
+        return int(children.start + np.argmax(bound))
+
+    def most_visited_child(self, node: int = 0) -> int:
+        children = self.children(node)
+        return int(children.start + np.argmax(self.visits[children]))
+
+    def find_child(self, node: int, code: int) -> int:
+        if self.first_child[node] == NO_NODE:
+            return NO_NODE
+        matches = np.flatnonzero(self.code[self.children(node)] == code)
+        return int(self.first_child[node]) + int(matches[0]) if len(matches) else NO_NODE
+
+    def subtree(self, node: int) -> "MCTSTree":
+        """Copy of the subtree of the node, which becomes the root (used to reuse the tree after a move)."""
+        order = [node]
+        for current in order:
+            if self.first_child[current] != NO_NODE:
+                order.extend(range(*self.children(current).indices(self.size)))
+        indices = np.array(order)
+        new_index = np.full(self.size, NO_NODE, dtype=np.int32)
+        new_index[indices] = np.arange(len(indices))
+
+        tree = MCTSTree(len(indices))
+        for name in self.ARRAYS:
+            getattr(tree, name)[:len(indices)] = getattr(self, name)[indices]
+        tree.size = len(indices)
+        tree.parent = np.where(tree.parent >= 0, new_index[np.maximum(tree.parent, 0)], NO_NODE).astype(np.int32)
+        tree.parent[0] = NO_NODE
+        tree.first_child = np.where(tree.first_child >= 0, new_index[np.maximum(tree.first_child, 0)],
+                                    NO_NODE).astype(np.int32)
+        return tree
+
+
+@dataclass(frozen=True)
+class MCTSSettings:
+    evaluator_type: Type["Evaluator"]
+    iterations: int
+    time_limit: Optional[float]
+    exploration: float
+    puct: bool
+    batch_size: int
+    rollout_depth: int
+    score_scale: float
+    # Index of the player of the AI in the players of the game
+    player_index: int
+
+
+def search_root(setup: GameSetup, settings: MCTSSettings, seed: int) -> Tuple[List[int], List[float], List[float]]:
+    """
+    Runs an independent search of the game in a worker (root parallelization).
+
+    :return: Encoded moves of the root, and their visits and rewards
+    """
+    game_mode = setup.build()
+    ai = MonteCarloAI(game_mode.players[settings.player_index], settings.evaluator_type(game_mode),
+                      settings.iterations, settings.time_limit, settings.exploration, settings.puct,
+                      settings.batch_size, settings.rollout_depth, score_scale=settings.score_scale, seed=seed)
+    ai.search()
+    children = ai.tree.children(0)
+    return ai.tree.code[children].tolist(), ai.tree.visits[children].tolist(), ai.tree.value[children].tolist()
+
+
+class MonteCarloAI(AI):
+    """
+    Monte Carlo tree search: each iteration selects a path of the tree (UCT or PUCT), expands its last node, plays a
+    rollout with a cheap policy (random moves by default) and backs up the reward of each player, a sigmoid of its
+    score at the end of the rollout (1 for a win, 0 for a loss and 0.5 for a draw if the game ends). Iterations are run
+    in batches: the nodes of each path are visited before their rewards are known (a virtual loss), so the paths of a
+    batch diverge, and the final positions are scored together (in one call with a `PlaneEvaluator`). Unlike
+    alpha-beta, it doesn't assume two players, so it scales to any number of players and board dimensions.
+    """
+
+    def __init__(self, player: "Player", evaluator: "Evaluator", iterations: int = 1000,
+                 time_limit: Optional[float] = None, exploration: float = 1.4, puct: bool = False, batch_size: int = 8,
+                 rollout_depth: int = 20, rollout_policy: Optional[AI] = None, score_scale: float = 2.,
+                 reuse_tree: bool = True, workers: int = 1, seed: Optional[int] = None):
+        """
+        :param player: Player controlled by the AI
+        :param evaluator: Evaluator of the positions where the rollouts stop
+        :param iterations: Number of iterations of each search
+        :param time_limit: Seconds of each search, the search stops when the iterations or the time run out
+        :param exploration: Exploration constant of the selection
+        :param puct: Selection with PUCT (captures and promotions have twice the prior of quiet moves) instead of UCT
+        :param batch_size: Iterations selected before scoring their rollouts
+        :param rollout_depth: Maximum number of moves of each rollout
+        :param rollout_policy: AI playing the moves of the rollouts (i.e. `RandomAI`), by default random encoded moves
+        :param score_scale: Score (in piece values) that gives a reward of 0.73 (sigmoid of 1)
+        :param reuse_tree: Keeps the subtree of the position between searches
+        :param workers: Number of processes searching independent trees, whose root visits are added up (the game
+            mode must be constructible from its players and its board type, see `GameSetup`)
+        :param seed: Seed of the random moves of the rollouts
+        """
+        if iterations < 1 or batch_size < 1 or workers < 1:
+            raise InvalidArgumentsError("The iterations, batch size and workers must be positive integers")
+        super().__init__(player, evaluator)
+        self.iterations = iterations
+        self.time_limit = time_limit
+        self.exploration = exploration
+        self.puct = puct
+        self.batch_size = batch_size
+        self.rollout_depth = rollout_depth
+        self.rollout_policy = rollout_policy
+        self.score_scale = score_scale
+        self.reuse_tree = reuse_tree
+        self.workers = workers
+        self.rng = random.Random(seed)
+        self.executor: Optional[ProcessPoolExecutor] = None
+
+        self.tree = MCTSTree()
+        # Encoded moves of the game until the root of the tree
+        self.root_history: Tuple[int, ...] = ()
+        self.player_indices = {pl: index for index, pl in enumerate(evaluator.game_mode.players)}
+
+    def priors(self, codes: Sequence[int]) -> FloatArray:
+        if not self.puct:
+            return np.ones(len(codes))
+        priors = np.array([2. if code & TACTICAL else 1. for code in codes])
+        priors /= priors.sum()
+        return priors
+
+    def terminal_rewards(self) -> FloatArray:
+        """Rewards of a position without moves: a loss of the player in check (a win of its enemies) or a draw."""
+        game_mode = self.evaluator.game_mode
+        current = game_mode.current_player_turn
+        if not game_mode.is_in_check():
+            return np.full(len(game_mode.players), 0.5)
+        return np.array([1. if current.can_capture(pl) else 0. for pl in game_mode.players])
+
+    def rewards(self, scores: FloatArray) -> FloatArray:
+        with np.errstate(over="ignore"):
+            rewards: FloatArray = 1 / (1 + np.exp(-scores / self.score_scale))
+        return rewards
+
+    def score_weights(self) -> FloatArray:
+        """Matrix that turns the evaluations of a `PlaneEvaluator` into the scores of each player (columns)."""
+        assert isinstance(self.evaluator, PlaneEvaluator)
+        return np.stack([self.evaluator.score_weights(pl) for pl in self.evaluator.game_mode.players], axis=1)
+
+    def update_root(self) -> None:
+        """Moves the root to the current position, reusing the subtree of the previous search if possible."""
+        history = tuple(encode_move(move) for move in self.evaluator.game_mode.moves)
+        node = NO_NODE
+        if self.reuse_tree and history[:len(self.root_history)] == self.root_history:
+            node = 0
+            for code in history[len(self.root_history):]:
+                node = self.tree.find_child(node, code)
+                if node == NO_NODE:
+                    break
+        self.tree = self.tree.subtree(node) if node != NO_NODE else MCTSTree()
+        self.root_history = history
+
+    def make_move(self, move: "Movement") -> None:
+        """
+        Makes a move of the tree or of a rollout and passes the turn. The moves are generated legal, so they are made
+        without validating them again, as in `BasicAI.make_move`.
+        """
+        game_mode = self.evaluator.game_mode
+        game_mode.force_move(move)
+        game_mode.current_player_turn = next(game_mode.order)
+
+    def select(self) -> Tuple[List[int], bool]:
+        """
+        Selects a path from the root, making its moves, and expands its last node. Visits are added to the path.
+
+        :return: Nodes of the path, and whether its last node ends the game
+        """
+        tree, game_mode = self.tree, self.evaluator.game_mode
+        node = 0
+        path = [node]
+        while not tree.terminal[node]:
+            if tree.first_child[node] == NO_NODE:
+                # The rollouts start from the new nodes, which are expanded when they are selected again
+                if node != 0 and tree.visits[node] == 0:
+                    break
+                codes = game_mode.generate_encoded_moves()
+                tree.expand(node, codes, self.player_indices[game_mode.current_player_turn], self.priors(codes))
+                if tree.terminal[node]:
+                    break
+            node = tree.select_child(node, self.exploration, self.puct)
+            self.make_move(game_mode.decode_move(int(tree.code[node])))
+            path.append(node)
+        tree.visits[path] += 1
+        return path, bool(tree.terminal[node])
+
+    def rollout(self) -> Optional[FloatArray]:
+        """Plays the moves of the rollout, returns the rewards if the game ends."""
+        game_mode = self.evaluator.game_mode
+        for _ in range(self.rollout_depth):
+            if self.rollout_policy is not None:
+                moves = game_mode.generate_moves()
+                if not moves:
+                    return self.terminal_rewards()
+                self.make_move(self.rollout_policy.get_next_move())
+            else:
+                codes = game_mode.generate_encoded_moves()
+                if not codes:
+                    return self.terminal_rewards()
+                self.make_move(game_mode.decode_move(self.rng.choice(codes)))
+        return None
+
+    def run_batch(self) -> None:
+        """Selects, plays and backs up a batch of iterations."""
+        tree, game_mode = self.tree, self.evaluator.game_mode
+        n_moves = len(game_mode.moves)
+        paths: List[List[int]] = []
+        rewards: List[Optional[FloatArray]] = []
+        snapshots = []
+        for _ in range(self.batch_size):
+            path, terminal = self.select()
+            result = self.terminal_rewards() if terminal else self.rollout()
+            if result is None:
+                if isinstance(self.evaluator, PlaneEvaluator):
+                    snapshots.append(self.evaluator.snapshot())
+                else:
+                    result = self.rewards(np.array([self.evaluator.score(pl) for pl in game_mode.players]))
+            paths.append(path)
+            rewards.append(result)
+            game_mode.undo_move(len(game_mode.moves) - n_moves)
+
+        if snapshots:
+            assert isinstance(self.evaluator, PlaneEvaluator)
+            batch_rewards = iter(self.rewards(self.evaluator.evaluate_snapshots(snapshots) @ self.score_weights()))
+            rewards = [next(batch_rewards) if result is None else result for result in rewards]
+        for path, result in zip(paths, rewards):
+            assert result is not None
+            nodes = np.array(path[1:], dtype=np.int64)
+            tree.value[nodes] += result[tree.player[nodes]]
+
+    def search(self) -> None:
+        """Runs the iterations of a search from the current position."""
+        self.update_root()
+        deadline = None if self.time_limit is None else time.perf_counter() + self.time_limit
+        iterations = 0
+        while iterations < self.iterations and (deadline is None or time.perf_counter() < deadline):
+            self.run_batch()
+            iterations += self.batch_size
+
+    def start_workers(self) -> ProcessPoolExecutor:
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(self.workers)
+        return self.executor
+
+    def close(self) -> None:
+        """Stops the worker processes."""
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+    def parallel_search(self) -> int:
+        """Searches in the worker processes, returns the encoded root move with the most visits of all the trees."""
+        game_mode = self.evaluator.game_mode
+        settings = MCTSSettings(type(self.evaluator), self.iterations, self.time_limit, self.exploration, self.puct,
+                                self.batch_size, self.rollout_depth, self.score_scale,
+                                self.player_indices[self.player])
+        setup = GameSetup.from_game_mode(game_mode)
+        executor = self.start_workers()
+        futures = [executor.submit(search_root, setup, settings, self.rng.randrange(2 ** 32))
+                   for _ in range(self.workers)]
+        visits: Dict[int, float] = defaultdict(float)
+        for future in futures:
+            codes, code_visits, _ = future.result()
+            for code, n_visits in zip(codes, code_visits):
+                visits[code] += n_visits
+        if not visits:
+            raise InvalidMoveException("No moves available")
+        return max(visits, key=lambda code: visits[code])
+
+    def get_next_move(self) -> "Movement":
+        game_mode = self.evaluator.game_mode
+        if self.workers > 1:
+            return game_mode.decode_move(self.parallel_search())
+        self.search()
+        if self.tree.first_child[0] == NO_NODE:
+            raise InvalidMoveException("No moves available")
+        return game_mode.decode_move(int(self.tree.code[self.tree.most_visited_child()]))
@@ -0,0 +1,134 @@
+from collections import defaultdict
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Tuple, Iterable, cast
+
+from ModularChess.movements.MoveEncoding import CAPTURE, PROMOTION, SQUARE_MASK, DESTINATION_SHIFT, \
+    destination_square, origin_square, promotion_index
+from ModularChess.movements.Promotion import Promotion
+
+if TYPE_CHECKING:
+    from ModularChess.controller.Board import Board
+    from ModularChess.controller.Player import Player
+    from ModularChess.game_modes.GameMode import GameMode
+    from ModularChess.movements.Movement import Movement
+    from ModularChess.movements.Promotion import PromotablePiece
+
+TACTICAL = CAPTURE | PROMOTION
+# Origin and destination of an encoded move, used to index the history table
+ORIGIN_DESTINATION_MASK = SQUARE_MASK | SQUARE_MASK << DESTINATION_SHIFT
+
+
+def mvv_lva(captured_value: float, attacker_value: float, promoted_value: float = 0.) -> float:
+    """Most valuable victim, least valuable attacker: captures of valuable pieces by cheap pieces are searched first."""
+    return 10. * (captured_value + promoted_value) - attacker_value
+
+
+def sort_captures(moves: Iterable["Movement"]) -> List["Movement"]:
+    """Sorts the captures and promotions by `mvv_lva`."""
+    def score(move: "Movement") -> float:
+        promoted_value = move.promoted_piece.piece_value() if isinstance(move, Promotion) else 0.
+        return mvv_lva(sum(piece.piece_value() for piece in move.captured_pieces()), move.piece.piece_value(),
+                       promoted_value)
+
+    return sorted(moves, key=score, reverse=True)
+
+
+def player_index(game_mode: "GameMode", player: "Player") -> int:
+    """
+    Index of the player in the players of the game mode. Players are compared by identity, as the comparison of the
+    dataclass goes through their allies and enemies.
+    """
+    return next(index for index, other in enumerate(game_mode.players) if other is player)
+
+
+class MoveOrdering:
+    """
+    Orders the legal moves of the search in stages: the best move of the transposition table, the captures and
+    promotions (by `mvv_lva`), the killer moves of the ply (quiet moves that caused a beta cutoff in sibling positions)
+    and the rest of quiet moves, by the history heuristic (how often they caused cutoffs, weighted by the depth). Moves
+    are encoded (see `~movements.MoveEncoding`) and only decoded when they are picked, so a cutoff on the first moves
+    doesn't score nor build the rest.
+    """
+
+    def __init__(self, n_killers: int = 2):
+        """
+        :param n_killers: Number of killer moves kept per ply
+        """
+        self.n_killers = n_killers
+        self.killers: Dict[int, List[int]] = defaultdict(list)
+        # Keyed by the index of the player (see `player_index`) and the origin and destination of the move, so it doesn't
+        # keep the players of previous games
+        self.history: Dict[Tuple[int, int], int] = defaultdict(int)
+
+    def order(self, game_mode: "GameMode", ply: int, hash_move: Optional[int] = None) \
+            -> Iterator[Tuple[int, "Movement"]]:
+        """
+        Picks the legal moves of the current player lazily, stage by stage.
+
+        :param game_mode: Game, the position must be the same each time a move is picked
+        :param ply: Distance to the root position
+        :param hash_move: Encoded best move stored in the transposition table
+        :return: Encoded move and its movement
+        """
+        codes: List[int] = game_mode.generate_encoded_moves()
+        if hash_move is not None and hash_move in codes:
+            yield hash_move, game_mode.decode_move(hash_move)
+
+        board = game_mode.board
+        captures = [code for code in codes if code & TACTICAL and code != hash_move]
+        if captures:
+            captures.sort(key=lambda code: self.capture_score(board, code), reverse=True)
+            for code in captures:
+                yield code, game_mode.decode_move(code)
+
+        killers = [code for code in self.killers.get(ply, ()) if code != hash_move and code in codes]
+        for code in killers:
+            yield code, game_mode.decode_move(code)
+
+        player = player_index(game_mode, game_mode.current_player_turn)
+        history = self.history
+        quiet_moves = [code for code in codes if not code & TACTICAL and code != hash_move and code not in killers]
+        quiet_moves.sort(key=lambda code: history.get((player, code & ORIGIN_DESTINATION_MASK), 0), reverse=True)
+        for code in quiet_moves:
+            yield code, game_mode.decode_move(code)
+
+    @staticmethod
+    def capture_score(board: "Board", code: int) -> float:
+        """`mvv_lva` of an encoded capture or promotion."""
+        squares = board.squares
+        attacker = squares[origin_square(code)]
+        assert attacker is not None
+        captured_value = promoted_value = 0.
+        if code & CAPTURE:
+            # En passant captures a pawn which isn't in the destination, like the attacker
+            captured_value = (squares[destination_square(code)] or attacker).piece_value()
+        if code & PROMOTION:
+            promoted_value = cast("PromotablePiece", attacker).valid_pieces_type[promotion_index(code)].piece_value()
+        return mvv_lva(captured_value, attacker.piece_value(), promoted_value)
+
+    def update(self, code: int, player: int, ply: int, depth: int) -> None:
+        """
+        Records a move that caused a beta cutoff: quiet moves become killers of the ply and gain history.
+
+        :param code: Encoded move
+        :param player: Index of the player of the move, see `player_index`
+        :param ply: Distance to the root position
+        :param depth: Remaining depth of the search
+        """
+        if code & TACTICAL:
+            return
+        killers = self.killers[ply]
+        if code not in killers:
+            killers.insert(0, code)
+            del killers[self.n_killers:]
+        self.history[(player, code & ORIGIN_DESTINATION_MASK)] += depth * depth
+
+    def new_search(self) -> None:
+        """Forgets the killers (their plies refer to the previous root) and halves the history."""
+        self.killers.clear()
+        for key in list(self.history):
+            self.history[key] //= 2
+
+    def new_game(self) -> None:
+        """Forgets the killers and the history, which belong to the positions of the previous game."""
+        self.killers.clear()
+        self.history.clear()
@@ -0,0 +1,164 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Optional, Tuple, Type, List, Any
+
+from ModularChess.artificial_intelligence.BasicAI import BasicAI
+from ModularChess.artificial_intelligence.MoveOrdering import player_index
+from ModularChess.artificial_intelligence.SearchStatistics import SearchStatistics
+from ModularChess.game_modes.PositionRecord import PositionRecord
+from ModularChess.utils.Exceptions import InvalidArgumentsError, InvalidMoveException
+
+if TYPE_CHECKING:
+    from ModularChess.artificial_intelligence.Evaluator import Evaluator
+    from ModularChess.controller.Player import Player
+    from ModularChess.game_modes.GameMode import GameMode
+    from ModularChess.movements.Movement import Movement
+
+
+@dataclass(frozen=True)
+class GameSetup:
+    """
+    Picklable description of a game, used to rebuild it in other processes: the binary record of its current position
+    (see `~game_modes.PositionRecord.PositionRecord`), so the moves of the game aren't replayed.
+    """
+    position: bytes
+
+    @classmethod
+    def from_game_mode(cls, game_mode: "GameMode") -> "GameSetup":
+        return cls(PositionRecord.from_game_mode(game_mode).to_bytes())
+
+    def build(self) -> "GameMode":
+        return PositionRecord.from_bytes(self.position).build()
+
+
+@dataclass(frozen=True)
+class SearchSettings:
+    evaluator_type: Type["Evaluator"]
+    max_depth: int
+    transposition_table_size: float
+    quiescence: bool
+    delta_margin: Optional[float]
+    null_move: bool
+    late_move_reductions: bool
+    # Index of the player of the AI in the players of the game
+    player_index: int
+
+
+# State of each worker process: alpha shared by all the workers, and the AI of the last searched game and settings. The
+# transposition table is kept when they change, as the keys only depend on the positions, unless the player of the AI
+# changes, as the scores are relative to it.
+_shared_alpha: Any = None
+_worker_ai: Optional[Tuple[GameSetup, SearchSettings, BasicAI]] = None
+
+
+def _init_worker(shared_alpha: Any) -> None:
+    global _shared_alpha
+    _shared_alpha = shared_alpha
+
+
+def _get_worker_ai(setup: GameSetup, settings: SearchSettings) -> BasicAI:
+    global _worker_ai
+    if _worker_ai is not None and _worker_ai[:2] == (setup, settings):
+        return _worker_ai[2]
+
+    game_mode = setup.build()
+    ai = BasicAI(settings.max_depth, game_mode.players[settings.player_index], settings.evaluator_type(game_mode),
+                 settings.transposition_table_size, quiescence=settings.quiescence, delta_margin=settings.delta_margin,
+                 null_move=settings.null_move, late_move_reductions=settings.late_move_reductions)
+    if _worker_ai is not None and _worker_ai[1].player_index == settings.player_index and \
+            _worker_ai[2].transposition_table.size_mb == ai.transposition_table.size_mb:
+        ai.transposition_table = _worker_ai[2].transposition_table
+    _worker_ai = setup, settings, ai
+    return ai
+
+
+def search_root_move(setup: GameSetup, settings: SearchSettings, code: int) -> Tuple[float, bool, SearchStatistics]:
+    """
+    Searches a move of the root position in a worker, using the best score found by any worker as alpha.
+
+    :param setup: Game to search
+    :param settings: Settings of the AI
+    :param code: Encoded root move
+    :return: Score of the move, whether it's exact (otherwise it's an upper bound, not better than other moves) and
+        statistics of the search
+    """
+    ai = _get_worker_ai(setup, settings)
+    ai.statistics = SearchStatistics()
+    alpha = _shared_alpha.value
+    score = ai.decide_alpha_beta_path(ai.evaluator.game_mode.decode_move(code))(alpha, float('inf'),
+                                                                                settings.max_depth - 1)[1]
+    ai.evaluator.game_mode.undo_move(1)
+    with _shared_alpha.get_lock():
+        if score > _shared_alpha.value:
+            _shared_alpha.value = score
+    ai.statistics.update_time()
+    return score, score > alpha, ai.statistics
+
+
+class ParallelAI(BasicAI):
+    """
+    Alpha-beta search with the moves of the root position split across a pool of processes. Each worker rebuilds the
+    game (see `GameSetup`) and searches its moves with its own transposition table, all of them sharing the alpha of
+    the root. The game mode must be constructible from its players and its board type (like `Classical`). With one
+    worker, it searches in the current process like `BasicAI`, so the results are deterministic.
+    """
+
+    def __init__(self, max_depth: int, player: "Player", evaluator: "Evaluator", workers: Optional[int] = None,
+                 transposition_table_size: float = 16., quiescence: bool = True, delta_margin: Optional[float] = None,
+                 null_move: bool = True, late_move_reductions: bool = True):
+        """
+        :param workers: Number of processes, by default the number of CPUs
+        """
+        workers = (os.cpu_count() or 1) if workers is None else workers
+        if workers < 1:
+            raise InvalidArgumentsError("The number of workers must be a positive integer")
+        self.workers = workers
+        self.executor: Optional[ProcessPoolExecutor] = None
+        self.shared_alpha: Any = None
+        self.transposition_table_size = transposition_table_size
+        super().__init__(max_depth, player, evaluator, transposition_table_size, quiescence=quiescence,
+                         delta_margin=delta_margin, null_move=null_move, late_move_reductions=late_move_reductions)
+
+    def start_workers(self) -> ProcessPoolExecutor:
+        if self.executor is None:
+            self.shared_alpha = multiprocessing.Value('d', float('-inf'))
+            self.executor = ProcessPoolExecutor(self.workers, initializer=_init_worker, initargs=(self.shared_alpha,))
+        return self.executor
+
+    def close(self) -> None:
+        """Stops the worker processes."""
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+    def search(self) -> Tuple["Movement", SearchStatistics]:
+        """The statistics are the sum of the statistics of the workers, except the time of the search."""
+        if self.workers == 1 or self.max_depth < 2:
+            return super().search()
+
+        game_mode = self.evaluator.game_mode
+        moves = list(self.move_ordering.order(game_mode, 0))
+        if not moves:
+            raise InvalidMoveException("No moves available")
+
+        self.new_search()
+        executor = self.start_workers()
+        self.shared_alpha.value = float('-inf')
+        setup = GameSetup.from_game_mode(game_mode)
+        settings = SearchSettings(type(self.evaluator), self.max_depth, self.transposition_table_size, self.quiescence,
+                                  self.delta_margin, self.null_move, self.late_move_reductions,
+                                  player_index(game_mode, self.player))
+        futures = [executor.submit(search_root_move, setup, settings, code) for code, _ in moves]
+        results: List[Tuple[float, bool, SearchStatistics]] = [future.result() for future in futures]
+        for _, _, statistics in results:
+            self.statistics.merge(statistics)
+        self.statistics.depth = self.max_depth
+        self.statistics.nodes += 1
+        self.finish_search()
+
+        # Best exact score, ties are broken by the order of the moves
+        best_index = max((index for index, (_, exact, _) in enumerate(results) if exact),
+                         key=lambda index: (results[index][0], -index), default=0)
+        return moves[best_index][1], self.statistics
@@ -0,0 +1,209 @@
+from typing import TYPE_CHECKING, Dict, Optional, Tuple, Type, Iterable, List, Set
+
+import numpy as np
+import numpy.typing as npt
+
+from ModularChess.artificial_intelligence.Evaluator import Evaluator
+from ModularChess.artificial_intelligence.IncrementalEvaluator import PieceSquareTable, DEFAULT_PIECE_SQUARE_TABLES
+from ModularChess.controller.BoardObserver import BoardObserver
+
+if TYPE_CHECKING:
+    from ModularChess.controller.Player import Player
+    from ModularChess.game_modes.GameMode import GameMode
+    from ModularChess.pieces.Piece import Piece
+
+FloatArray = npt.NDArray[np.float64]
+
+# Weights of the positional terms, in piece values
+DEFAULT_MOBILITY_WEIGHT = 0.05
+DEFAULT_KING_SAFETY_WEIGHT = 0.1
+DEFAULT_DOUBLED_PAWN_WEIGHT = 0.25
+DEFAULT_ISOLATED_PAWN_WEIGHT = 0.2
+
+
+def _has_base(piece_type: Type["Piece"], name: str) -> bool:
+    return any(cls.__name__ == name for cls in piece_type.__mro__)
+
+
+class PlaneEvaluator(Evaluator, BoardObserver):
+    """
+    Evaluation computed with NumPy over feature planes: a 0/1 plane per player and piece type, kept up to date by the
+    board, and the attack counts of each player. Material and piece-square bonus are the dot product of the planes with
+    a weight tensor; mobility (attacked squares), king safety (enemy attacks next to the king) and pawn structure
+    (doubled and isolated pawns, a file being every square with the same coordinates but the first one) are reductions
+    of the planes. Positions can be stored with `snapshot` and scored together with `evaluate_snapshots`.
+    """
+
+    def __init__(self, game_mode: "GameMode", tables: Optional[Dict[str, PieceSquareTable]] = None,
+                 flipped_players: Optional[Iterable["Player"]] = None,
+                 mobility_weight: float = DEFAULT_MOBILITY_WEIGHT,
+                 king_safety_weight: float = DEFAULT_KING_SAFETY_WEIGHT,
+                 doubled_pawn_weight: float = DEFAULT_DOUBLED_PAWN_WEIGHT,
+                 isolated_pawn_weight: float = DEFAULT_ISOLATED_PAWN_WEIGHT):
+        """
+        :param game_mode: Game to evaluate, the evaluator observes its board
+        :param tables: Piece-square tables by piece type name, by default `DEFAULT_PIECE_SQUARE_TABLES`
+        :param flipped_players: Players that see the tables flipped, by default all the players except the first one
+        :param mobility_weight: Bonus per square attacked
+        :param king_safety_weight: Penalty per enemy attack on the squares around (and on) the king
+        :param doubled_pawn_weight: Penalty per pawn in a file with other pawns of the player
+        :param isolated_pawn_weight: Penalty per pawn without pawns of the player in the adjacent files
+        """
+        super().__init__(game_mode)
+        self.tables = DEFAULT_PIECE_SQUARE_TABLES if tables is None else tables
+        self.flipped_players: Set["Player"] = set(game_mode.players[1:] if flipped_players is None else
+                                                  flipped_players)
+        self.mobility_weight = mobility_weight
+        self.king_safety_weight = king_safety_weight
+        self.doubled_pawn_weight = doubled_pawn_weight
+        self.isolated_pawn_weight = isolated_pawn_weight
+
+        board = game_mode.board
+        self.shape: Tuple[int, ...] = board.shape
+        self.n_squares = board.tables.n_squares
+        self.player_indices = {player: index for index, player in enumerate(game_mode.players)}
+        self.piece_types: List[Type["Piece"]] = list(game_mode.pieces)
+        for pieces_by_type in board.pieces.values():
+            self.piece_types.extend(piece_type for piece_type in pieces_by_type if piece_type not in self.piece_types)
+        self.type_indices = {piece_type: index for index, piece_type in enumerate(self.piece_types)}
+        self.pawn_types = [index for index, piece_type in enumerate(self.piece_types) if _has_base(piece_type, "Pawn")]
+        self.king_types = [index for index, piece_type in enumerate(self.piece_types) if _has_base(piece_type, "King")]
+
+        self.weights = self.build_weights()
+        # Enemies of each player (rows), used to add the attacks each player receives
+        self.enemies = np.array([[player.can_capture(other) for other in game_mode.players]
+                                 for player in game_mode.players], dtype=np.float64)
+        # Squares around each square (including itself)
+        self.neighbourhood = np.eye(self.n_squares)
+        for square, jumps in enumerate(board.tables.king_jumps):
+            self.neighbourhood[square, list(jumps)] = 1.
+
+        self.planes: FloatArray = np.zeros((len(game_mode.players), len(self.piece_types), self.n_squares))
+        self.attach()
+
+    def build_weights(self) -> FloatArray:
+        """Weight tensor (players, piece types, squares): material and piece-square bonus of each piece in each square."""
+        weights = np.zeros((len(self.game_mode.players), len(self.piece_types)) + self.shape)
+        for type_index, piece_type in enumerate(self.piece_types):
+            table = next((self.tables[cls.__name__] for cls in piece_type.__mro__ if cls.__name__ in self.tables), None)
+            bonus = np.zeros(self.shape) if table is None else table(self.shape)
+            for player, player_index in self.player_indices.items():
+                player_bonus = np.flip(bonus, axis=0) if player in self.flipped_players else bonus
+                weights[player_index, type_index] = piece_type.piece_value() + player_bonus
+        return weights.reshape(len(self.game_mode.players), len(self.piece_types), self.n_squares)
+
+    def attach(self) -> None:
+        """Fills the planes with the current position and starts observing the board."""
+        board = self.game_mode.board
+        self.planes[:] = 0.
+        for pieces_by_type in board.pieces.values():
+            for pieces in pieces_by_type.values():
+                for piece in pieces:
+                    self.piece_added(piece, board.tables.square_index(piece.position))
+        if self not in board.observers:
+            board.observers.append(self)
+
+    def detach(self) -> None:
+        """Stops observing the board."""
+        if self in self.game_mode.board.observers:
+            self.game_mode.board.observers.remove(self)
+
+    def piece_added(self, piece: "Piece", square: int) -> None:
+        self.planes[self.player_indices[piece.player], self.type_indices[type(piece)], square] = 1.
+
+    def piece_removed(self, piece: "Piece", square: int) -> None:
+        self.planes[self.player_indices[piece.player], self.type_indices[type(piece)], square] = 0.
+
+    def piece_moved(self, piece: "Piece", origin: int, destination: int) -> None:
+        plane = self.planes[self.player_indices[piece.player], self.type_indices[type(piece)]]
+        plane[origin] = 0.
+        plane[destination] = 1.
+
+    def attack_planes(self) -> FloatArray:
+        """Number of attacks of each player (rows) on each square."""
+        attacks = self.game_mode.board.attacks
+        return np.array([attacks.get(player) or [0] * self.n_squares for player in self.game_mode.players],
+                        dtype=np.float64)
+
+    def snapshot(self) -> Tuple[FloatArray, FloatArray]:
+        """Copy of the features of the current position (piece planes and attack planes)."""
+        return self.planes.copy(), self.attack_planes()
+
+    def evaluate_features(self, planes: FloatArray, attacks: FloatArray) -> FloatArray:
+        """
+        Evaluates a batch of positions.
+
+        :param planes: Piece planes, of shape (positions, players, piece types, squares)
+        :param attacks: Attack planes, of shape (positions, players, squares)
+        :return: Evaluation of each player in each position, of shape (positions, players)
+        """
+        scores: FloatArray = np.einsum("bpts,pts->bp", planes, self.weights)
+        scores += self.mobility_weight * np.count_nonzero(attacks, axis=-1)
+
+        if self.king_types:
+            king_zone = planes[:, :, self.king_types].sum(axis=2) @ self.neighbourhood
+            received_attacks = np.einsum("pq,bqs->bps", self.enemies, attacks)
+            scores -= self.king_safety_weight * np.einsum("bps,bps->bp", king_zone, received_attacks)
+
+        if self.pawn_types:
+            pawns = planes[:, :, self.pawn_types].sum(axis=2).reshape(planes.shape[:2] + self.shape)
+            files = pawns.sum(axis=2)
+            scores -= self.doubled_pawn_weight * np.maximum(files - 1, 0).reshape(planes.shape[:2] + (-1,)).sum(-1)
+            occupied = files > 0
+            adjacent = np.zeros_like(occupied)
+            for axis in range(2, occupied.ndim):
+                # Shift the occupied files one step forward and backward along each axis of the files
+                size = occupied.shape[axis]
+                forward = [slice(None)] * occupied.ndim
+                backward = [slice(None)] * occupied.ndim
+                forward[axis], backward[axis] = slice(1, size), slice(0, size - 1)
+                adjacent[tuple(forward)] |= occupied[tuple(backward)]
+                adjacent[tuple(backward)] |= occupied[tuple(forward)]
+            isolated = np.where(adjacent, 0., files)
+            scores -= self.isolated_pawn_weight * isolated.reshape(planes.shape[:2] + (-1,)).sum(-1)
+        return scores
+
+    def evaluate_snapshots(self, snapshots: Iterable[Tuple[FloatArray, FloatArray]]) -> FloatArray:
+        """Evaluation of each player (columns) in each of the stored positions (rows)."""
+        snapshots = list(snapshots)
+        if not snapshots:
+            return np.zeros((0, len(self.game_mode.players)))
+        planes, attacks = zip(*snapshots)
+        return self.evaluate_features(np.stack(planes), np.stack(attacks))
+
+    def score_weights(self, player: "Player") -> FloatArray:
+        """Coefficient of the evaluation of each player in the score of `player` (see `Evaluator.score`)."""
+        coefficients = np.zeros(len(self.game_mode.players))
+        allies = [ally for ally in player.allies if ally != player]
+        enemies = list(player.enemies)
+        coefficients[self.player_indices[player]] = 0.75 if allies else 1.
+        for ally in allies:
+            coefficients[self.player_indices[ally]] += 0.25 / len(allies)
+        for enemy in enemies:
+            coefficients[self.player_indices[enemy]] -= 1 / len(enemies)
+        return coefficients
+
+    def score_snapshots(self, snapshots: Iterable[Tuple[FloatArray, FloatArray]],
+                        player: Optional["Player"] = None) -> FloatArray:
+        """
+        Scores many stored positions in one call, for searches that collect their leaves.
+
+        :param snapshots: Positions stored with `snapshot`
+        :param player: Player to score, by default the current player
+        :return: Score of the player in each position
+        """
+        player_to_score = self.game_mode.current_player_turn if player is None else player
+        scores: FloatArray = self.evaluate_snapshots(snapshots) @ self.score_weights(player_to_score)
+        return scores
+
+    def evaluate(self) -> List[Tuple["Player", float]]:
+        scores = self.evaluate_features(self.planes[None], self.attack_planes()[None])[0]
+        return [(player, float(score)) for player, score in zip(self.game_mode.players, scores)]
+
+    def evaluate_player(self, player: "Player") -> float:
+        return dict(self.evaluate())[player]
+
+    def score(self, player: Optional["Player"] = None) -> float:
+        player_to_score = self.game_mode.current_player_turn if player is None else player
+        scores = self.evaluate_features(self.planes[None], self.attack_planes()[None])[0]
+        return float(scores @ self.score_weights(player_to_score))
@@ -0,0 +1,137 @@
+import functools
+import time
+from dataclasses import dataclass, field, fields
+from enum import Enum
+from typing import Callable, Dict, Iterator, List, Any, Optional
+
+
+class Phase(Enum):
+    MOVE_GENERATION = "move generation"
+    LEGALITY = "legality checking"
+    EVALUATION = "evaluation"
+    ORDERING = "ordering"
+
+
+@dataclass
+class SearchStatistics:
+    """Counters of a search, reset each time the AI searches a move."""
+    # Positions searched by the alpha-beta (including its leaves) and positions reached by the quiescence search
+    nodes: int = 0
+    quiescence_nodes: int = 0
+    # Beta cutoffs of the alpha-beta, and how many of them were caused by the first move searched
+    cutoffs: int = 0
+    first_move_cutoffs: int = 0
+    # Positions found in the transposition table
+    transposition_hits: int = 0
+    # Null-move pruning: null moves searched and null moves that caused a cutoff
+    null_move_searches: int = 0
+    null_move_cutoffs: int = 0
+    # Late move reductions: moves searched with reduced depth and reduced moves searched again with full depth
+    reduced_searches: int = 0
+    reduction_researches: int = 0
+    # Aspiration windows: iterations searched with a window and searches repeated with a wider window
+    aspiration_searches: int = 0
+    aspiration_researches: int = 0
+    # Depth, score and best move (encoded) of the last completed iteration
+    depth: int = 0
+    score: Optional[float] = None
+    best_move: Optional[int] = None
+    # Seconds since the search started (updated when reported)
+    elapsed: float = 0.
+    start: float = field(default_factory=time.perf_counter, repr=False)
+    # Seconds spent in each phase, only measured when the search is profiled (see `PhaseProfiler`)
+    phase_times: Dict[Phase, float] = field(default_factory=lambda: dict.fromkeys(Phase, 0.))
+
+    @property
+    def nps(self) -> float:
+        """Nodes (of the alpha-beta and the quiescence search) per second."""
+        return (self.nodes + self.quiescence_nodes) / self.elapsed if self.elapsed > 0 else 0.
+
+    @property
+    def first_move_cutoff_rate(self) -> float:
+        """Share of the cutoffs caused by the first move, a measure of the quality of the move ordering."""
+        return self.first_move_cutoffs / self.cutoffs if self.cutoffs else 0.
+
+    def update_time(self) -> None:
+        self.elapsed = time.perf_counter() - self.start
+
+    def merge(self, other: "SearchStatistics") -> None:
+        """Adds the counters and phase times of another search (i.e. of a parallel worker)."""
+        for counter in fields(self):
+            if counter.type is int and counter.name != "depth":
+                setattr(self, counter.name, getattr(self, counter.name) + getattr(other, counter.name))
+        for phase, seconds in other.phase_times.items():
+            self.phase_times[phase] += seconds
+
+
+class PhaseProfiler:
+    """
+    Measures the time spent in each phase of a search by replacing methods of the objects it uses (the game mode, the
+    evaluator and the move ordering) with timed wrappers, so searches which aren't profiled have no overhead. The time
+    of nested phases (i.e. the legality checks of the move generation) is only added to the innermost one.
+    """
+
+    def __init__(self, statistics: Callable[[], SearchStatistics]):
+        """
+        :param statistics: Returns the statistics where the times are added
+        """
+        self.statistics = statistics
+        # Time spent in nested phases by each active phase
+        self.nested_times: List[float] = []
+        self.wrapped: List[Any] = []
+
+    def add_time(self, phase: Phase, start: float) -> None:
+        elapsed = time.perf_counter() - start
+        nested = self.nested_times.pop()
+        self.statistics().phase_times[phase] += elapsed - nested
+        if self.nested_times:
+            self.nested_times[-1] += elapsed
+
+    def wrap(self, instance: Any, name: str, phase: Phase) -> None:
+        """Times the calls to the method of the instance, if it has it."""
+        method = getattr(instance, name, None)
+        if method is None:
+            return
+
+        @functools.wraps(method)
+        def timed(*args, **kwargs):
+            self.nested_times.append(0.)
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self.add_time(phase, start)
+
+        self.wrapped.append((instance, name, instance.__dict__.get(name)))
+        setattr(instance, name, timed)
+
+    def wrap_generator(self, instance: Any, name: str, phase: Phase) -> None:
+        """Times each step of the generators returned by the method of the instance."""
+        method = getattr(instance, name)
+
+        @functools.wraps(method)
+        def timed(*args, **kwargs) -> Iterator[Any]:
+            generator = method(*args, **kwargs)
+            while True:
+                self.nested_times.append(0.)
+                start = time.perf_counter()
+                try:
+                    item = next(generator)
+                except StopIteration:
+                    return
+                finally:
+                    self.add_time(phase, start)
+                yield item
+
+        self.wrapped.append((instance, name, instance.__dict__.get(name)))
+        setattr(instance, name, timed)
+
+    def restore(self) -> None:
+        """Restores the original methods."""
+        for instance, name, previous in reversed(self.wrapped):
+            if previous is None:
+                delattr(instance, name)
+            else:
+                setattr(instance, name, previous)
+        self.wrapped.clear()
+        self.nested_times.clear()
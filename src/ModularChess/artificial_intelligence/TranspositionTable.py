@@ -0,0 +1,119 @@
+from dataclasses import dataclass
+from enum import Enum
+from typing import Optional
+
+import numpy as np
+
+from ModularChess.utils.Exceptions import InvalidArgumentsError
+
+
+class Bound(Enum):
+    EXACT = 0
+    # The score is at least the stored score (the search failed high)
+    LOWER = 1
+    # The score is at most the stored score (the search failed low)
+    UPPER = 2
+
+
+@dataclass(frozen=True)
+class TranspositionEntry:
+    depth: int
+    score: float
+    bound: Bound
+    # Encoded best move (see `~movements.MoveEncoding`), None if the search didn't find one
+    move: Optional[int]
+
+    def cutoff_score(self, alpha: float, beta: float) -> Optional[float]:
+        """Score of the entry if it's enough to skip the search with the window, None otherwise."""
+        if self.bound is Bound.EXACT or (self.bound is Bound.LOWER and self.score >= beta) or \
+                (self.bound is Bound.UPPER and self.score <= alpha):
+            return self.score
+        return None
+
+
+ENTRY_TYPE = np.dtype([("key", np.uint64), ("depth", np.int16), ("bound", np.int8), ("score", np.float64),
+                       ("move", np.int64)])
+NO_MOVE = -1
+EMPTY_DEPTH = -1
+
+
+class TranspositionTable:
+    """
+    Fixed size table of search results, indexed by the Zobrist key of the position (`GameMode.position_key`). Each bucket
+    has two entries: the first one is only replaced by searches at least as deep (or of the same position), the second
+    one is always replaced, so deep results survive while recent results are still stored.
+    """
+
+    def __init__(self, size_mb: float = 16.):
+        n_buckets = int(size_mb * 2 ** 20) // (2 * ENTRY_TYPE.itemsize)
+        if n_buckets < 1:
+            raise InvalidArgumentsError("The size of the transposition table is too small")
+        self.entries = np.zeros((n_buckets, 2), dtype=ENTRY_TYPE)
+        self.entries["depth"] = EMPTY_DEPTH
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.replacements = 0
+
+    @property
+    def n_buckets(self) -> int:
+        return len(self.entries)
+
+    @property
+    def size_mb(self) -> float:
+        return self.entries.nbytes / 2 ** 20
+
+    def probe(self, key: int) -> Optional[TranspositionEntry]:
+        """
+        Looks up the entry of the position, counting the hits and misses.
+
+        :param key: Zobrist key of the position
+        :return: Entry or None if the position isn't stored
+        """
+        bucket = self.entries[key % self.n_buckets]
+        for entry in bucket:
+            if entry["depth"] != EMPTY_DEPTH and int(entry["key"]) == key:
+                self.hits += 1
+                move = int(entry["move"])
+                return TranspositionEntry(int(entry["depth"]), float(entry["score"]), Bound(int(entry["bound"])),
+                                          None if move == NO_MOVE else move)
+        self.misses += 1
+        return None
+
+    def store(self, key: int, depth: int, score: float, bound: Bound, move: Optional[int] = None) -> None:
+        """
+        Stores the result of a search in the depth-preferred entry of the bucket if the search is at least as deep as
+        the stored one (or it's the same position), otherwise in the always-replace entry.
+
+        :param key: Zobrist key of the position
+        :param depth: Remaining depth of the search
+        :param score: Score found by the search
+        :param bound: Whether the score is exact or a bound
+        :param move: Encoded best move
+        """
+        bucket = self.entries[key % self.n_buckets]
+        preferred = bucket[0]
+        slot = 0 if preferred["depth"] <= depth or int(preferred["key"]) == key else 1
+        if bucket[slot]["depth"] != EMPTY_DEPTH and int(bucket[slot]["key"]) != key:
+            self.replacements += 1
+        bucket[slot] = (key, depth, bound.value, score, NO_MOVE if move is None else move)
+        self.stores += 1
+
+    def clear(self) -> None:
+        self.entries["depth"] = EMPTY_DEPTH
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.replacements = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.
+
+    def __len__(self) -> int:
+        return int(np.count_nonzero(self.entries["depth"] != EMPTY_DEPTH))
+
+    def __repr__(self) -> str:
+        return f"TranspositionTable(size_mb={self.size_mb:.1f}, entries={len(self)}, hits={self.hits}, " \
+               f"misses={self.misses}, stores={self.stores}, replacements={self.replacements})"
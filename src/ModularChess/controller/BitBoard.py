@@ -0,0 +1,211 @@
+from collections import defaultdict
+from functools import lru_cache
+from typing import cast, Type, Optional, Dict, List, TYPE_CHECKING, Tuple, Union, Iterable, Sequence
+
+import numpy as np
+import numpy.typing as npt
+
+from ModularChess.controller.Board import Board
+from ModularChess.utils.Exceptions import InvalidArgumentsError, InvalidPathException
+
+if TYPE_CHECKING:
+    from ModularChess.controller.Player import Player
+    from ModularChess.pieces.Piece import Piece
+    from ModularChess.utils.Position import Position
+
+
+@lru_cache(maxsize=None)
+def ray_mask(shape: Tuple[int, ...], index: int, direction: Tuple[int, ...], length: Optional[int] = None) -> int:
+    """
+    Mask of the squares reached by moving from the square `index` along `direction` until leaving the board or after
+    `length` steps. The square of origin is not included.
+    """
+    coordinates = [int(coord) for coord in np.unravel_index(index, shape)]
+    mask = 0
+    for _ in range(max(shape) if length is None else length):
+        coordinates = [coord + step for coord, step in zip(coordinates, direction)]
+        if any(not 0 <= coord < size for coord, size in zip(coordinates, shape)):
+            break
+        mask |= 1 << int(np.ravel_multi_index(coordinates, shape))
+    return mask
+
+
+def ray_masks(rays: Iterable[Sequence[int]]) -> Tuple[Tuple[Sequence[int], int, bool], ...]:
+    """
+    Mask of each ray of `~utils.MoveTables.MoveTables` and whether its square indices are ascending, so the nearest
+    piece of the ray is the lowest bit of its occupied squares (or the highest one).
+    """
+    return tuple((ray, sum(1 << square for square in ray), ray[0] <= ray[-1]) for ray in rays if ray)
+
+
+class BitBoard(Board):
+    """
+    Board backend for boards of any shape. Squares are flattened to integer indices (row-major order, so on a 8x8 board
+    the index is ``8 * row + column``) and pieces are stored in a flat list of squares. Every player keeps, for each
+    piece type, an integer bitset where the bit of a square is set when one of its pieces is in that square, so the
+    rays of the sliders, the jumps, the path, capture and attack queries are solved with mask operations.
+    """
+
+    def create_squares(self) -> None:
+        self._shape = self.tables.shape
+        self.squares = [None] * self.tables.n_squares
+
+        self.occupied = 0
+        self.players_occupancy: Dict["Player", int] = defaultdict(int)
+        self.occupancy: Dict["Player", Dict[Type["Piece"], int]] = defaultdict(lambda: defaultdict(int))
+        # Masks of the rays of the move tables by their identity (the rays are kept to check it, as ids are reused)
+        self._ray_masks: Dict[int, Tuple[Iterable[Sequence[int]], Tuple[Tuple[Sequence[int], int, bool], ...]]] = {}
+
+    def __getitem__(self, position: Union["Position", Tuple[int, ...]]) -> Optional["Piece"]:
+        return cast(Optional["Piece"], self.squares[self.square_index(position)])
+
+    def __setitem__(self, position: Union["Position", Tuple[int, ...]], piece: Optional["Piece"]) -> None:
+        index = self.square_index(position)
+        bit = 1 << index
+
+        previous_piece = self.squares[index]
+        if previous_piece is not None:
+            self.occupied &= ~bit
+            self.players_occupancy[previous_piece.player] &= ~bit
+            self.occupancy[previous_piece.player][type(previous_piece)] &= ~bit
+
+        if piece is not None:
+            self.occupied |= bit
+            self.players_occupancy[piece.player] |= bit
+            self.occupancy[piece.player][type(piece)] |= bit
+
+        self.squares[index] = piece
+
+    @property  # type: ignore[override]
+    def board(self) -> npt.NDArray[np.object_]:  # type: ignore[override]
+        board = np.empty(len(self.squares), dtype=object)
+        board[:] = self.squares
+        return board.reshape(self.shape)
+
+    @property
+    def dimensions(self):
+        return len(self._shape)
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        return self._shape
+
+    def is_empty(self) -> bool:
+        return self.occupied == 0
+
+    def capturable_players(self, player: "Player") -> List["Player"]:
+        """
+        Players with pieces in the board that the player can capture, as in `Player.can_capture` but comparing the
+        players by identity.
+        """
+        if player.enemies:
+            return player.enemies
+        return [other for other in self.players_occupancy
+                if other is not player and all(other is not ally for ally in player.allies)]
+
+    def capturable_mask(self, player: "Player") -> int:
+        """Mask of the squares occupied by pieces that the player can capture."""
+        players_occupancy = self.players_occupancy
+        return sum(players_occupancy.get(other, 0) for other in self.capturable_players(player))
+
+    def can_capture_or_move(self, piece: "Piece", new_position: "Position") -> bool:
+        bit = 1 << self.square_index(new_position)
+        return not self.occupied & bit or bool(self.capturable_mask(piece.player) & bit)
+
+    def can_capture(self, piece: "Piece", new_position: "Position") -> bool:
+        return bool(self.capturable_mask(piece.player) >> self.square_index(new_position) & 1)
+
+    def reset_attacks(self) -> None:
+        super().reset_attacks()
+        # Mask of the squares attacked by each player, the squares where its count of the attack maps isn't 0
+        self.attacked: Dict["Player", int] = defaultdict(int)
+
+    def add_attacks(self, piece: "Piece") -> None:
+        super().add_attacks(piece)
+        mask = self.attacked[piece.player]
+        for square in self.piece_attacks[id(piece)]:
+            mask |= 1 << square
+        self.attacked[piece.player] = mask
+
+    def remove_attacks(self, piece: "Piece") -> None:
+        attacked_squares = self.piece_attacks.get(id(piece), ())
+        super().remove_attacks(piece)
+        counts = self.attacks[piece.player]
+        mask = self.attacked[piece.player]
+        for square in attacked_squares:
+            if not counts[square]:
+                mask &= ~(1 << square)
+        self.attacked[piece.player] = mask
+
+    def is_square_attacked(self, square: int, player: "Player") -> bool:
+        attacked = self.attacked
+        return any(attacked.get(other, 0) >> square & 1 for other in self.capturable_players(player))
+
+    def get_square_attackers(self, square: int, player: "Player") -> List["Piece"]:
+        capturable = self.capturable_mask(player)
+        return [piece for piece in self.square_attackers[square].values()
+                if capturable >> self.square_index(piece.position) & 1]
+
+    @staticmethod
+    def _lineal_direction(origin: "Position", destination: "Position") -> Tuple[Tuple[int, ...], int]:
+        """Returns the unitary direction of the lineal path between both positions and its number of steps."""
+        if origin.shape != destination.shape:
+            raise InvalidArgumentsError("different dimensions.")
+
+        diff = [dest - orig for orig, dest in zip(origin.tolist(), destination.tolist())]
+        magnitudes = {abs(coord) for coord in diff if coord != 0}
+        if len(magnitudes) > 1:
+            raise InvalidPathException("destination path is not lineal.")
+        return tuple((coord > 0) - (coord < 0) for coord in diff), max(magnitudes, default=0)
+
+    def is_path_clear(self, origin: "Position", destination: "Position") -> bool:
+        direction, length = self._lineal_direction(origin, destination)
+        if length <= 1:
+            return True
+        return ray_mask(self._shape, self.square_index(origin), direction, length - 1) & self.occupied == 0
+
+    def get_ray_masks(self, rays: Iterable[Sequence[int]]) -> Tuple[Tuple[Sequence[int], int, bool], ...]:
+        cached = self._ray_masks.get(id(rays))
+        if cached is None or cached[0] is not rays:
+            cached = self._ray_masks[id(rays)] = (rays, ray_masks(rays))
+        return cached[1]
+
+    def ray_destinations(self, player: "Player", rays: Iterable[Sequence[int]]) -> List[int]:
+        occupied = self.occupied
+        capturable = self.capturable_mask(player)
+        destinations: List[int] = []
+        for ray, mask, ascending in self.get_ray_masks(rays):
+            blockers = mask & occupied
+            if not blockers:
+                destinations.extend(ray)
+                continue
+            blocker = (blockers & -blockers).bit_length() - 1 if ascending else blockers.bit_length() - 1
+            destinations.extend(ray[:ray.index(blocker) + (capturable >> blocker & 1)])
+        return destinations
+
+    def ray_attacks(self, rays: Iterable[Sequence[int]]) -> List[int]:
+        occupied = self.occupied
+        attacked: List[int] = []
+        for ray, mask, ascending in self.get_ray_masks(rays):
+            blockers = mask & occupied
+            if not blockers:
+                attacked.extend(ray)
+                continue
+            blocker = (blockers & -blockers).bit_length() - 1 if ascending else blockers.bit_length() - 1
+            attacked.extend(ray[:ray.index(blocker) + 1])
+        return attacked
+
+    def jump_destinations(self, player: "Player", jumps: Iterable[int]) -> List[int]:
+        # Squares of the player, its allies or any other player it can't capture
+        blocked = self.occupied & ~self.capturable_mask(player)
+        return [square for square in jumps if not blocked >> square & 1]
+
+    def is_position_outside(self, position: "Position") -> bool:
+        coordinates = position.tolist()
+        return len(coordinates) == len(self._shape) and any(
+            not 0 <= coord < size for coord, size in zip(coordinates, self._shape))
+
+    def is_position_inside(self, position: "Position") -> bool:
+        coordinates = position.tolist()
+        return len(coordinates) == len(self._shape) and all(
+            0 <= coord < size for coord, size in zip(coordinates, self._shape))
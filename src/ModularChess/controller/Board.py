@@ -1,12 +1,15 @@
 from collections import defaultdict
-from typing import Type, Optional, cast, Dict, List, TYPE_CHECKING, Tuple, Union
+from typing import Any, Type, Optional, cast, Dict, List, TYPE_CHECKING, Tuple, Union, Iterable, Sequence
 
 import numpy as np
+import numpy.typing as npt
 
-from ModularChess.pieces.Empty import Empty
 from ModularChess.utils.Exceptions import InvalidPositionError, InvalidArgumentsError
+from ModularChess.utils.MoveTables import get_move_tables
+from ModularChess.utils.Zobrist import ZOBRIST
 
 if TYPE_CHECKING:
+    from ModularChess.controller.BoardObserver import BoardObserver
     from ModularChess.controller.Player import Player
     from ModularChess.pieces.Piece import Piece
     from ModularChess.utils.Position import Position
@@ -19,14 +22,27 @@ class Board:
         if len(shape) < 2:
             raise InvalidArgumentsError("Board should at least have 2 dimensions")
 
-        # Maybe sparse
-        self.board = np.empty(shape, dtype=object)
+        self.tables = get_move_tables(tuple(int(size) for size in shape))
+        self.create_squares()
 
         self.pieces: Dict["Player", Dict[Type["Piece"], List["Piece"]]] = defaultdict(lambda: defaultdict(list))
+        # Zobrist key of the pieces in the board, see `~utils.Zobrist.Zobrist`
+        self.zobrist_key = 0
+        # Notified of every addition, removal and movement of a piece
+        self.observers: List["BoardObserver"] = []
+        self.reset_attacks()
+
+    def create_squares(self) -> None:
+        """Creates the storage of the pieces, empty."""
+        # Maybe sparse
+        self.board = np.empty(self.tables.shape, dtype=object)
+        # Flat view of the board, indexed by the square indices of the move tables
+        self.squares: Union["npt.NDArray[np.object_]", List[Any]] = self.board.reshape(-1)
 
     def __getitem__(self, position: Union["Position", Tuple[int, ...]]) -> Optional["Piece"]:
         try:
-            piece = cast(Optional["Piece"], self.board[tuple(position)])
+            piece = cast(Optional["Piece"], self.board[tuple(position.tolist() if isinstance(position, np.ndarray)
+                                                             else position)])
         except Exception:
             raise InvalidPositionError("position out of board")
 
@@ -34,7 +50,7 @@ class Board:
 
     def __setitem__(self, position: Union["Position", Tuple[int, ...]], piece: Optional["Piece"]) -> None:
         try:
-            self.board[tuple(position)] = piece
+            self.board[tuple(position.tolist() if isinstance(position, np.ndarray) else position)] = piece
         except Exception:
             raise InvalidPositionError("position out of board")
 
@@ -60,44 +76,155 @@ class Board:
     def shape(self) -> Tuple[int, ...]:
         return cast(Tuple[int, ...], self.board.shape)
 
+    def square_index(self, position: Union["Position", Tuple[int, ...]]) -> int:
+        """Converts a position into the index of its square in the flattened board."""
+        coordinates = position.tolist() if isinstance(position, np.ndarray) else position
+        if len(coordinates) != self.tables.dimensions:
+            raise InvalidPositionError("position out of board")
+
+        index = 0
+        for coord, size in zip(coordinates, self.tables.shape):
+            if not 0 <= coord < size:
+                raise InvalidPositionError("position out of board")
+            index = index * size + coord
+        return int(index)
+
+    def square_position(self, index: int) -> "Position":
+        return self.tables.positions[index]
+
+    def is_empty(self) -> bool:
+        return cast(bool, np.all(self.board == None))  # noqa: E711
+
     def add_piece(self, piece: "Piece") -> None:
         self[piece.position] = piece
+        square = self.square_index(piece.position)
+        self.zobrist_key ^= ZOBRIST.piece_key(piece, square)
 
         self.pieces[piece.player][type(piece)].append(piece)
 
+        self.update_attackers(square)
+        self.add_attacks(piece)
+        for observer in self.observers:
+            observer.piece_added(piece, square)
+
+    def add_pieces(self, pieces: Iterable["Piece"]) -> None:
+        """
+        Adds several pieces at once (i.e. to set up a position), computing the attacks of each piece once all of them
+        are in the board instead of updating the attackers after each addition.
+        """
+        added = [(piece, self.square_index(piece.position)) for piece in pieces]
+        for piece, square in added:
+            self[piece.position] = piece
+            self.zobrist_key ^= ZOBRIST.piece_key(piece, square)
+            self.pieces[piece.player][type(piece)].append(piece)
+
+        for piece, _ in added:
+            self.add_attacks(piece)
+        for observer in self.observers:
+            for piece, square in added:
+                observer.piece_added(piece, square)
+
+    def clear(self) -> None:
+        """Removes all the pieces of the board, keeping its observers."""
+        for player_pieces in self.pieces.values():
+            for pieces in player_pieces.values():
+                for piece in pieces:
+                    self[piece.position] = None
+                    for observer in self.observers:
+                        observer.piece_removed(piece, self.square_index(piece.position))
+        self.pieces.clear()
+        self.zobrist_key = 0
+        self.reset_attacks()
+
     def remove_piece(self, piece: "Piece") -> None:
+        self.remove_attacks(piece)
+
         self[piece.position] = None
+        square = self.square_index(piece.position)
+        self.zobrist_key ^= ZOBRIST.piece_key(piece, square)
 
         self.pieces[piece.player][type(piece)].remove(piece)
 
-    def move_piece(self, piece: "Piece", new_position: "Position"):
+        self.update_attackers(square)
+        for observer in self.observers:
+            observer.piece_removed(piece, square)
+
+    def move_piece(self, piece: "Piece", new_position: "Position", n_moves_increment: int = 1):
+        """
+        Moves the piece to the new position, updating its number of moves.
+
+        :param n_moves_increment: number of moves added to the piece, negative when a movement is undone
+        """
+        self.remove_attacks(piece)
+
         self[piece.position] = None
         self[new_position] = piece
+        origin = self.square_index(piece.position)
+        self.zobrist_key ^= ZOBRIST.piece_key(piece, origin)
 
-        piece.n_moves += 1
+        piece.n_moves += n_moves_increment
         piece.position = new_position
+        destination = self.square_index(new_position)
+        self.zobrist_key ^= ZOBRIST.piece_key(piece, destination)
+
+        self.update_attackers(origin, destination)
+        self.add_attacks(piece)
+        for observer in self.observers:
+            observer.piece_moved(piece, origin, destination)
+
+    def reset_attacks(self) -> None:
+        """
+        Creates the attack maps: for each player, the number of its pieces attacking each square, and for each square
+        the pieces attacking it. They are updated incrementally when pieces are added, removed or moved.
+        """
+        n_squares = self.tables.n_squares
+        self.attacks: Dict["Player", List[int]] = defaultdict(lambda: [0] * n_squares)
+        self.square_attackers: List[Dict[int, "Piece"]] = [{} for _ in range(n_squares)]
+        # Squares attacked by each piece in the board, by the id of the piece
+        self.piece_attacks: Dict[int, List[int]] = {}
+
+    def add_attacks(self, piece: "Piece") -> None:
+        attacked_squares = piece.get_attacked_squares()
+        self.piece_attacks[id(piece)] = attacked_squares
+        counts = self.attacks[piece.player]
+        for square in attacked_squares:
+            counts[square] += 1
+            self.square_attackers[square][id(piece)] = piece
+
+    def remove_attacks(self, piece: "Piece") -> None:
+        counts = self.attacks[piece.player]
+        for square in self.piece_attacks.pop(id(piece), ()):
+            counts[square] -= 1
+            del self.square_attackers[square][id(piece)]
+
+    def update_attackers(self, *squares: int) -> None:
+        """Recomputes the attacks of the pieces attacking the squares, as their rays may be blocked or opened."""
+        attackers = {piece_id: piece for square in squares for piece_id, piece in self.square_attackers[square].items()}
+        for piece in attackers.values():
+            self.remove_attacks(piece)
+            self.add_attacks(piece)
+
+    def is_square_attacked(self, square: int, player: "Player") -> bool:
+        """Checks in O(1) if any enemy of the player attacks the square."""
+        return any(counts[square] for attacker, counts in self.attacks.items() if player.can_capture(attacker))
+
+    def get_square_attackers(self, square: int, player: "Player") -> List["Piece"]:
+        """Enemy pieces of the player attacking the square."""
+        return [piece for piece in self.square_attackers[square].values() if player.can_capture(piece.player)]
 
     def can_enemy_piece_capture_piece(self, piece: "Piece") -> Optional["Piece"]:
-        for enemy_player in piece.player.enemies:
-            for enemy_pieces in self.pieces[enemy_player].values():
-                for enemy_piece in enemy_pieces:
-                    if enemy_piece.check_piece_valid_move(piece.position):
-                        return piece
-        return None
+        return self.can_enemy_piece_capture_position(piece.position, piece.player)
 
     def can_enemy_piece_capture_position(self, position: "Position", player: "Player") -> Optional["Piece"]:
-        previous_piece = self[position]
-        if previous_piece is not None:
-            self.remove_piece(previous_piece)
-        temporal_piece = Empty(self, player, position)
-        self.add_piece(temporal_piece)
-
-        result = self.can_enemy_piece_capture_piece(temporal_piece)
+        """
+        Finds an enemy piece of the player attacking the position, using the attack maps.
 
-        self.remove_piece(temporal_piece)
-        if previous_piece is not None:
-            self.add_piece(previous_piece)
-        return result
+        :return: Attacking piece or None if the position is not attacked
+        """
+        square = self.square_index(position)
+        if not self.is_square_attacked(square, player):
+            return None
+        return next(iter(self.get_square_attackers(square, player)), None)
 
     def can_capture_or_move(self, piece: "Piece", new_position: "Position") -> bool:
         destination = self[new_position]
@@ -107,6 +234,67 @@ class Board:
         destination = self[new_position]
         return destination is not None and piece.player.can_capture(destination.player)
 
+    def is_path_clear(self, origin: "Position", destination: "Position") -> bool:
+        """
+        Checks there are no pieces in the lineal path between both positions, excluding the origin and the destination.
+
+        :raises InvalidPathException: if the path is not lineal
+        """
+        return not any([self[pos] for pos in origin.create_lineal_path(destination)][:-1])
+
+    def ray_destinations(self, player: "Player", rays: Iterable[Sequence[int]]) -> List[int]:
+        """
+        Walks the rays precomputed in `~utils.MoveTables.MoveTables`. Each ray stops at the first piece found, which is
+        only included if the player can capture it.
+
+        :param rays: Square indices of each ray, ordered from the nearest square
+        :return: Square indices where a piece of the player can move
+        """
+        squares = self.squares
+        destinations: List[int] = []
+        for ray in rays:
+            for square in ray:
+                destination = squares[square]
+                if destination is None:
+                    destinations.append(square)
+                    continue
+                if player.can_capture(destination.player):
+                    destinations.append(square)
+                break
+        return destinations
+
+    def ray_attacks(self, rays: Iterable[Sequence[int]]) -> List[int]:
+        """
+        Walks the rays precomputed in `~utils.MoveTables.MoveTables`, including the first piece found in each ray.
+
+        :param rays: Square indices of each ray, ordered from the nearest square
+        :return: Square indices attacked through the rays
+        """
+        squares = self.squares
+        attacked: List[int] = []
+        for ray in rays:
+            for square in ray:
+                attacked.append(square)
+                if squares[square] is not None:
+                    break
+        return attacked
+
+    def jump_destinations(self, player: "Player", jumps: Iterable[int]) -> List[int]:
+        """
+        Filters the jumps precomputed in `~utils.MoveTables.MoveTables`, removing the squares occupied by pieces that
+        the player can't capture.
+
+        :param jumps: Square indices reached by the jumps
+        :return: Square indices where a piece of the player can move
+        """
+        squares = self.squares
+        destinations: List[int] = []
+        for square in jumps:
+            destination = squares[square]
+            if destination is None or player.can_capture(destination.player):
+                destinations.append(square)
+        return destinations
+
     def is_position_outside(self, position: "Position") -> bool:
         return cast(bool, position.shape[0] == self.dimensions and np.any(
             (position < 0) | (position >= self.shape)))  # type: ignore
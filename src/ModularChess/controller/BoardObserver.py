@@ -0,0 +1,24 @@
+import abc
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ModularChess.pieces.Piece import Piece
+
+
+class BoardObserver(metaclass=abc.ABCMeta):
+    """
+    Receives every change of the pieces of a board (see `Board.observers`), so it can keep information of the position
+    up to date incrementally while moves are made and undone. Squares are the indices of the move tables.
+    """
+
+    @abc.abstractmethod
+    def piece_added(self, piece: "Piece", square: int) -> None:
+        pass
+
+    @abc.abstractmethod
+    def piece_removed(self, piece: "Piece", square: int) -> None:
+        pass
+
+    @abc.abstractmethod
+    def piece_moved(self, piece: "Piece", origin: int, destination: int) -> None:
+        pass
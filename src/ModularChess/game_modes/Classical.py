@@ -1,5 +1,6 @@
+from dataclasses import dataclass
 from itertools import cycle
-from typing import List, Tuple, TYPE_CHECKING, cast
+from typing import List, Tuple, TYPE_CHECKING, cast, Type, Optional, Set, Dict
 
 import numpy as np
 
@@ -8,6 +9,8 @@ from ModularChess.controller.Player import Player
 from ModularChess.game_modes.GameMode import GameState, GameMode
 from ModularChess.movements.BasicMovement import BasicMovement
 from ModularChess.movements.EnPassant import EnPassant
+from ModularChess.movements.MoveEncoding import CAPTURE, CASTLING, EN_PASSANT, PROMOTION, decode_move, \
+    destination_square, move_flags, origin_square, pack_move
 from ModularChess.movements.Promotion import Promotion
 from ModularChess.pieces.Bishop import Bishop
 from ModularChess.pieces.King import King
@@ -15,32 +18,60 @@ from ModularChess.pieces.Knight import Knight
 from ModularChess.pieces.Pawn import Pawn
 from ModularChess.pieces.Queen import Queen
 from ModularChess.pieces.Rook import Rook
+from ModularChess.utils.Exceptions import InvalidArgumentsError
 from ModularChess.utils.Position import Position
+from ModularChess.utils.Zobrist import ZOBRIST
 
 if TYPE_CHECKING:
     from ModularChess.movements.Movement import Movement
     from ModularChess.pieces.Piece import Piece
 
+STARTING_FEN = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
+# Squares of the king and the rook of each castling right of the FEN records
+CASTLING_SQUARES = {"K": (4, 7), "Q": (4, 0), "k": (60, 63), "q": (60, 56)}
+
+
+@dataclass
+class KingSafety:
+    """Checks and pins of the king of a player, computed once per position to filter the pseudo-legal moves."""
+    king: Optional["Piece"]
+    king_square: int
+    checkers: List["Piece"]
+    # Squares where the other pieces must move to capture or block the checker, None if the king isn't in check
+    block_squares: Optional[Set[int]]
+    # Squares where each pinned piece (by its square) can move without exposing the king
+    pins: Dict[int, Set[int]]
+    # Squares behind the king in the line of a sliding checker, attacked once the king moves away from the checker
+    xray_squares: Set[int]
+
 
 class Classical(GameMode):
 
-    def __init__(self, white: "Player", black: "Player"):
+    def __init__(self, white: "Player", black: "Player", board_type: Type[Board] = Board):
 
         self.white = white
         self.black = black
+        self.board_type = board_type
         self.last_capture = 0
+        # State of the position set up with a FEN record (see `load_fen`), before the moves of the game
+        self.initial_ply = 0
+        self.initial_halfmove_clock = 0
+        self.initial_en_passant: Optional["Piece"] = None
 
         players = [self.white, self.black]
         Player.join_allies([self.white], players)
         Player.join_allies([self.black], players)
 
         self_classical = self
+        # Shared by all the pawns of each player, so they can't be modified in place
+        white_direction, black_direction = Position([1, 0]), Position([-1, 0])
+        white_direction.flags.writeable = black_direction.flags.writeable = False
 
         class ClassicalPawn(Pawn):
 
             def __init__(self, board: "Board", player: "Player", starting_position: Position):
                 super().__init__(board, player, starting_position, [Queen, Rook, Bishop, Knight])
-                self.direction_player: Position = Position([-1, 0]) if self.player == black else Position([1, 0])
+                self.direction_player: Position = black_direction if self.player == black else white_direction
 
             def can_promote_in_position(self, new_position: Position) -> bool:
                 promotion_y = 7 if self.player == white else 0
@@ -72,9 +103,8 @@ class Classical(GameMode):
                     # En Passant
                     en_passant_position: Position = self.position + Position((0, diff[1]))
                     enemy_piece = self.board[en_passant_position]
-                    if enemy_piece is not None and self.player.can_capture(enemy_piece.player) and \
-                            enemy_piece.n_moves == 1 and int(4.5 - self.direction_player[0] / 2) == self.position[0] \
-                            and self_classical.moves[-1].piece == enemy_piece:
+                    if enemy_piece is not None and enemy_piece is self_classical.en_passant_pawn() and \
+                            self.player.can_capture(enemy_piece.player):
                         return [EnPassant(self, new_position, enemy_piece, is_valid_move=True)]
 
                 # Base movement
@@ -89,6 +119,54 @@ class Classical(GameMode):
 
                 return []
 
+            def get_attacked_squares(self) -> List[int]:
+                tables = self.board.tables
+                square = tables.square_index(self.position)
+                forward = int(self.direction_player[0])
+                return [attacked for attacked in (tables.translate(square, (forward, side)) for side in (-1, 1))
+                        if attacked != -1]
+
+            def get_encoded_moves(self) -> List[int]:
+                tables = self.board.tables
+                squares = self.board.squares
+                square = tables.square_index(self.position)
+                forward = int(self.direction_player[0])
+                promotion_row = 7 if self.player == white else 0
+                moves: List[int] = []
+
+                def add_moves(destination: int, flags: int) -> None:
+                    if tables.coordinates[destination][0] == promotion_row:
+                        moves.extend(pack_move(square, destination, flags | PROMOTION, index)
+                                     for index in range(len(self.valid_pieces_type)))
+                    else:
+                        moves.append(pack_move(square, destination, flags))
+
+                # Base movement
+                destination = tables.translate(square, (forward, 0))
+                if destination != -1 and squares[destination] is None:
+                    add_moves(destination, 0)
+
+                    # Initial movement
+                    destination = tables.translate(square, (2 * forward, 0))
+                    if self.n_moves == 0 and destination != -1 and squares[destination] is None:
+                        moves.append(pack_move(square, destination))
+
+                en_passant_pawn = self_classical.en_passant_pawn()
+                for side in (-1, 1):
+                    destination = tables.translate(square, (forward, side))
+                    if destination == -1:
+                        continue
+                    # Capture
+                    enemy_piece = squares[destination]
+                    if enemy_piece is not None:
+                        if self.player.can_capture(enemy_piece.player):
+                            add_moves(destination, CAPTURE)
+                    # En Passant
+                    elif en_passant_pawn is not None and squares[tables.translate(square, (0, side))] is en_passant_pawn \
+                            and self.player.can_capture(en_passant_pawn.player):
+                        moves.append(pack_move(square, destination, CAPTURE | EN_PASSANT))
+                return moves
+
             def get_piece_valid_moves(self) -> List["Movement"]:
                 moves: List["Movement"] = []
                 direction_player = Position([-1, 0]) if self.player == black else Position([1, 0])
@@ -101,7 +179,7 @@ class Classical(GameMode):
                 # Initial movement
                 move = cast(Position, self.position + 2 * direction_player)
                 if self.board.is_position_inside(move) and self.n_moves == 0 and \
-                        not any(self.board[pos] for pos in self.position.create_lineal_path(move)):
+                        self.board.is_path_clear(self.position, move) and self.board[move] is None:
                     moves.append(BasicMovement(self, move, is_valid_move=True))
 
                 for x in (Position([0, -1]), Position([0, 1])):
@@ -113,9 +191,8 @@ class Classical(GameMode):
                         # En Passant
                         else:
                             enemy_piece = self.board[self.position + x]
-                            if enemy_piece is not None and self.player.can_capture(enemy_piece.player) and \
-                                    enemy_piece.n_moves == 1 and int(4.5 - self.direction_player[0] / 2) == \
-                                    self.position[0] and self_classical.moves[-1].piece == enemy_piece:
+                            if enemy_piece is not None and enemy_piece is self_classical.en_passant_pawn() and \
+                                    self.player.can_capture(enemy_piece.player):
                                 moves.append(EnPassant(self, move, enemy_piece, is_valid_move=True))
 
                 return moves
@@ -127,7 +204,7 @@ class Classical(GameMode):
         for piece in pieces:
             piece.__repr__ = custom_repr  # type: ignore
 
-        super().__init__(Board((8, 8)), cycle((white, black)), [white, black], pieces)
+        super().__init__(board_type((8, 8)), cycle((white, black)), [white, black], pieces)
 
     def __del__(self):
         def original_repr(piece_self: "Piece"):
@@ -154,7 +231,7 @@ class Classical(GameMode):
                 self.board.add_piece(self.ClassicalPawn(self.board, color, Position([pos1, i])))  # type: ignore
 
     def check_game_state(self) -> Tuple["GameState", List["Player"]]:
-        if np.all(self.board.board == None):  # noqa: E711
+        if self.board.is_empty():
             return GameState.EMPTY_BOARD, []
         if len(self.moves) == 0:
             return GameState.STARTING, []
@@ -179,9 +256,167 @@ class Classical(GameMode):
         if move.piece_is_captured():
             self.last_capture = len(self.moves)
 
+    def en_passant_pawn(self) -> Optional["Piece"]:
+        """Pawn that can be captured en passant, only possible after a pawn advances two squares in the last move."""
+        if self.last_move_is_null():
+            return None
+        if not self.moves:
+            return self.initial_en_passant
+        last_move = self.moves[-1]
+        pawn_type: Type["Piece"] = self.ClassicalPawn  # type: ignore
+        initial_position, destination_position = last_move[-1].initial_position, last_move[-1].destination_position
+        if isinstance(last_move.piece, pawn_type) and last_move.piece.n_moves == 1 and initial_position is not None \
+                and destination_position is not None and abs(destination_position[0] - initial_position[0]) == 2:
+            return last_move.piece
+        return None
+
+    def en_passant_key(self) -> int:
+        pawn = self.en_passant_pawn()
+        return ZOBRIST.en_passant_key(int(pawn.position[1])) if pawn is not None else 0
+
     def check_more_than_50_moves(self) -> bool:
         return len(self.moves) > self.last_capture + 100
 
+    def halfmove_clock(self) -> int:
+        """Moves (plies) since the last capture or pawn advance, as counted by the FEN records."""
+        pawn_type: Type["Piece"] = self.ClassicalPawn  # type: ignore
+        for plies, move in enumerate(reversed(self.moves)):
+            if isinstance(move.piece, pawn_type) or move.piece_is_captured():
+                return plies
+        return self.initial_halfmove_clock + len(self.moves)
+
+    def position_state(self) -> Tuple[int, ...]:
+        """Square of the pawn that can be captured en passant (-1 if there isn't one), halfmove clock and ply."""
+        pawn = self.en_passant_pawn()
+        square = self.board.square_index(pawn.position) if pawn is not None else -1
+        return square, self.halfmove_clock(), self.initial_ply + len(self.moves)
+
+    def set_position_state(self, state: Tuple[int, ...]) -> None:
+        square, halfmove_clock, ply = state
+        self.initial_en_passant = self.board.squares[square] if square != -1 else None
+        self.initial_halfmove_clock = halfmove_clock
+        self.last_capture = -halfmove_clock
+        self.initial_ply = ply
+
+    def fullmove_number(self) -> int:
+        """Number of the current move, starting at 1 and incremented after each move of black."""
+        return (self.initial_ply + len(self.moves)) // 2 + 1
+
+    def generate_legal_moves(self) -> List["Movement"]:
+        return [decode_move(self, code) for code in self.generate_encoded_legal_moves()]
+
+    def generate_encoded_legal_moves(self) -> List[int]:
+        player = self.current_player_turn
+        safety = self.king_safety(player)
+        # Validating en passant captures makes and undoes them, so all the moves are generated first
+        codes = [code for pieces in list(self.board.pieces[player].values()) for piece in list(pieces) for code in
+                 piece.get_encoded_moves()]
+        return [code for code in codes if self.is_legal_encoded_move(code, player, safety)]
+
+    def generate_captures(self) -> List["Movement"]:
+        player = self.current_player_turn
+        safety = self.king_safety(player)
+        codes = [code for pieces in list(self.board.pieces[player].values()) for piece in list(pieces) for code in
+                 piece.get_encoded_moves() if code & (CAPTURE | PROMOTION)]
+        return [decode_move(self, code) for code in codes if self.is_legal_encoded_move(code, player, safety)]
+
+    def generate_moves_of_a_piece(self, piece: "Piece") -> List["Movement"]:
+        safety = self.king_safety(piece.player)
+        return [decode_move(self, code) for code in piece.get_encoded_moves()
+                if self.is_legal_encoded_move(code, piece.player, safety)]
+
+    def king_safety(self, player: "Player") -> KingSafety:
+        """
+        Finds the enemy pieces giving check to the king of the player and the pieces pinned to the king, walking the
+        rays and jumps of the king square.
+
+        :param player: Owner of the king
+        :return: Checks and pins of the king
+        """
+        kings = self.board.pieces[player][self.King]  # type: ignore
+        if not kings:
+            return KingSafety(None, -1, [], None, {}, set())
+
+        king = kings[0]
+        tables = self.board.tables
+        squares = self.board.squares
+        king_square = tables.square_index(king.position)
+
+        checkers: List["Piece"] = []
+        block_squares: Set[int] = set()
+        pins: Dict[int, Set[int]] = {}
+        xray_squares: Set[int] = set()
+
+        sliders = ((tables.rook_rays, (self.Rook, self.Queen)), (tables.bishop_rays, (self.Bishop, self.Queen)))  # type: ignore
+        for rays, slider_types in sliders:
+            for ray in rays[king_square]:
+                pinned_square: Optional[int] = None
+                for distance, square in enumerate(ray):
+                    piece = squares[square]
+                    if piece is None:
+                        continue
+                    if not player.can_capture(piece.player):
+                        if pinned_square is not None:
+                            break
+                        pinned_square = square
+                        continue
+                    if isinstance(piece, slider_types):
+                        if pinned_square is None:
+                            checkers.append(piece)
+                            block_squares.update(ray[:distance + 1])
+                            direction = [coord - king_coord for coord, king_coord in
+                                         zip(tables.coordinates[ray[0]], tables.coordinates[king_square])]
+                            xray_squares.add(tables.translate(king_square, tuple(-step for step in direction)))
+                        else:
+                            pins[pinned_square] = set(ray[:distance + 1])
+                    break
+
+        for square in tables.knight_jumps[king_square]:
+            piece = squares[square]
+            if isinstance(piece, self.Knight) and player.can_capture(piece.player):  # type: ignore
+                checkers.append(piece)
+                block_squares.add(square)
+
+        for square in tables.king_jumps[king_square]:
+            piece = squares[square]
+            if isinstance(piece, self.ClassicalPawn) and player.can_capture(piece.player):  # type: ignore
+                diff = king.position - piece.position
+                if diff[0] == piece.direction_player[0] and abs(diff[1]) == 1:
+                    checkers.append(piece)
+                    block_squares.add(square)
+
+        return KingSafety(king, king_square, checkers, block_squares if checkers else None, pins, xray_squares)
+
+    def is_legal_encoded_move(self, code: int, player: "Player", safety: KingSafety) -> bool:
+        """
+        Checks the pseudo-legal encoded move doesn't leave the king of the player in check. King moves are checked with
+        the attack maps of the board, only en passant captures (which can discover a check removing two pieces of the
+        same row) are made and undone.
+
+        :param code: Pseudo-legal encoded move of the player, see `~movements.MoveEncoding`
+        :param player: Owner of the king
+        :param safety: Checks and pins of the king, see `king_safety`
+        :return: True if the move is legal
+        """
+        if safety.king is None:
+            return True
+        flags = move_flags(code)
+        if flags & CASTLING:
+            return not safety.checkers
+        if flags & EN_PASSANT:
+            return self.check_valid_move(decode_move(self, code))
+
+        origin, destination = origin_square(code), destination_square(code)
+        if origin == safety.king_square:
+            return destination not in safety.xray_squares and not self.board.is_square_attacked(destination, player)
+        if len(safety.checkers) > 1:
+            return False
+
+        if safety.block_squares is not None and destination not in safety.block_squares:
+            return False
+        pin = safety.pins.get(origin)
+        return pin is None or destination in pin
+
     def check_valid_move(self, move: "Movement") -> bool:
         king = self.board.pieces[move.player][self.King][0]  # type: ignore
         # Checks king is not being moved and tests for checks
@@ -193,32 +428,140 @@ class Classical(GameMode):
         return will_not_be_in_check
 
     def restart(self) -> None:
+        """
+        Removes the pieces and the moves, so the board can be generated again. The board is kept, with its observers
+        (i.e. incremental evaluators).
+        """
+        self.moves = []
+        self.null_moves = []
         self.last_capture = 0
+        self.initial_ply = 0
+        self.initial_halfmove_clock = 0
+        self.initial_en_passant = None
         self.order = cycle((self.white, self.black))
         self.current_player_turn = next(self.order)
-        self.board = Board((8, 8))
+        self.board.clear()
 
     def to_fen(self) -> str:
-        rows_str = []
-        for row in reversed(self.board.board):  # type: ignore
-            none_count = 0
-            row_str = []
-            for piece in row:
+        squares = self.board.squares
+        rows = []
+        for row in range(7, -1, -1):
+            row_str, empty = "", 0
+            for piece in squares[8 * row:8 * row + 8]:
                 if piece is None:
-                    none_count += 1
-                else:
-                    if none_count > 0:
-                        row_str.append(str(none_count))
-                        none_count = 0
-                    row_str.append(piece.abbreviation() if piece.player == self.white else piece.abbreviation().lower())
-            if none_count > 0:
-                row_str.append(str(none_count))
-            rows_str.append("".join(row_str))
-
-        board_str = "/".join(rows_str)
-        return f"{board_str} {'w' if self.current_player_turn == self.white else 'b'} {'CASTLING'} {'EN_PASSANT'} " \
-               f"{len(self.moves) - self.last_capture} {'FULL_MOVES'} "
+                    empty += 1
+                    continue
+                if empty:
+                    row_str += str(empty)
+                    empty = 0
+                row_str += piece.abbreviation() if piece.player == self.white else piece.abbreviation().lower()
+            if empty:
+                row_str += str(empty)
+            rows.append(row_str)
+
+        castling = "".join(right for right, (king_square, rook_square) in CASTLING_SQUARES.items()
+                           if self.has_castling_right(squares[king_square], squares[rook_square], right.isupper()))
+        pawn = self.en_passant_pawn()
+        # The target is the square the pawn skipped, behind it
+        en_passant = str(pawn.position - pawn.direction_player) if pawn is not None else "-"  # type: ignore
+        return f"{'/'.join(rows)} {'w' if self.current_player_turn == self.white else 'b'} {castling or '-'} " \
+               f"{en_passant} {self.halfmove_clock()} {self.fullmove_number()}"
+
+    def has_castling_right(self, king: Optional["Piece"], rook: Optional["Piece"], white: bool) -> bool:
+        """Checks the castling right of the FEN records: unmoved king and rook of the player (white or black)."""
+        king_type, rook_type = self.King, self.Rook  # type: ignore
+        return isinstance(king, king_type) and isinstance(rook, rook_type) and king.n_moves == 0 and \
+            rook.n_moves == 0 and king.player is rook.player and (king.player is self.white) == white
+
+    def load_fen(self, fen: str) -> None:
+        """
+        Sets up the position of a FEN record, replacing the pieces of the board and the moves of the game. Castling
+        rights are kept as the number of moves of the kings and rooks: pieces without rights are marked as moved, like
+        the pawns outside their initial row. The clocks can be omitted, as in the EPD records.
+
+        :raises InvalidArgumentsError: if the record is malformed or its castling or en passant fields don't match the
+            pieces
+        """
+        fields = fen.split()
+        if len(fields) == 4:
+            fields += ["0", "1"]
+        if len(fields) != 6:
+            raise InvalidArgumentsError(f"Invalid FEN {fen}")
+        placement, turn, castling, en_passant, halfmove_clock, fullmove_number = fields
+        rows = placement.split("/")
+        if len(rows) != 8 or turn not in ("w", "b") or not halfmove_clock.isdigit() or \
+                not fullmove_number.isdigit():
+            raise InvalidArgumentsError(f"Invalid FEN {fen}")
+
+        self.moves = []
+        self.null_moves = []
+        self.order = cycle((self.white, self.black))
+        self.current_player_turn = next(self.order)
+        self.initial_en_passant = None
+        board = self.board
+        board.clear()
+        positions = board.tables.positions
+        piece_types: Dict[str, Type["Piece"]] = {piece_type.abbreviation(): piece_type for piece_type in self.pieces}
+        castlable_types = (self.King, self.Rook)  # type: ignore
+        squares: List[Optional["Piece"]] = [None] * 64
+
+        for row, row_str in zip(range(7, -1, -1), rows):
+            column = 0
+            for char in row_str:
+                if char.isdigit():
+                    column += int(char)
+                    continue
+                piece_type = piece_types.get(char.upper())
+                if piece_type is None or column >= 8:
+                    raise InvalidArgumentsError(f"Invalid FEN {fen}")
+                player = self.white if char.isupper() else self.black
+                square = 8 * row + column
+                piece = squares[square] = piece_type(board, player, positions[square])  # type: ignore
+                if piece_type is self.ClassicalPawn:  # type: ignore
+                    piece.n_moves = int(row != (1 if player is self.white else 6))
+                elif issubclass(piece_type, castlable_types):
+                    piece.n_moves = 1
+                column += 1
+            if column != 8:
+                raise InvalidArgumentsError(f"Invalid FEN {fen}")
+
+        for right in castling if castling != "-" else "":
+            if right not in CASTLING_SQUARES:
+                raise InvalidArgumentsError(f"Invalid castling right {right}")
+            king, rook = (squares[square] for square in CASTLING_SQUARES[right])
+            if king is None or rook is None:
+                raise InvalidArgumentsError(f"Invalid castling right {right}")
+            king.n_moves = rook.n_moves = 0
+            if not self.has_castling_right(king, rook, right.isupper()):
+                raise InvalidArgumentsError(f"Invalid castling right {right}")
+
+        if turn == "b":
+            self.current_player_turn = next(self.order)
+        if en_passant != "-":
+            # The pawn that advanced two squares is in front of the target, from the point of view of the player
+            target_row = 2 if turn == "b" else 5
+            if len(en_passant) != 2 or en_passant[0] not in "abcdefgh" or en_passant[1] != str(target_row + 1):
+                raise InvalidArgumentsError(f"Invalid en passant target {en_passant}")
+            pawn = squares[8 * (target_row + (1 if turn == "b" else -1)) + ord(en_passant[0]) - ord("a")]
+            if not isinstance(pawn, self.ClassicalPawn) or pawn.player is self.current_player_turn:  # type: ignore
+                raise InvalidArgumentsError(f"Invalid en passant target {en_passant}")
+            pawn.n_moves = 1
+            self.initial_en_passant = pawn
+
+        self.initial_halfmove_clock = int(halfmove_clock)
+        self.last_capture = -self.initial_halfmove_clock
+        self.initial_ply = 2 * (max(int(fullmove_number), 1) - 1) + (turn == "b")
+        board.add_pieces(piece for piece in squares if piece is not None)
 
     @classmethod
-    def from_fen(cls, fen: str) -> "GameMode":
-        pass
+    def from_fen(cls, fen: str, white: Optional["Player"] = None, black: Optional["Player"] = None,
+                 board_type: Type[Board] = Board) -> "Classical":
+        """
+        Creates a game in the position of a FEN record, see `load_fen`. Loading many records is faster reusing the
+        same game with `load_fen`.
+
+        :raises InvalidArgumentsError: if the record is invalid
+        """
+        game_mode = cls(white or Player("White"), black or Player("Black"), board_type)
+        game_mode.load_fen(fen)
+        return game_mode
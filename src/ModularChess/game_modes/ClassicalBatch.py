@@ -0,0 +1,380 @@
+from typing import List, Sequence, Tuple, TYPE_CHECKING
+
+import numpy as np
+import numpy.typing as npt
+
+from ModularChess.movements.MoveEncoding import CAPTURE, CASTLING, DESTINATION_SHIFT, EN_PASSANT, FLAGS_MASK, \
+    PROMOTION, PROMOTION_SHIFT, SQUARE_MASK
+from ModularChess.utils.MoveTables import get_move_tables, Vector
+
+if TYPE_CHECKING:
+    from ModularChess.game_modes.Classical import Classical
+
+BoolArray = npt.NDArray[np.bool_]
+IntArray = npt.NDArray[np.int64]
+
+# Planes of each player, in the same order for white (planes 0-5) and black (planes 6-11)
+PIECE_TYPES = ("ClassicalPawn", "Knight", "Bishop", "Rook", "Queen", "King")
+PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING = range(len(PIECE_TYPES))
+# Same order as the valid pieces of the Classical pawn, so promotion indices match `~movements.MoveEncoding`
+PROMOTION_TYPES = (QUEEN, ROOK, BISHOP, KNIGHT)
+
+N_PIECE_PLANES = 2 * len(PIECE_TYPES)
+# Pieces that haven't moved (castling rights and pawn initial moves)
+UNMOVED = N_PIECE_PLANES
+# Pawn that can be captured en passant
+EN_PASSANT_PAWN = N_PIECE_PLANES + 1
+# Set in every square when black moves
+TURN = N_PIECE_PLANES + 2
+N_PLANES = N_PIECE_PLANES + 3
+
+
+def shift(array: BoolArray, vector: Vector) -> BoolArray:
+    """
+    Moves every board of the batch (first axis) by the vector, dropping the squares that leave the board.
+
+    :param array: Boolean array of shape (N, rows, columns)
+    :param vector: Displacement of each axis of the board
+    :return: Shifted array
+    """
+    result = np.zeros_like(array)
+    source: List[slice] = [slice(None)]
+    target: List[slice] = [slice(None)]
+    for step, size in zip(vector, array.shape[1:]):
+        source.append(slice(0, max(size - step, 0)) if step >= 0 else slice(-step, size))
+        target.append(slice(step, size) if step >= 0 else slice(0, max(size + step, 0)))
+    result[tuple(target)] = array[tuple(source)]
+    return result
+
+
+class ClassicalBatch:
+    """
+    Move generation of many Classical positions at once. Positions are packed in a boolean tensor of shape
+    (N, 8, 8, N_PLANES): one plane per player and piece type, plus the unmoved pieces, the pawn that can be captured en
+    passant and the player to move. Moves are generated with shifts and masks over the whole batch, following the
+    rules of the pieces of `~game_modes.Classical.Classical`, and encoded as in `~movements.MoveEncoding`.
+    """
+
+    def __init__(self) -> None:
+        self.tables = get_move_tables((8, 8))
+        self.shape = self.tables.shape
+        self.n_squares = self.tables.n_squares
+        self.columns = self.shape[1]
+
+        # Squares around each square, padded with the square itself where the board ends
+        directions = self.tables.rook_directions + self.tables.bishop_directions
+        self.diagonal_rays = np.array([direction in self.tables.bishop_directions for direction in directions])
+        self.rays, self.valid_rays = self.padded_squares(
+            [[tuple(step * distance for step in direction) for distance in range(1, max(self.shape))]
+             for direction in directions])
+        self.knight_squares, self.valid_knight_squares = self.padded_squares([self.tables.knight_vectors])
+        self.king_squares, self.valid_king_squares = self.padded_squares([self.tables.king_vectors])
+        # Enemy pawns attacking each square, for the white king (index 0) and for the black king (index 1)
+        pawn_squares = [self.padded_squares([[(row, -1), (row, 1)]]) for row in (1, -1)]
+        self.pawn_attackers = np.stack([squares for squares, _ in pawn_squares])
+        self.valid_pawn_attackers = np.stack([valid for _, valid in pawn_squares])
+
+    def padded_squares(self, vector_groups: Sequence[Sequence[Vector]]) -> Tuple[IntArray, BoolArray]:
+        """
+        Squares reached from each square with each group of vectors, and whether they are inside the board.
+
+        :param vector_groups: Groups of vectors with the same length
+        :return: Squares and valid squares, of shape (squares, groups, vectors) or (squares, vectors) with one group
+        """
+        squares = np.array([[[self.tables.translate(square, vector) for vector in vectors] for vectors in vector_groups]
+                            for square in range(self.n_squares)], dtype=np.int64)
+        if len(vector_groups) == 1:
+            squares = squares[:, 0]
+        valid = squares != -1
+        return np.where(valid, squares, np.arange(self.n_squares).reshape(-1, *[1] * (squares.ndim - 1))), valid
+
+    @staticmethod
+    def pack(game_modes: Sequence["Classical"]) -> BoolArray:
+        """
+        Packs the current position of each game in the planes tensor.
+
+        :param game_modes: Classical games
+        :return: Tensor of shape (N, 8, 8, N_PLANES)
+        """
+        planes = np.zeros((len(game_modes), 8, 8, N_PLANES), dtype=np.bool_)
+        for index, game_mode in enumerate(game_modes):
+            for player_index, player in enumerate((game_mode.white, game_mode.black)):
+                for piece_type, pieces in game_mode.board.pieces[player].items():
+                    plane = player_index * len(PIECE_TYPES) + PIECE_TYPES.index(piece_type.__name__)
+                    for piece in pieces:
+                        row, column = piece.position.tolist()
+                        planes[index, row, column, plane] = True
+                        planes[index, row, column, UNMOVED] = piece.n_moves == 0
+
+            en_passant_pawn = game_mode.en_passant_pawn()
+            if en_passant_pawn is not None:
+                row, column = en_passant_pawn.position.tolist()
+                planes[index, row, column, EN_PASSANT_PAWN] = True
+            planes[index, :, :, TURN] = game_mode.current_player_turn is game_mode.black
+        return planes
+
+    def player_planes(self, planes: BoolArray, black: BoolArray) -> Tuple[BoolArray, BoolArray]:
+        """Piece planes of the player (black or white) and of its enemy, indexed by piece type."""
+        white_planes, black_planes = planes[..., :len(PIECE_TYPES)], planes[..., len(PIECE_TYPES):N_PIECE_PLANES]
+        selector = black[:, None, None, None]
+        return np.where(selector, black_planes, white_planes), np.where(selector, white_planes, black_planes)
+
+    def attacked_squares(self, pieces: BoolArray, occupied: BoolArray, forward: IntArray) -> BoolArray:
+        """
+        Squares attacked by the pieces of a player in each board.
+
+        :param pieces: Piece planes of the attacking player, shape (N, 8, 8, 6)
+        :param occupied: Occupied squares, shape (N, 8, 8)
+        :param forward: Row direction of the pawns of the attacking player in each board (1 or -1)
+        :return: Attacked squares, shape (N, 8, 8)
+        """
+        attacks = np.zeros(occupied.shape, dtype=np.bool_)
+        for direction in (1, -1):
+            pawns = pieces[..., PAWN] & (forward == direction)[:, None, None]
+            for side in (-1, 1):
+                attacks |= shift(pawns, (direction, side))
+        for vector in self.tables.knight_vectors:
+            attacks |= shift(pieces[..., KNIGHT], vector)
+        for vector in self.tables.king_vectors:
+            attacks |= shift(pieces[..., KING], vector)
+
+        empty = ~occupied
+        for directions, slider_type in ((self.tables.rook_directions, ROOK), (self.tables.bishop_directions, BISHOP)):
+            sliders = pieces[..., slider_type] | pieces[..., QUEEN]
+            for vector in directions:
+                frontier = shift(sliders, vector)
+                while frontier.any():
+                    attacks |= frontier
+                    frontier = shift(frontier & empty, vector)
+        return attacks
+
+    def collect(self, targets: BoolArray, vector: Vector, flags: int) -> Tuple[IntArray, IntArray]:
+        """Encodes the moves reaching the target squares, coming from the squares at -vector."""
+        boards, rows, columns = np.nonzero(targets)
+        destinations = rows * self.columns + columns
+        origins = (rows - vector[0]) * self.columns + (columns - vector[1])
+        return boards.astype(np.int64), (origins | destinations << DESTINATION_SHIFT | flags).astype(np.int64)
+
+    def generate_pseudo_legal_moves(self, planes: BoolArray) -> Tuple[IntArray, IntArray]:
+        """
+        Pseudo-legal moves of the player to move in each board, castling moves are already legal.
+
+        :param planes: Packed positions
+        :return: Board index and encoded move of each move
+        """
+        black = planes[:, 0, 0, TURN]
+        own, enemy = self.player_planes(planes, black)
+        own_occupied, enemy_occupied = np.any(own, axis=-1), np.any(enemy, axis=-1)
+        empty = ~(own_occupied | enemy_occupied)
+        unmoved = planes[..., UNMOVED]
+        forward = np.where(black, -1, 1)
+
+        moves: List[Tuple[IntArray, IntArray]] = []
+
+        def add(targets: BoolArray, vector: Vector, flags: int = 0) -> None:
+            moves.append(self.collect(targets & empty, vector, flags))
+            moves.append(self.collect(targets & enemy_occupied, vector, flags | CAPTURE))
+
+        for vector in self.tables.knight_vectors:
+            add(shift(own[..., KNIGHT], vector), vector)
+        for vector in self.tables.king_vectors:
+            add(shift(own[..., KING], vector), vector)
+        for directions, slider_type in ((self.tables.rook_directions, ROOK), (self.tables.bishop_directions, BISHOP)):
+            sliders = own[..., slider_type] | own[..., QUEEN]
+            for vector in directions:
+                frontier, distance = shift(sliders, vector), 1
+                while frontier.any():
+                    add(frontier, tuple(step * distance for step in vector))
+                    frontier, distance = shift(frontier & empty, vector), distance + 1
+
+        # Pawns move in opposite directions, so each direction is generated separately
+        last_row = np.zeros(self.shape, dtype=np.bool_)
+        en_passant_pawns = planes[..., EN_PASSANT_PAWN]
+        for direction, promotion_row in ((1, self.shape[0] - 1), (-1, 0)):
+            pawns = own[..., PAWN] & (forward == direction)[:, None, None]
+            last_row[:] = False
+            last_row[promotion_row] = True
+
+            push = shift(pawns, (direction, 0)) & empty
+            double_push = shift(push & shift(unmoved, (direction, 0)), (direction, 0)) & empty
+            moves.append(self.collect(double_push, (2 * direction, 0), 0))
+            for side in (-1, 0, 1):
+                vector = (direction, side)
+                targets = push if side == 0 else shift(pawns, vector) & enemy_occupied
+                flags = 0 if side == 0 else CAPTURE
+                moves.append(self.collect(targets & ~last_row, vector, flags))
+                for index in range(len(PROMOTION_TYPES)):
+                    moves.append(self.collect(targets & last_row, vector, flags | PROMOTION | index << PROMOTION_SHIFT))
+                if side != 0:
+                    # The captured pawn is next to the pawn, the destination is behind the captured pawn
+                    en_passant = shift(pawns, (0, side)) & en_passant_pawns & enemy[..., PAWN]
+                    moves.append(self.collect(shift(en_passant, (direction, 0)) & empty, vector, CAPTURE | EN_PASSANT))
+
+        moves.append(self.generate_castling(planes, own, enemy, empty, forward))
+        boards = np.concatenate([board for board, _ in moves])
+        codes = np.concatenate([code for _, code in moves])
+        return boards, codes
+
+    def generate_castling(self, planes: BoolArray, own: BoolArray, enemy: BoolArray, empty: BoolArray,
+                          forward: IntArray) -> Tuple[IntArray, IntArray]:
+        """
+        Castling moves: the king and the rook haven't moved, there are no pieces between them and the king isn't
+        attacked in its square nor in the squares it passes through.
+        """
+        unmoved = planes[..., UNMOVED]
+        enemy_attacks = self.attacked_squares(enemy, ~empty, -forward).reshape(len(planes), -1)
+        empty_squares = empty.reshape(len(planes), -1)
+        kings = (own[..., KING] & unmoved).reshape(len(planes), -1)
+        rooks = (own[..., ROOK] & unmoved).reshape(len(planes), -1)
+
+        boards_list: List[IntArray] = []
+        codes_list: List[IntArray] = []
+        for king_square in range(self.n_squares):
+            king_boards = np.nonzero(kings[:, king_square])[0]
+            if len(king_boards) == 0:
+                continue
+            row, king_column = divmod(king_square, self.columns)
+            for rook_column in range(self.columns):
+                rook_square = row * self.columns + rook_column
+                if rook_column == king_column or not rooks[king_boards, rook_square].any():
+                    continue
+                step = 1 if rook_column > king_column else -1
+                between = [row * self.columns + column for column in range(king_column + step, rook_column, step)]
+                # The king moves half the distance to the rook (rounding up)
+                king_destination = king_column + int(np.ceil((rook_column - king_column) / 2))
+                king_path = [row * self.columns + column for column in
+                             range(king_column, king_destination + step, step)]
+
+                valid = rooks[king_boards, rook_square] & empty_squares[king_boards][:, between].all(axis=1) & \
+                    ~enemy_attacks[king_boards][:, king_path].any(axis=1)
+                boards_list.append(king_boards[valid])
+                codes_list.append(np.full(int(valid.sum()), king_square | rook_square << DESTINATION_SHIFT | CASTLING,
+                                          dtype=np.int64))
+
+        if not boards_list:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        return np.concatenate(boards_list), np.concatenate(codes_list)
+
+    def make_moves(self, planes: BoolArray, boards: IntArray, codes: IntArray) -> BoolArray:
+        """
+        Positions after making each encoded move in its board.
+
+        :param planes: Packed positions
+        :param boards: Board index of each move
+        :param codes: Encoded moves
+        :return: Packed positions, one for each move
+        """
+        new_planes = planes[boards].reshape(len(boards), self.n_squares, N_PLANES)
+        moves = np.arange(len(boards))
+        origins = codes & SQUARE_MASK
+        destinations = (codes >> DESTINATION_SHIFT) & SQUARE_MASK
+        flags = codes & FLAGS_MASK
+        black = new_planes[:, 0, TURN]
+
+        moved_planes = np.argmax(new_planes[moves, origins, :N_PIECE_PLANES], axis=1)
+        is_pawn = moved_planes % len(PIECE_TYPES) == PAWN
+        double_push = is_pawn & (np.abs(destinations // self.columns - origins // self.columns) == 2)
+        castling = (flags & CASTLING) != 0
+        en_passant = (flags & EN_PASSANT) != 0
+        promotion = (flags & PROMOTION) != 0
+
+        # Captured pieces (en passant captures the pawn in the row of the origin and the column of the destination)
+        captured = np.where(en_passant, origins - origins % self.columns + destinations % self.columns, destinations)
+        captures = ~castling
+        new_planes[moves[captures], captured[captures], :UNMOVED + 1] = False
+
+        new_planes[moves, origins, :UNMOVED + 1] = False
+        new_planes[..., EN_PASSANT_PAWN] = False
+        new_planes[moves[double_push], destinations[double_push], EN_PASSANT_PAWN] = True
+
+        # Promoted pieces replace the pawn
+        player_offset = np.where(black, len(PIECE_TYPES), 0)
+        promoted_types = np.asarray(PROMOTION_TYPES)[(codes >> PROMOTION_SHIFT) % len(PROMOTION_TYPES)]
+        placed_planes = np.where(promotion, player_offset + promoted_types, moved_planes)
+        regular = ~castling
+        new_planes[moves[regular], destinations[regular], placed_planes[regular]] = True
+
+        # The king moves half the distance to the rook (rounding up) and the rook to the other side of the king
+        king_columns = origins % self.columns
+        rook_columns = destinations % self.columns
+        directions = np.sign(rook_columns - king_columns)
+        king_destinations = origins + np.ceil((rook_columns - king_columns) / 2).astype(np.int64)
+        rook_destinations = king_destinations - directions
+        castling_moves = moves[castling]
+        new_planes[castling_moves, destinations[castling], :UNMOVED + 1] = False
+        new_planes[castling_moves, king_destinations[castling], player_offset[castling] + KING] = True
+        new_planes[castling_moves, rook_destinations[castling], player_offset[castling] + ROOK] = True
+
+        new_planes[..., TURN] = ~black[:, None]
+        return new_planes.reshape(len(boards), *self.shape, N_PLANES)
+
+    def is_king_attacked(self, planes: BoolArray, black: BoolArray) -> BoolArray:
+        """
+        Checks if the king of the player (black or white) of each board is attacked. Only the pieces that can reach the
+        king are looked up: the first piece of each ray from the king, and the knights, pawns and kings around it.
+        """
+        n_boards = len(planes)
+        squares = planes.reshape(n_boards, self.n_squares, N_PLANES)
+        boards = np.arange(n_boards)[:, None]
+        own_offset = np.where(black, len(PIECE_TYPES), 0)
+        enemy_planes = (len(PIECE_TYPES) - own_offset)[:, None]
+        kings = np.argmax(squares[boards[:, 0], :, own_offset + KING], axis=1)
+        occupied = np.any(squares[..., :N_PIECE_PLANES], axis=-1)
+
+        def enemy(piece_type: int, targets: IntArray, valid: BoolArray) -> BoolArray:
+            pieces: BoolArray = squares[boards, targets, enemy_planes + piece_type]
+            return pieces & valid
+
+        rays, valid_rays = self.rays[kings], self.valid_rays[kings]
+        ray_boards = boards[:, :, None]
+        blocked = occupied[ray_boards, rays] & valid_rays
+        first = np.take_along_axis(rays, np.argmax(blocked, axis=2)[..., None], axis=2)[..., 0]
+        has_blocker = blocked.any(axis=2)
+        slider_types = np.where(self.diagonal_rays, BISHOP, ROOK)
+        sliders = enemy(QUEEN, first, has_blocker) | squares[boards, first, enemy_planes + slider_types] & has_blocker
+        attacked: BoolArray = sliders.any(axis=1)
+
+        attacked |= enemy(KNIGHT, self.knight_squares[kings], self.valid_knight_squares[kings]).any(axis=1)
+        attacked |= enemy(KING, self.king_squares[kings], self.valid_king_squares[kings]).any(axis=1)
+        pawn_side = black.astype(np.int64)
+        pawn_squares = self.pawn_attackers[pawn_side, kings]
+        attacked |= enemy(PAWN, pawn_squares, self.valid_pawn_attackers[pawn_side, kings]).any(axis=1)
+        return attacked
+
+    def generate_encoded_moves(self, planes: BoolArray) -> Tuple[IntArray, IntArray]:
+        """
+        Legal moves of the player to move in each board. The moves that may leave the king attacked (king moves, en
+        passant, moves of pieces in the lines of the king and every move when the king is in check) are made in the
+        whole batch at once, discarding the ones that leave the king attacked.
+
+        :param planes: Packed positions
+        :return: Board index and encoded move of each legal move, sorted by board
+        """
+        boards, codes = self.generate_pseudo_legal_moves(planes)
+        black = planes[:, 0, 0, TURN]
+        squares = planes.reshape(len(planes), self.n_squares, N_PLANES)
+        kings = np.argmax(squares[np.arange(len(planes)), :, np.where(black, len(PIECE_TYPES), 0) + KING], axis=1)
+        king_lines = np.zeros((len(planes), self.n_squares), dtype=np.bool_)
+        king_lines[np.arange(len(planes))[:, None, None], self.rays[kings]] = self.valid_rays[kings]
+        king_lines[np.arange(len(planes)), kings] = True
+
+        origins = codes & SQUARE_MASK
+        unsafe = self.is_king_attacked(planes, black)[boards] | king_lines[boards, origins] | \
+            (codes & EN_PASSANT != 0)
+        unsafe_moves = np.nonzero(unsafe)[0]
+        new_planes = self.make_moves(planes, boards[unsafe_moves], codes[unsafe_moves])
+        legal = np.ones(len(codes), dtype=np.bool_)
+        legal[unsafe_moves] = ~self.is_king_attacked(new_planes, black[boards[unsafe_moves]])
+        boards, codes = boards[legal], codes[legal]
+        order = np.argsort(boards, kind="stable")
+        return boards[order], codes[order]
+
+    def legal_move_masks(self, planes: BoolArray) -> BoolArray:
+        """
+        Legal moves of each board as a mask of shape (N, squares, squares), indexed by origin and destination squares.
+        Promotions to any piece share the same origin and destination.
+        """
+        boards, codes = self.generate_encoded_moves(planes)
+        masks = np.zeros((len(planes), self.n_squares, self.n_squares), dtype=np.bool_)
+        masks[boards, codes & SQUARE_MASK, (codes >> DESTINATION_SHIFT) & SQUARE_MASK] = True
+        return masks
@@ -0,0 +1,98 @@
+from itertools import cycle
+from typing import List, Tuple, Type, TYPE_CHECKING
+
+from ModularChess.controller.Board import Board
+from ModularChess.controller.Player import Player
+from ModularChess.game_modes.GameMode import GameMode, GameState
+from ModularChess.pieces.Bishop import Bishop
+from ModularChess.pieces.King import King
+from ModularChess.pieces.Knight import Knight
+from ModularChess.pieces.Rook import Rook
+from ModularChess.utils.Exceptions import InvalidArgumentsError
+from ModularChess.utils.Position import Position
+
+if TYPE_CHECKING:
+    from ModularChess.movements.Movement import Movement
+    from ModularChess.pieces.Piece import Piece
+
+# Pieces of each player in its level of the cube: type, row and column
+CUBE_PIECES = ((Rook, 0, 0), (Bishop, 0, 2), (King, 1, 1), (Knight, 2, 2), (Rook, 3, 3))
+
+
+class Cube(GameMode):
+    """
+    Game of two players without pawns on a 4x4x4 board, each one starting in an opposite level, which keeps the perft
+    of a 3D board in the suite (see `~game_modes.Perft.CUBE_SUITE`). Castling isn't defined for more than 2 dimensions,
+    so the pieces are created as already moved.
+    """
+
+    def __init__(self, first: Player, second: Player, board_type: Type[Board] = Board):
+        self.first, self.second = first, second
+        self.board_type = board_type
+        Player.join_allies([first], [first, second])
+        Player.join_allies([second], [first, second])
+        super().__init__(board_type((4, 4, 4)), cycle((first, second)), [first, second], [Rook, Bishop, Knight, King])
+
+    def add_piece(self, piece_type: Type["Piece"], player: Player, position: Position) -> None:
+        piece = piece_type(self.board, player, position)
+        piece.n_moves = 1
+        self.board.add_piece(piece)
+
+    def generate_board(self) -> None:
+        for player, level in ((self.first, 0), (self.second, 3)):
+            for piece_type, row, column in CUBE_PIECES:
+                self.add_piece(piece_type, player, Position([level, row, column]))
+
+    def check_game_state(self) -> Tuple[GameState, List[Player]]:
+        if self.board.is_empty():
+            return GameState.EMPTY_BOARD, []
+        if len(self.moves) == 0:
+            return GameState.STARTING, []
+        if len(self.generate_moves()) == 0:
+            king = self.board.pieces[self.current_player_turn][King][0]
+            if self.board.can_enemy_piece_capture_piece(king) is not None:
+                return GameState.CHECKMATE, self.current_player_turn.enemies
+            return GameState.STALEMATE, [self.first, self.second]
+        return GameState.PLAYING, []
+
+    def check_valid_move(self, move: "Movement") -> bool:
+        king = self.board.pieces[move.player][King][0]
+        self.force_move(move)
+        will_not_be_in_check = self.board.can_enemy_piece_capture_piece(king) is None
+        self.undo_move(1, change_turn=False)
+        return will_not_be_in_check
+
+    def restart(self) -> None:
+        """Removes the pieces and the moves, so the board can be generated again."""
+        self.moves = []
+        self.null_moves = []
+        self.order = cycle((self.first, self.second))
+        self.current_player_turn = next(self.order)
+        self.board.clear()
+
+    def to_fen(self) -> str:
+        """
+        There isn't a FEN notation of 3D boards. The record lists the pieces with their square indices, upper case for
+        the first player (i.e. ``R0``), followed by the index of the player to move.
+        """
+        pieces = [(piece.abbreviation() if piece.player is self.first else piece.abbreviation().lower()) + str(square)
+                  for square, piece in enumerate(self.board.squares) if piece is not None]
+        return " ".join(pieces + [str(int(self.current_player_turn is self.second))])
+
+    @classmethod
+    def from_fen(cls, fen: str) -> "Cube":
+        """:raises InvalidArgumentsError: if the record is invalid, see `to_fen`"""
+        game_mode = cls(Player("First"), Player("Second"))
+        *pieces, turn = fen.split() or [""]
+        piece_types = {piece_type.abbreviation(): piece_type for piece_type in game_mode.pieces}
+        if turn not in ("0", "1"):
+            raise InvalidArgumentsError(f"Invalid record {fen}")
+        for piece in pieces:
+            piece_type = piece_types.get(piece[0].upper())
+            if piece_type is None or not piece[1:].isdigit() or int(piece[1:]) >= game_mode.board.tables.n_squares:
+                raise InvalidArgumentsError(f"Invalid record {fen}")
+            game_mode.add_piece(piece_type, game_mode.first if piece[0].isupper() else game_mode.second,
+                                game_mode.board.square_position(int(piece[1:])))
+        if turn == "1":
+            game_mode.current_player_turn = next(game_mode.order)
+        return game_mode
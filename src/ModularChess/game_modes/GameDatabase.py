@@ -0,0 +1,244 @@
+"""
+Binary store of games (i.e. of self-play runs), read through memory maps. The data file holds, for each game, a record
+with its headers and its moves encoded as integers (see `~movements.MoveEncoding`), and the starting position as a
+`~game_modes.PositionRecord.PositionRecord`, written once by each process and shared by the games starting in it. The
+index file holds the offset of the record of each game, so any game is found in O(1).
+"""
+import mmap
+import os
+import struct
+import threading
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, TYPE_CHECKING
+from urllib.parse import parse_qsl, urlencode
+
+from ModularChess.game_modes.PositionRecord import PositionRecord
+from ModularChess.movements.MoveEncoding import encode_move
+from ModularChess.utils.LRUCache import LRUCache
+
+try:
+    import fcntl
+except ImportError:  # Windows, where the appends are only serialized inside each process
+    fcntl = None  # type: ignore
+
+if TYPE_CHECKING:
+    from ModularChess.game_modes.GameMode import GameMode
+    from ModularChess.movements.Movement import Movement
+
+INDEX_SUFFIX = ".index"
+# Offset of the record of a game in the data file
+OFFSET_STRUCT = struct.Struct("<Q")
+# Offset and length of the starting position, length of the headers and number of moves, followed by the headers and
+# the moves
+RECORD_STRUCT = struct.Struct("<QIII")
+MOVE_STRUCT = struct.Struct("<Q")
+
+
+@dataclass(frozen=True)
+class GameRecord:
+    headers: Dict[str, str]
+    start: PositionRecord
+    # Encoded moves
+    moves: Tuple[int, ...]
+
+
+def write_all(fd: int, data: bytes) -> None:
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
+
+class GameDatabase:
+    """
+    Games stored in a file and its index (the same path ending in ``.index``). Games are only appended, by any number
+    of processes, each one with its own `GameDatabase`: appends hold an exclusive lock of the index, so a game is
+    indexed once its record is completely written. Games appended by other processes are seen by the readers as soon
+    as they are indexed.
+    """
+
+    def __init__(self, path: str, cache_size: int = 128):
+        """
+        :param path: Data file, created with the index by the first append
+        :param cache_size: Starting positions kept decoded by the readers and kept by the writer to not repeat them
+        """
+        self.path = path
+        self.index_path = path + INDEX_SUFFIX
+        self.lock = threading.Lock()
+        self.data_fd: Optional[int] = None
+        self.index_fd: Optional[int] = None
+        self.data_map: Optional[mmap.mmap] = None
+        self.index_map: Optional[mmap.mmap] = None
+        # Offset of the starting positions written by this database
+        self.written_positions: LRUCache[int] = LRUCache(cache_size)
+        self.positions: LRUCache[PositionRecord] = LRUCache(cache_size)
+        # Game mode, offset of the starting position and its key of the last replay, to reuse the position
+        self.last_replay: Optional[Tuple[int, int, int]] = None
+
+    def __enter__(self) -> "GameDatabase":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.unmap()
+        for fd in (self.data_fd, self.index_fd):
+            if fd is not None:
+                os.close(fd)
+        self.data_fd = self.index_fd = None
+
+    def append(self, game_mode: "GameMode", headers: Optional[Dict[str, str]] = None) -> int:
+        """
+        Stores the game played in the game mode, which must be a `PositionRecord` game mode. The moves are undone to
+        record the starting position and made again.
+
+        :return: Index of the game
+        """
+        moves = list(game_mode.moves)
+        game_mode.undo_move(len(moves))
+        try:
+            start = PositionRecord.from_game_mode(game_mode).to_bytes()
+        finally:
+            for move in moves:
+                game_mode.force_move(move)
+                game_mode.current_player_turn = next(game_mode.order)
+        return self.append_moves(start, [encode_move(move) for move in moves], headers)
+
+    def append_moves(self, start: bytes, codes: Sequence[int], headers: Optional[Dict[str, str]] = None) -> int:
+        """
+        Stores a game from its starting position (see `PositionRecord.to_bytes`) and its encoded moves.
+
+        :return: Index of the game
+        """
+        encoded_headers = urlencode(headers or {}).encode()
+        moves = struct.pack(f"<{len(codes)}Q", *codes)
+        with self.lock:
+            if self.data_fd is None or self.index_fd is None:
+                flags = os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, "O_BINARY", 0)
+                self.data_fd = os.open(self.path, flags, 0o644)
+                self.index_fd = os.open(self.index_path, flags, 0o644)
+            data_fd, index_fd = self.data_fd, self.index_fd
+
+            if fcntl is not None:
+                fcntl.flock(index_fd, fcntl.LOCK_EX)
+            try:
+                offset = os.fstat(data_fd).st_size
+                start_offset = self.written_positions.get(start)
+                chunks: List[bytes] = []
+                if start_offset is None:
+                    start_offset = offset
+                    chunks.append(start)
+                record_offset = offset + sum(map(len, chunks))
+                chunks.extend((RECORD_STRUCT.pack(start_offset, len(start), len(encoded_headers), len(codes)),
+                               encoded_headers, moves))
+                write_all(data_fd, b"".join(chunks))
+                self.written_positions.put(start, start_offset)
+
+                index = os.fstat(index_fd).st_size // OFFSET_STRUCT.size
+                write_all(index_fd, OFFSET_STRUCT.pack(record_offset))
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(index_fd, fcntl.LOCK_UN)
+        return index
+
+    def __len__(self) -> int:
+        try:
+            return os.stat(self.index_path).st_size // OFFSET_STRUCT.size
+        except FileNotFoundError:
+            return 0
+
+    def unmap(self) -> None:
+        for file_map in (self.index_map, self.data_map):
+            if file_map is not None:
+                file_map.close()
+        self.index_map = self.data_map = None
+
+    def maps(self, index: int) -> Tuple[mmap.mmap, mmap.mmap]:
+        """
+        Memory maps of the index and the data files containing the game, mapped again if it was appended after they
+        were mapped.
+
+        :raises IndexError: if there isn't a game with the index
+        """
+        if self.index_map is None or self.data_map is None or \
+                (index + 1) * OFFSET_STRUCT.size > len(self.index_map):
+            self.unmap()
+            if not 0 <= index < len(self):
+                raise IndexError("Game index out of range")
+            # The index is mapped first, so the data contains the records of all the indexed games
+            with open(self.index_path, "rb") as index_file:
+                self.index_map = mmap.mmap(index_file.fileno(), 0, access=mmap.ACCESS_READ)
+            with open(self.path, "rb") as data_file:
+                self.data_map = mmap.mmap(data_file.fileno(), 0, access=mmap.ACCESS_READ)
+        return self.index_map, self.data_map
+
+    def read_record(self, index: int) -> Tuple[int, int, bytes, int, int]:
+        """Offset and length of the starting position, headers, and offset and number of moves of the game."""
+        if index < 0:
+            index += len(self)
+        if index < 0:
+            raise IndexError("Game index out of range")
+        index_map, data_map = self.maps(index)
+        offset, = OFFSET_STRUCT.unpack_from(index_map, index * OFFSET_STRUCT.size)
+        start_offset, start_length, headers_length, n_moves = RECORD_STRUCT.unpack_from(data_map, offset)
+        headers_offset = offset + RECORD_STRUCT.size
+        moves_offset = headers_offset + headers_length
+        return start_offset, start_length, data_map[headers_offset:moves_offset], moves_offset, n_moves
+
+    def position(self, offset: int, length: int) -> PositionRecord:
+        """
+        Starting position stored in the offset, decoded once while it's in the cache.
+
+        :raises InvalidArgumentsError: if the stored position is corrupted or names types which aren't game modes and
+            boards (see `PositionRecord.from_bytes`)
+        """
+        record = self.positions.get(offset)
+        if record is None:
+            assert self.data_map is not None
+            record = PositionRecord.from_bytes(self.data_map[offset:offset + length])
+            self.positions.put(offset, record)
+        return record
+
+    def __getitem__(self, index: int) -> GameRecord:
+        """
+        :raises IndexError: if there isn't a game with the index
+        :raises InvalidArgumentsError: if its starting position is corrupted
+        """
+        start_offset, start_length, headers, moves_offset, n_moves = self.read_record(index)
+        assert self.data_map is not None
+        return GameRecord(dict(parse_qsl(headers.decode(), keep_blank_values=True)),
+                          self.position(start_offset, start_length),
+                          struct.unpack_from(f"<{n_moves}Q", self.data_map, moves_offset))
+
+    def __iter__(self) -> Iterator[GameRecord]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def replay(self, game_mode: "GameMode", index: int) -> Iterator["Movement"]:
+        """
+        Sets up the starting position of the game in the game mode and makes its moves, yielding each move once it's
+        made. If the last game replayed in the game mode started in the same position, its moves are undone instead of
+        setting up the pieces again. Moves are made without validation, as in `GameMode.perft`.
+
+        :raises IndexError: if there isn't a game with the index
+        :raises InvalidArgumentsError: if the game mode doesn't match the starting position or it's corrupted
+        """
+        start_offset, start_length, _, moves_offset, n_moves = self.read_record(index)
+        start = self.position(start_offset, start_length)
+        data_map = self.data_map
+        assert data_map is not None
+
+        reuse = False
+        if self.last_replay is not None and self.last_replay[:2] == (id(game_mode), start_offset) and \
+                not game_mode.null_moves:
+            game_mode.undo_move(len(game_mode.moves))
+            reuse = game_mode.position_key == self.last_replay[2] and game_mode.position_state() == start.state
+        if not reuse:
+            start.apply(game_mode)
+        self.last_replay = (id(game_mode), start_offset, game_mode.position_key)
+
+        for code, in MOVE_STRUCT.iter_unpack(data_map[moves_offset:moves_offset + n_moves * MOVE_STRUCT.size]):
+            move = game_mode.decode_move(code)
+            game_mode.force_move(move)
+            game_mode.current_player_turn = next(game_mode.order)
+            yield move
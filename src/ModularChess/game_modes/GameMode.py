@@ -1,11 +1,18 @@
 import abc
-from collections import deque
+import functools
+import time
 from enum import Enum
-from itertools import chain
-from typing import Iterator, Union, Tuple, List, Type, TYPE_CHECKING, Hashable, Callable, TypeVar, Optional
+from itertools import chain, islice
+from typing import Iterator, Union, Tuple, List, Type, TYPE_CHECKING, Callable, TypeVar, Optional
 
+from ModularChess.game_modes.Perft import PerftResult, move_name
+from ModularChess.movements.MoveEncoding import encode_move, decode_move
 from ModularChess.movements.Movement import Movement
+from ModularChess.movements.Promotion import Promotion
+from ModularChess.pieces.King import King
 from ModularChess.utils.Exceptions import InvalidMoveException, InvalidArgumentsError
+from ModularChess.utils.LRUCache import LRUCache
+from ModularChess.utils.Zobrist import ZOBRIST
 
 if TYPE_CHECKING:
     from ModularChess.controller.Board import Board
@@ -15,25 +22,44 @@ if TYPE_CHECKING:
 RT = TypeVar('RT')  # return type
 
 
-def cache_game_mode(arg: Union[Callable[..., RT], int]):
-    cache_deque: deque[Tuple[int, RT]]
+def moves_in_board(game_mode: "GameMode", moves: List[Movement]) -> bool:
+    """Checks that the pieces of the moves are still in the squares the moves start from."""
+    return all(move.initial_position is None or game_mode.board[move.initial_position] is move.piece
+               for movement in moves for move in movement.movements)
+
+
+def cache_game_mode(arg: Union[Callable[..., RT], int, None] = None,
+                    validate: Optional[Callable[["GameMode", RT], bool]] = None):
+    """
+    Caches the result of a game mode method by the position key of the game and the arguments of the call. Each game
+    stores its own `~utils.LRUCache.LRUCache` in the attribute `<method name>_cache`, which can be assigned to share
+    the cache between games or to change its capacity.
+
+    :param arg: Capacity of the cache (5 if the decorator is used without arguments)
+    :param validate: Function checking that a cached result can be used in the current board
+    """
+    capacity: int
     if callable(arg) or arg is None:
-        cache_deque = deque(maxlen=5)
+        capacity = 5
     elif type(arg) is int:
-        cache_deque = deque(maxlen=arg)
+        capacity = arg
     else:
         raise InvalidArgumentsError("Decorator argument must be an integer or empty")
 
-    def find_result(key_to_find: int) -> Optional[RT]:
-        return next((element for index, (key, element) in enumerate(cache_deque) if key_to_find == key), None)
-
     def cache_decorator(func: Callable[..., RT]):
-        def cache(self: Hashable, *args, **kwargs) -> RT:
-            hash_self = hash(self)
-            result = find_result(hash_self)
-            if result is None:
+        attribute = f"{func.__name__}_cache"
+
+        @functools.wraps(func)
+        def cache(self: "GameMode", *args, **kwargs) -> RT:
+            lru_cache: Optional[LRUCache[RT]] = self.__dict__.get(attribute)
+            if lru_cache is None:
+                lru_cache = self.__dict__[attribute] = LRUCache(capacity)
+
+            key = (self.position_key, args, tuple(kwargs.items()))
+            result = lru_cache.get(key)
+            if result is None or (validate is not None and not validate(self, result)):
                 result = func(self, *args, **kwargs)
-                cache_deque.append((hash_self, result))
+                lru_cache.put(key, result)
             return result
 
         return cache
@@ -69,6 +95,8 @@ class GameMode(metaclass=abc.ABCMeta):
     def __init__(self, board: "Board", order: Iterator["Player"], players: List["Player"], pieces: List[Type["Piece"]]):
         self.board = board
         self.moves: List[Movement] = []
+        # Null moves made (see `make_null_move`): number of moves made before each one and the player who passed
+        self.null_moves: List[Tuple[int, "Player"]] = []
         self.current_player_turn = next(order)
         self.order = order
         self.players = players
@@ -81,15 +109,50 @@ class GameMode(metaclass=abc.ABCMeta):
     def generate_board(self) -> None:
         pass
 
-    @cache_game_mode(400)
+    @cache_game_mode(400, validate=moves_in_board)
     def generate_moves(self) -> List[Movement]:
-        return [move for pieces in list(self.board.pieces[self.current_player_turn].values()) for piece in pieces for
-                move in
-                piece.get_piece_valid_moves() if self.check_valid_move(move)]
+        return self.generate_legal_moves()
+
+    def generate_legal_moves(self) -> List[Movement]:
+        """
+        Generates the moves of the current player without using the cache. By default, each pseudo-legal move is
+        validated with `check_valid_move`, game modes can override it with a faster generator.
+        """
+        # Validating a move makes and undoes it, which can reorder the pieces of the board (i.e. promotions), so all the
+        # moves are generated before validating them
+        moves = self.generate_pseudo_legal_moves(self.current_player_turn)
+        return [move for move in moves if self.check_valid_move(move)]
+
+    @cache_game_mode(400)
+    def generate_encoded_moves(self) -> List[int]:
+        return self.generate_encoded_legal_moves()
+
+    def generate_encoded_legal_moves(self) -> List[int]:
+        """
+        Generates the moves of the current player encoded as integers (see `~movements.MoveEncoding`), without using
+        the cache. By default, it encodes the moves of `generate_legal_moves`.
+        """
+        return [encode_move(move) for move in self.generate_legal_moves()]
+
+    def decode_move(self, code: int) -> Movement:
+        """Builds the movement of an encoded move of the current position."""
+        return decode_move(self, code)
+
+    def generate_pseudo_legal_moves(self, player: "Player") -> List[Movement]:
+        """Moves of the pieces of the player, without checking the game mode rules."""
+        return [move for pieces in list(self.board.pieces[player].values()) for piece in list(pieces) for move in
+                piece.get_piece_valid_moves()]
 
     def generate_moves_of_a_piece(self, piece: "Piece") -> List[Movement]:
         return [move for move in piece.get_piece_valid_moves() if self.check_valid_move(move)]
 
+    def generate_captures(self) -> List[Movement]:
+        """
+        Generates the legal captures and promotions of the current player, used by the quiescence search. By default,
+        it filters the cached legal moves, game modes can override it to skip the quiet moves before validating them.
+        """
+        return [move for move in self.generate_moves() if move.piece_is_captured() or isinstance(move, Promotion)]
+
     @abc.abstractmethod
     def check_game_state(self) -> Tuple[GameState, List["Player"]]:
         pass
@@ -114,6 +177,34 @@ class GameMode(metaclass=abc.ABCMeta):
         self.force_move(move)
         self.current_player_turn = next(self.order)
 
+    def make_null_move(self) -> None:
+        """
+        Passes the turn without moving, used by the null-move pruning of the search. The board doesn't change, but the
+        position after a null move doesn't have en passant captures. Must be undone with `undo_null_move` before
+        undoing the moves made before it.
+        """
+        self.null_moves.append((len(self.moves), self.current_player_turn))
+        self.current_player_turn = next(self.order)
+
+    def undo_null_move(self) -> None:
+        """Gives back the turn to the player of the last null move. The moves made after it must be undone first."""
+        if not self.null_moves or self.null_moves[-1][0] != len(self.moves):
+            raise InvalidMoveException("The last move isn't a null move")
+        player = self.null_moves.pop()[1]
+        self.order = chain((player, self.current_player_turn), self.order)
+        self.current_player_turn = next(self.order)
+
+    def last_move_is_null(self) -> bool:
+        """Checks if the current position comes from a null move."""
+        return bool(self.null_moves) and self.null_moves[-1][0] == len(self.moves)
+
+    def is_in_check(self, player: Optional["Player"] = None) -> bool:
+        """Checks if any king of the player (by default the current player) is attacked by an enemy."""
+        player = self.current_player_turn if player is None else player
+        return any(self.board.is_square_attacked(self.board.tables.square_index(piece.position), player)
+                   for piece_type, pieces in self.board.pieces[player].items() if issubclass(piece_type, King)
+                   for piece in pieces)
+
     def undo_move(self, move: Union[int, Movement], change_turn=True) -> None:
         if type(move) is int:
             # Number of moves to undo
@@ -143,12 +234,86 @@ class GameMode(metaclass=abc.ABCMeta):
             self.order = chain(reversed(player_order), self.order)
             self.current_player_turn = next(self.order)
 
+    def perft(self, depth: int, divide: bool = False) -> PerftResult:
+        """
+        Counts the leaf nodes of the tree of legal moves with the depth, used to verify the move generation and measure
+        its speed. The position is restored afterwards.
+
+        :param depth: Number of moves (plies) to explore
+        :param divide: Counts the nodes after each legal move of the current position
+        :return: Nodes, time and, if divided, nodes of each move
+        """
+        if depth < 0:
+            raise InvalidArgumentsError("Depth must be a non-negative integer")
+
+        # Player of each ply, so the turn order doesn't need to be rebuilt after undoing each move
+        turns = [self.current_player_turn, *islice(self.order, depth)]
+
+        def count_nodes(remaining_depth: int, ply: int) -> int:
+            self.current_player_turn = turns[ply]
+            if remaining_depth == 0:
+                return 1
+            # Moves are only built when they are made
+            codes = self.generate_encoded_legal_moves()
+            if remaining_depth == 1:
+                return len(codes)
+
+            nodes = 0
+            for code in codes:
+                self.force_move(decode_move(self, code))
+                nodes += count_nodes(remaining_depth - 1, ply + 1)
+                self.undo_move(1, change_turn=False)
+            self.current_player_turn = turns[ply]
+            return nodes
+
+        start = time.perf_counter()
+        result = PerftResult(depth, 0, 0.)
+        try:
+            if divide and depth > 0:
+                for move in self.generate_legal_moves():
+                    self.force_move(move)
+                    result.divide[move_name(move)] = count_nodes(depth - 1, 1)
+                    self.undo_move(1, change_turn=False)
+                    self.current_player_turn = turns[0]
+                result.nodes = sum(result.divide.values())
+            else:
+                result.nodes = count_nodes(depth, 0)
+        finally:
+            self.current_player_turn = turns[0]
+            self.order = chain(turns[1:], self.order)
+        result.time = time.perf_counter() - start
+        return result
+
     @abc.abstractmethod
     def restart(self) -> None:
         pass
 
     def __hash__(self):
-        return hash(tuple(self.moves))
+        return hash(self.position_key)
+
+    @property
+    def position_key(self) -> int:
+        """
+        Zobrist key of the current position: pieces (including castling rights), player to move and en passant state.
+        Unlike the hash, it doesn't depend on the moves order, so transpositions share the same key.
+        """
+        return self.board.zobrist_key ^ ZOBRIST.player_key(self.current_player_turn) ^ self.en_passant_key()
+
+    def en_passant_key(self) -> int:
+        """Zobrist key of the en passant state. By default, game modes don't have en passant captures."""
+        return 0
+
+    def position_state(self) -> Tuple[int, ...]:
+        """
+        State of the current position which isn't stored in the pieces and depends on the moves made (i.e. en passant
+        captures), so positions can be set up without replaying the moves (see `~game_modes.PositionRecord`). By
+        default, game modes don't have any state.
+        """
+        return ()
+
+    def set_position_state(self, state: Tuple[int, ...]) -> None:
+        """Restores the state returned by `position_state`, after the pieces have been set up and the moves cleared."""
+        pass
 
     @abc.abstractmethod
     def to_fen(self) -> str:
@@ -0,0 +1,171 @@
+"""
+Portable Game Notation (PGN) of `Classical` games. Collections are read lazily, one game at a time, so files of any size
+can be processed with constant memory. Moves are kept as standard algebraic notation (see `~game_modes.SAN`) and only
+played when the game is built.
+"""
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, TextIO
+
+from ModularChess.controller.Player import Player
+from ModularChess.game_modes.Classical import Classical, STARTING_FEN
+from ModularChess.game_modes.GameMode import GameState
+from ModularChess.game_modes.SAN import move_to_san, san_to_move
+from ModularChess.movements.MoveEncoding import encode_move
+from ModularChess.utils.Exceptions import InvalidArgumentsError
+
+# Tags written first, in this order, by every PGN export
+SEVEN_TAG_ROSTER = {"Event": "?", "Site": "?", "Date": "????.??.??", "Round": "?", "White": "?", "Black": "?",
+                    "Result": "*"}
+RESULTS = ("1-0", "0-1", "1/2-1/2", "*")
+LINE_LENGTH = 80
+
+TAG_PATTERN = re.compile(r'\[\s*(\w+)\s+"((?:[^"\\]|\\.)*)"\s*]')
+# Comments, which can be unterminated when they continue in the next line, variations, NAGs, move numbers, results
+# and moves
+TOKEN_PATTERN = re.compile(r"\{[^}]*}?|;.*|[()]|\$\d+|\d+\.+|1-0|0-1|1/2-1/2|\*|[^\s{}();$.]+")
+ANNOTATION_CHARACTERS = "!?"
+
+
+@dataclass
+class PGNGame:
+    headers: Dict[str, str] = field(default_factory=dict)
+    # Moves of the main line, in standard algebraic notation
+    moves: List[str] = field(default_factory=list)
+    result: str = "*"
+
+    def to_game_mode(self, white: Optional[Player] = None, black: Optional[Player] = None) -> Classical:
+        """
+        Plays the moves from the position of the FEN tag, or the starting position.
+
+        :raises InvalidArgumentsError: if the FEN tag is invalid
+        :raises InvalidMoveException: if a move is illegal or ambiguous
+        """
+        game_mode = Classical.from_fen(self.headers.get("FEN", STARTING_FEN),
+                                       white or Player(self.headers.get("White", "White"), (255, 255, 255)),
+                                       black or Player(self.headers.get("Black", "Black"), (0, 0, 0)))
+        for san in self.moves:
+            game_mode.move(san_to_move(game_mode, san))
+        return game_mode
+
+
+def read_games(stream: TextIO) -> Iterator[PGNGame]:
+    """
+    Reads the games of a PGN collection, parsing each one when it's requested. Comments, variations and numeric
+    annotation glyphs are skipped, and the annotations of the moves (i.e. "!?") are removed.
+
+    :raises InvalidArgumentsError: if a tag is malformed
+    """
+    game = PGNGame()
+    in_movetext = False
+    in_comment = False
+    variation_depth = 0
+
+    for line in stream:
+        if in_comment:
+            end = line.find("}")
+            if end == -1:
+                continue
+            in_comment = False
+            line = line[end + 1:]
+        elif line.startswith("%"):
+            continue
+
+        stripped = line.strip()
+        if stripped.startswith("[") and variation_depth == 0:
+            if in_movetext:
+                # A game without result
+                yield game
+                game, in_movetext = PGNGame(), False
+            match = TAG_PATTERN.fullmatch(stripped)
+            if match is None:
+                raise InvalidArgumentsError(f"Invalid PGN tag {stripped}")
+            game.headers[match.group(1)] = re.sub(r"\\(.)", r"\1", match.group(2))
+            continue
+
+        for token in TOKEN_PATTERN.findall(line):
+            first = token[0]
+            if first == "{":
+                in_comment = not token.endswith("}")
+            elif first == "(":
+                variation_depth += 1
+            elif first == ")":
+                variation_depth = max(variation_depth - 1, 0)
+            elif variation_depth > 0 or first in ";$" or (first.isdigit() and token.endswith(".")):
+                continue
+            elif token in RESULTS:
+                game.result = token
+                yield game
+                game, in_movetext, variation_depth = PGNGame(), False, 0
+            else:
+                in_movetext = True
+                game.moves.append(token.rstrip(ANNOTATION_CHARACTERS))
+
+    if in_movetext or game.headers:
+        yield game
+
+
+def write_game(stream: TextIO, game: PGNGame) -> None:
+    """Writes the game in export format: the seven tag roster first and the movetext lines wrapped to 80 characters."""
+    headers = {**SEVEN_TAG_ROSTER, **game.headers, "Result": game.result}
+    for name, value in headers.items():
+        escaped = value.replace("\\", "\\\\").replace('"', '\\"')
+        stream.write(f'[{name} "{escaped}"]\n')
+    stream.write("\n")
+
+    fields = headers.get("FEN", STARTING_FEN).split()
+    white_to_move = len(fields) < 2 or fields[1] == "w"
+    try:
+        move_number = int(fields[5]) if len(fields) > 5 else 1
+    except ValueError:
+        move_number = 1
+    tokens = []
+    for san in game.moves:
+        if white_to_move:
+            tokens.append(f"{move_number}.")
+        elif not tokens:
+            tokens.append(f"{move_number}...")
+        tokens.append(san)
+        if not white_to_move:
+            move_number += 1
+        white_to_move = not white_to_move
+    tokens.append(game.result)
+
+    line = ""
+    for token in tokens:
+        if line and len(line) + 1 + len(token) > LINE_LENGTH:
+            stream.write(line + "\n")
+            line = token
+        else:
+            line = f"{line} {token}" if line else token
+    stream.write(line + "\n\n")
+
+
+def game_result(game_mode: Classical) -> str:
+    state, winners = game_mode.check_game_state()
+    if state == GameState.CHECKMATE:
+        return "1-0" if winners[0] is game_mode.white else "0-1"
+    if state == GameState.DRAW:
+        return "1/2-1/2"
+    return "*"
+
+
+def game_from_game_mode(game_mode: Classical, headers: Optional[Dict[str, str]] = None) -> PGNGame:
+    """
+    Records the moves of a game (i.e. of self-play) with its result. The moves are undone and made again to write them
+    in standard algebraic notation, and the FEN and SetUp tags are added if the game didn't start in the starting
+    position.
+    """
+    codes = [encode_move(move) for move in game_mode.moves]
+    game_mode.undo_move(len(codes))
+    game = PGNGame({"White": game_mode.white.name, "Black": game_mode.black.name, **(headers or {})})
+    fen = game_mode.to_fen()
+    if fen != STARTING_FEN:
+        game.headers.update({"SetUp": "1", "FEN": fen})
+
+    for code in codes:
+        move = game_mode.decode_move(code)
+        game.moves.append(move_to_san(game_mode, move))
+        game_mode.move(move)
+    game.result = game_result(game_mode)
+    return game
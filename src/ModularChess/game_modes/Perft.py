@@ -0,0 +1,86 @@
+from dataclasses import dataclass, field
+from typing import Dict, Tuple, TYPE_CHECKING, Iterable, List
+
+from ModularChess.movements.Promotion import Promotion
+from ModularChess.utils.Exceptions import InvalidMoveException
+
+if TYPE_CHECKING:
+    from ModularChess.game_modes.GameMode import GameMode
+    from ModularChess.movements.Movement import Movement
+
+
+@dataclass
+class PerftResult:
+    depth: int
+    nodes: int
+    time: float
+    # Nodes after each legal move of the root position, only when the perft is divided
+    divide: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def nodes_per_second(self) -> float:
+        return self.nodes / self.time if self.time > 0 else float("inf")
+
+    def __str__(self) -> str:
+        lines = [f"{name}: {nodes}" for name, nodes in sorted(self.divide.items())]
+        lines.append(f"Depth {self.depth}: {self.nodes} nodes in {self.time:.3f}s ({self.nodes_per_second:.0f} nodes/s)")
+        return "\n".join(lines)
+
+
+@dataclass(frozen=True)
+class PerftPosition:
+    name: str
+    # Moves played from the initial position, see `move_name`
+    moves: Tuple[str, ...]
+    # Reference number of nodes for each depth, starting at depth 1
+    nodes: Tuple[int, ...]
+
+
+# Reference counts verified with an independent move generator
+CLASSICAL_SUITE: Tuple[PerftPosition, ...] = (
+    PerftPosition("initial", (), (20, 400, 8902, 197281)),
+    PerftPosition("en passant", ("e2e4", "a7a6", "e4e5", "d7d5"), (31, 781, 24166, 630536)),
+    PerftPosition("black en passant", ("a2a3", "d7d5", "a3a4", "d5d4", "e2e4"), (30, 895, 26641, 808296)),
+    PerftPosition("castling", ("e2e4", "e7e5", "g1f3", "b8c6", "f1c4", "g8f6", "d2d3", "f8c5"),
+                  (38, 1329, 48378, 1672184)),
+    PerftPosition("promotion", ("h2h4", "g7g5", "h4g5", "f8g7", "g5g6", "e7e6", "g6h7", "b8c6"),
+                  (27, 836, 24036, 761249)),
+    PerftPosition("check", ("e2e4", "d7d5", "f1b5"), (5, 173, 3980, 135212)),
+    PerftPosition("pin", ("e2e4", "d7d5", "e4d5", "d8d5", "b1c3", "d5e5", "f1e2", "a7a6"), (21, 876, 21421, 850129)),
+    PerftPosition("evasion", ("e2e4", "e7e5", "d2d4", "f8b4", "c2c3", "d8h4", "g1f3", "h4f2"), (1, 30, 1259, 36735)),
+)
+
+# Reference counts of the 3D game mode `~game_modes.Cube.Cube`, which both board backends must agree on
+CUBE_SUITE: Tuple[PerftPosition, ...] = (
+    PerftPosition("cube", (), (43, 1776, 71785)),
+)
+
+
+def move_name(move: "Movement") -> str:
+    """
+    Coordinates notation of a move: initial position and destination of the moved piece, followed by the abbreviation
+    of the promoted piece. Castling moves use the position of the other castled piece as destination.
+    """
+    initial_position = next(data.initial_position for data in move.movements if data.piece is move.piece)
+    name = str(initial_position) + str(move.destination)
+    if isinstance(move, Promotion):
+        name += move.promoted_piece.abbreviation().lower()
+    return name
+
+
+def find_move(game_mode: "GameMode", name: str) -> "Movement":
+    """
+    Finds the legal move of the current player with the name.
+
+    :raises InvalidMoveException: if there isn't a legal move with the name
+    """
+    moves: List["Movement"] = game_mode.generate_moves()
+    for move in moves:
+        if move_name(move) == name:
+            return move
+    raise InvalidMoveException(f"Illegal move {name}")
+
+
+def play_moves(game_mode: "GameMode", names: Iterable[str]) -> None:
+    for name in names:
+        game_mode.move(find_move(game_mode, name))
@@ -0,0 +1,246 @@
+import importlib
+import struct
+from dataclasses import dataclass
+from typing import Tuple, Type, TYPE_CHECKING, List, Any, Dict
+from urllib.parse import quote, unquote
+
+from ModularChess.controller.Board import Board
+from ModularChess.controller.Player import Player
+from ModularChess.game_modes.GameMode import GameMode
+from ModularChess.utils.Exceptions import InvalidArgumentsError
+
+if TYPE_CHECKING:
+    from ModularChess.pieces.Piece import Piece
+
+BINARY_MAGIC = b"MCP\x01"
+# Piece type (index in the piece types of the record), player (index), square and number of moves
+PIECE_STRUCT = struct.Struct("<BBIH")
+
+
+def type_name(cls: type) -> str:
+    return f"{cls.__module__}.{cls.__qualname__}"
+
+
+def import_type(name: str) -> Any:
+    """Finds a class by its qualified name (see `type_name`), importing its module."""
+    module_name, _, qualname = name.rpartition(".")
+    while module_name:
+        try:
+            value: Any = importlib.import_module(module_name)
+        except ImportError:
+            module_name, _, parent = module_name.rpartition(".")
+            qualname = f"{parent}.{qualname}"
+            continue
+        try:
+            for attribute in qualname.split("."):
+                value = getattr(value, attribute)
+        except AttributeError:
+            break
+        return value
+    raise InvalidArgumentsError(f"Unknown type {name}")
+
+
+def import_subclass(name: str, base: type) -> Any:
+    """
+    Finds a subclass of `base` by its qualified name, see `import_type`. Records are read from files and other
+    processes, so any other object is rejected instead of being called when the game is built.
+
+    :raises InvalidArgumentsError: if the type can't be found or it isn't a subclass of `base`
+    """
+    value = import_type(name)
+    if not isinstance(value, type) or not issubclass(value, base):
+        raise InvalidArgumentsError(f"{name} is not a {base.__name__}")
+    return value
+
+
+@dataclass(frozen=True)
+class PositionRecord:
+    """
+    Position of any game mode, independent of its history: board shape, players and their alliances, player to move,
+    pieces with their number of moves, and the state of the game mode which isn't stored in the pieces (see
+    `GameMode.position_state`). Unlike FEN, it supports boards of any dimensions and any number of players. It can be
+    written as text or as compact bytes, and it's hashable and picklable, so it's used to send positions to other
+    processes without replaying the moves.
+
+    The game mode must be constructible from its players and its board type (i.e. `Classical(white, black, Board)`).
+    Pieces are identified by the name of their class among the piece types of the game mode.
+    """
+    game_type: Type["GameMode"]
+    board_type: Type["Board"]
+    shape: Tuple[int, ...]
+    # Name and color of each player, in the order of the game mode
+    players: Tuple[Tuple[str, Tuple[int, int, int]], ...]
+    # Indices of the players of each team
+    teams: Tuple[Tuple[int, ...], ...]
+    # Index of the player to move
+    turn: int
+    piece_types: Tuple[str, ...]
+    # Piece type (index in `piece_types`), player (index), square and number of moves of each piece
+    pieces: Tuple[Tuple[int, int, int, int], ...]
+    state: Tuple[int, ...] = ()
+
+    @classmethod
+    def from_game_mode(cls, game_mode: "GameMode") -> "PositionRecord":
+        players = game_mode.players
+        indices = {id(player): index for index, player in enumerate(players)}
+        teams: List[Tuple[int, ...]] = []
+        for player in players:
+            team = tuple(sorted(indices[id(ally)] for ally in player.allies))
+            if team not in teams:
+                teams.append(team)
+
+        piece_types = tuple(piece_type.__name__ for piece_type in game_mode.pieces)
+        type_indices = {piece_type: index for index, piece_type in enumerate(game_mode.pieces)}
+        board = game_mode.board
+        pieces = tuple(sorted((type_indices[type(piece)], indices[id(piece.player)], board.square_index(piece.position),
+                               piece.n_moves) for player_pieces in board.pieces.values()
+                              for type_pieces in player_pieces.values() for piece in type_pieces))
+        return cls(type(game_mode), type(board), tuple(board.shape),
+                   tuple((player.name, player.color) for player in players), tuple(teams),
+                   indices[id(game_mode.current_player_turn)], piece_types, pieces, game_mode.position_state())
+
+    def build(self) -> "GameMode":
+        """Creates a game mode, with new players, in the position."""
+        players = [Player(name, color) for name, color in self.players]
+        game_mode = self.game_type(*players, self.board_type)  # type: ignore
+        self.apply(game_mode)
+        return game_mode
+
+    def apply(self, game_mode: "GameMode") -> None:
+        """
+        Sets up the position in a game mode of the same type and players, replacing its pieces and its moves.
+
+        :raises InvalidArgumentsError: if the game mode doesn't match the record
+        """
+        board = game_mode.board
+        players = game_mode.players
+        if not isinstance(game_mode, self.game_type) or tuple(board.shape) != self.shape or \
+                len(players) != len(self.players):
+            raise InvalidArgumentsError("The game mode doesn't match the position")
+        piece_types: Dict[str, Type["Piece"]] = {piece_type.__name__: piece_type for piece_type in game_mode.pieces}
+        try:
+            types = [piece_types[name] for name in self.piece_types]
+        except KeyError as error:
+            raise InvalidArgumentsError(f"Unknown piece type {error}")
+
+        for team in self.teams:
+            Player.join_allies([players[index] for index in team], players)
+        game_mode.moves = []
+        game_mode.null_moves = []
+        board.clear()
+        positions = board.tables.positions
+        pieces: List["Piece"] = []
+        try:
+            for type_index, player_index, square, n_moves in self.pieces:
+                piece = types[type_index](board, players[player_index], positions[square])  # type: ignore
+                piece.n_moves = n_moves
+                pieces.append(piece)
+        except IndexError:
+            raise InvalidArgumentsError("Invalid piece")
+        board.add_pieces(pieces)
+
+        # The turn order is an iterator, so it's advanced until the player to move
+        for _ in range(len(players)):
+            if game_mode.current_player_turn is players[self.turn]:
+                break
+            game_mode.current_player_turn = next(game_mode.order)
+        else:
+            raise InvalidArgumentsError("Invalid player to move")
+        game_mode.set_position_state(self.state)
+
+    def to_text(self) -> str:
+        """
+        Space separated fields: game mode and board types, shape (i.e. ``8x8``), players (name and color), teams, player
+        to move, piece types, pieces (type, player, square and number of moves if it's not 0) and state. For example,
+        the starting position of `Classical` begins with ``ModularChess.game_modes.Classical.Classical
+        ModularChess.controller.Board.Board 8x8 White:255.255.255/Black:0.0.0 0/1 0``.
+        """
+        players = "/".join(f"{quote(name, safe='')}:{'.'.join(map(str, color))}" for name, color in self.players)
+        teams = "/".join(".".join(map(str, team)) for team in self.teams)
+        pieces = ",".join(".".join(map(str, piece if piece[3] else piece[:3])) for piece in self.pieces)
+        return " ".join((type_name(self.game_type), type_name(self.board_type), "x".join(map(str, self.shape)),
+                         players, teams, str(self.turn), "/".join(self.piece_types) or "-", pieces or "-",
+                         ",".join(map(str, self.state)) or "-"))
+
+    @classmethod
+    def from_text(cls, text: str) -> "PositionRecord":
+        """:raises InvalidArgumentsError: if the text is malformed or its types can't be found"""
+        fields = text.split()
+        if len(fields) != 9:
+            raise InvalidArgumentsError("Invalid position record")
+        game_type, board_type, shape, players, teams, turn, piece_types, pieces, state = fields
+        try:
+            return cls(import_subclass(game_type, GameMode), import_subclass(board_type, Board), tuple(map(int, shape.split("x"))),
+                       tuple((unquote(name), tuple(map(int, color.split("."))))  # type: ignore
+                             for name, color in (player.split(":") for player in players.split("/"))),
+                       tuple(tuple(map(int, team.split("."))) for team in teams.split("/")), int(turn),
+                       tuple(piece_types.split("/")) if piece_types != "-" else (),
+                       tuple((*map(int, piece.split(".")), 0)[:4] for piece in pieces.split(","))  # type: ignore
+                       if pieces != "-" else (),
+                       tuple(map(int, state.split(","))) if state != "-" else ())
+        except ValueError:
+            raise InvalidArgumentsError("Invalid position record")
+
+    def to_bytes(self) -> bytes:
+        """Binary form of the record, each piece in 8 bytes."""
+        chunks = [BINARY_MAGIC]
+
+        def add_string(string: str) -> None:
+            encoded = string.encode()
+            chunks.append(struct.pack("<H", len(encoded)))
+            chunks.append(encoded)
+
+        add_string(type_name(self.game_type))
+        add_string(type_name(self.board_type))
+        chunks.append(struct.pack(f"<B{len(self.shape)}I", len(self.shape), *self.shape))
+        chunks.append(struct.pack("<B", len(self.players)))
+        for name, color in self.players:
+            add_string(name)
+            chunks.append(struct.pack("<3i", *color))
+        chunks.append(struct.pack("<B", len(self.teams)))
+        for team in self.teams:
+            chunks.append(struct.pack(f"<B{len(team)}B", len(team), *team))
+        chunks.append(struct.pack("<BB", self.turn, len(self.piece_types)))
+        for piece_type in self.piece_types:
+            add_string(piece_type)
+        chunks.append(struct.pack("<I", len(self.pieces)))
+        chunks.extend(PIECE_STRUCT.pack(*piece) for piece in self.pieces)
+        chunks.append(struct.pack(f"<B{len(self.state)}q", len(self.state), *self.state))
+        return b"".join(chunks)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "PositionRecord":
+        """:raises InvalidArgumentsError: if the data is malformed or its types can't be found"""
+        if not data.startswith(BINARY_MAGIC):
+            raise InvalidArgumentsError("Invalid position record")
+        offset = len(BINARY_MAGIC)
+
+        def unpack(fmt: str) -> Tuple[Any, ...]:
+            nonlocal offset
+            values = struct.unpack_from(fmt, data, offset)
+            offset += struct.calcsize(fmt)
+            return values
+
+        def read_string() -> str:
+            nonlocal offset
+            length, = unpack("<H")
+            offset += length
+            return data[offset - length:offset].decode()
+
+        try:
+            game_type, board_type = import_subclass(read_string(), GameMode), import_subclass(read_string(), Board)
+            n_dimensions, = unpack("<B")
+            shape = unpack(f"<{n_dimensions}I")
+            players = tuple((read_string(), unpack("<3i")) for _ in range(unpack("<B")[0]))
+            teams = tuple(unpack(f"<{unpack('<B')[0]}B") for _ in range(unpack("<B")[0]))
+            turn, n_types = unpack("<BB")
+            piece_types = tuple(read_string() for _ in range(n_types))
+            n_pieces, = unpack("<I")
+            pieces = tuple(PIECE_STRUCT.iter_unpack(data[offset:offset + n_pieces * PIECE_STRUCT.size]))
+            if len(pieces) != n_pieces:
+                raise InvalidArgumentsError("Invalid position record")
+            offset += n_pieces * PIECE_STRUCT.size
+            state = unpack(f"<{unpack('<B')[0]}q")
+        except (struct.error, UnicodeDecodeError):
+            raise InvalidArgumentsError("Invalid position record")
+        return cls(game_type, board_type, shape, players, teams, turn, piece_types, pieces, state)  # type: ignore
@@ -0,0 +1,118 @@
+"""
+Standard algebraic notation (SAN) of the moves of 2D game modes, like ``Nbd7``, ``exd5``, ``e8=Q+`` or ``O-O-O#``.
+Moves are found among the encoded legal moves of the position and ambiguities are resolved with the attack maps of the
+board, so only the `Movement` of the move itself is built.
+"""
+import re
+from typing import TYPE_CHECKING, List, Set
+
+from ModularChess.movements.Castling import Castling
+from ModularChess.movements.MoveEncoding import CASTLING, PROMOTION, destination_square, move_flags, origin_square, \
+    promotion_index
+from ModularChess.movements.Promotion import Promotion
+from ModularChess.pieces.Pawn import Pawn
+from ModularChess.utils.Exceptions import InvalidMoveException
+
+if TYPE_CHECKING:
+    from ModularChess.game_modes.GameMode import GameMode
+    from ModularChess.movements.Movement import Movement
+
+SAN_PATTERN = re.compile(r"([KQRBN])?([a-h])?([1-8])?x?([a-h])([1-8])(?:=?([QRBN]))?")
+CASTLING_PATTERN = re.compile(r"([O0])-\1(-\1)?")
+# Check, checkmate and annotations (i.e. "!?"), ignored when a move is read
+SUFFIX_CHARACTERS = "+#!?"
+
+
+def move_to_san(game_mode: "GameMode", move: "Movement", suffix: bool = True) -> str:
+    """
+    Standard algebraic notation of a legal move of the current player, made and undone to find if it gives check.
+
+    :param game_mode: Game in the position before the move
+    :param move: Legal move
+    :param suffix: Adds "+" to checks and "#" to checkmates
+    :return: Notation of the move
+    """
+    if isinstance(move, Castling):
+        san = "O-O-O" if str(move).startswith("O-O-O") else "O-O"
+    else:
+        piece = move.piece
+        if isinstance(piece, Pawn):
+            san = str(piece.position)[0] + "x" if move.piece_is_captured() else ""
+        else:
+            board = piece.board
+            destination = board.square_index(move.destination)
+            legal_origins: Set[int] = {origin_square(code) for code in game_mode.generate_encoded_moves()
+                                       if destination_square(code) == destination}
+            san = piece.abbreviation() + move.disambiguation(
+                lambda rival: board.square_index(rival.position) in legal_origins)
+            if move.piece_is_captured():
+                san += "x"
+        san += str(move.destination)
+        if isinstance(move, Promotion):
+            san += "=" + move.promoted_piece.abbreviation()
+
+    if suffix:
+        game_mode.force_move(move)
+        game_mode.current_player_turn = next(game_mode.order)
+        try:
+            if game_mode.is_in_check():
+                move.is_check = True
+                san += "+" if game_mode.generate_encoded_moves() else "#"
+        finally:
+            game_mode.undo_move(1)
+    return san
+
+
+def san_to_move(game_mode: "GameMode", san: str) -> "Movement":
+    """
+    Finds the legal move of the current player with the standard algebraic notation. Check marks and annotations are
+    ignored, and the piece of the promotions can be written without "=".
+
+    :raises InvalidMoveException: if there isn't a legal move with the notation, or there are several ones
+    """
+    notation = san.rstrip(SUFFIX_CHARACTERS)
+    codes: List[int] = game_mode.generate_encoded_moves()
+    board = game_mode.board
+    tables = board.tables
+
+    castling = CASTLING_PATTERN.fullmatch(notation)
+    if castling is not None:
+        long = castling.group(2) is not None
+        moves = [move for move in (game_mode.decode_move(code) for code in codes if move_flags(code) & CASTLING)
+                 if str(move).startswith("O-O-O") == long]
+    else:
+        match = SAN_PATTERN.fullmatch(notation)
+        if match is None:
+            raise InvalidMoveException(f"Invalid move notation {san}")
+        piece_letter, file, rank, destination_file, destination_rank, promotion = match.groups()
+        try:
+            destination = tables.square_index((int(destination_rank) - 1, ord(destination_file) - ord("a")))
+        except (IndexError, ValueError):
+            raise InvalidMoveException(f"Invalid move notation {san}")
+
+        matches = []
+        for code in codes:
+            if destination_square(code) != destination or move_flags(code) & CASTLING:
+                continue
+            piece = board.squares[origin_square(code)]
+            row, column = tables.coordinates[origin_square(code)][:2]
+            is_pawn = isinstance(piece, Pawn)
+            if (is_pawn if piece_letter is not None else not is_pawn) or \
+                    (piece_letter is not None and piece.abbreviation() != piece_letter) or \
+                    (file is not None and column != ord(file) - ord("a")) or \
+                    (rank is not None and row != int(rank) - 1):
+                continue
+            if move_flags(code) & PROMOTION:
+                if promotion is None or \
+                        piece.valid_pieces_type[promotion_index(code)].abbreviation() != promotion:  # type: ignore
+                    continue
+            elif promotion is not None:
+                continue
+            matches.append(code)
+        moves = [game_mode.decode_move(code) for code in matches]
+
+    if not moves:
+        raise InvalidMoveException(f"Illegal move {san}")
+    if len(moves) > 1:
+        raise InvalidMoveException(f"Ambiguous move {san}")
+    return moves[0]
@@ -1,8 +1,6 @@
 import datetime
 import random
 
-from guppy import hpy
-
 from ModularChess.artificial_intelligence.BasicAI import BasicAI
 from ModularChess.artificial_intelligence.BasicEvaluator import BasicEvaluator
 from ModularChess.artificial_intelligence.RandomAI import RandomAI
@@ -22,8 +20,6 @@ def main():
 
 
 def main_play():
-    h = hpy()
-    h.setrelheap()
     white, black = Player("White"), Player("Black")
     random.seed(0)
     wins = {white: 0.0, black: 0.0, "draw": 0}
@@ -57,19 +53,17 @@ def main_play():
         print("AVERAGE TIME PER GAME: " + str(avg_time_game))
         print("AVERAGE TIME PER MOVE: " + str(avg_time_move) + "\n")
 
-    # print(h.heap())
-    # print(h.heap().byid[0].sp)
-    # print(h.iso(1, [], {}))
-
 
 def main3():
     white, black = Player("White"), Player("Black")
     classical = Classical(white, black)
     classical.generate_board()
     print(classical.to_fen())
-    ai = BasicAI(2, white, BasicEvaluator(classical))
-    print(ai.score())
-    print(ai.get_next_move())
+    ai = BasicAI(2, white, BasicEvaluator(classical), profile=True)
+    move, statistics = ai.search()
+    print(move)
+    print(statistics)
+    print(f"NPS: {statistics.nps:.0f}, first move cutoffs: {statistics.first_move_cutoff_rate:.0%}")
 
 
 if __name__ == '__main__':
@@ -65,6 +65,15 @@ class Castling(Movement):
                              castlable_piece2.find_castling_destination(castlable_piece1))]
         super().__init__(move, castlable_piece1, castlable_piece2.position, is_valid_move=is_valid_move)
 
+    def __str__(self) -> str:
+        if self.piece.board.dimensions == 2:
+            # The long castling is the one with the farthest piece (the rook of the queen side in classical chess)
+            king, other = self[0], self[1]
+            assert king.initial_position is not None and other.initial_position is not None
+            long = abs(int(other.initial_position[1]) - int(king.initial_position[1])) > 3
+            return ("O-O-O" if long else "O-O") + ("+" if self.is_check else "")
+        return super().__str__()
+
     def _check_valid_move(self) -> bool:
         piece1, dest1 = cast(CastlablePiece, self[0].piece), cast("Position", self[0].destination_position)
         piece2, dest2 = cast(CastlablePiece, self[1].piece), cast("Position", self[1].destination_position)
@@ -17,14 +17,8 @@ class EnPassant(Movement):
 
     def __str__(self) -> str:
         if self.piece.board.dimensions == 2:
-            move = self.piece.abbreviation()
-            same_pieces = self.piece.board.pieces[self.player][type(self.piece)]
-            if self.movements[-1].destination_position is not None and \
-                    len([piece for piece in same_pieces if
-                         piece.check_piece_valid_move(self.movements[-1].destination_position)]) \
-                    > 1:
-                move += str(self.movements[-1].initial_position)
-            if len(self) == 2:  # Capture
+            move = self.piece.abbreviation() + self.disambiguation()
+            if self.piece_is_captured():
                 move += "x"
-            return move + str(self.movements[-1].destination_position) + ("+" if self.is_check else "")
+            return move + str(self.destination) + ("+" if self.is_check else "")
         return super().__str__()
@@ -0,0 +1,122 @@
+"""
+Compact representation of moves as integers, so move generation and search don't need to allocate a `Movement` for
+every move. The bits of an encoded move are:
+
+- 0-15: square index (see `~utils.MoveTables.MoveTables`) of the moved piece
+- 16-31: square index of the destination. Castling moves use the square of the other castled piece
+- 32-35: flags (`CAPTURE`, `EN_PASSANT`, `CASTLING`, `PROMOTION`)
+- 36-: index of the promoted piece type in the valid pieces of the promotable piece
+
+The `Movement` of an encoded move is only built when it's needed, with `decode_move`.
+"""
+from typing import TYPE_CHECKING, Iterable, List, cast
+
+if TYPE_CHECKING:
+    from ModularChess.game_modes.GameMode import GameMode
+    from ModularChess.movements.Movement import Movement
+    from ModularChess.pieces.Piece import Piece
+
+SQUARE_BITS = 16
+SQUARE_MASK = (1 << SQUARE_BITS) - 1
+DESTINATION_SHIFT = SQUARE_BITS
+FLAGS_SHIFT = 2 * SQUARE_BITS
+PROMOTION_SHIFT = FLAGS_SHIFT + 4
+
+CAPTURE = 1 << FLAGS_SHIFT
+EN_PASSANT = 2 << FLAGS_SHIFT
+CASTLING = 4 << FLAGS_SHIFT
+PROMOTION = 8 << FLAGS_SHIFT
+FLAGS_MASK = 15 << FLAGS_SHIFT
+
+
+def pack_move(origin: int, destination: int, flags: int = 0, promotion: int = 0) -> int:
+    """
+    Encodes a move.
+
+    :param origin: Square of the moved piece
+    :param destination: Square of the destination
+    :param flags: Combination of the flags of the move
+    :param promotion: Index of the promoted piece type
+    :return: Encoded move
+    """
+    return origin | destination << DESTINATION_SHIFT | flags | promotion << PROMOTION_SHIFT
+
+
+def origin_square(code: int) -> int:
+    return code & SQUARE_MASK
+
+
+def destination_square(code: int) -> int:
+    return (code >> DESTINATION_SHIFT) & SQUARE_MASK
+
+
+def move_flags(code: int) -> int:
+    return code & FLAGS_MASK
+
+
+def promotion_index(code: int) -> int:
+    return code >> PROMOTION_SHIFT
+
+
+def encode_destinations(piece: "Piece", origin: int, destinations: Iterable[int]) -> List[int]:
+    """Encodes the basic moves of the piece to the destinations, flagging the captures."""
+    squares = piece.board.squares
+    return [origin | destination << DESTINATION_SHIFT | (CAPTURE if squares[destination] is not None else 0)
+            for destination in destinations]
+
+
+def encode_move(move: "Movement") -> int:
+    """Encodes a move generated by the pieces or the game modes."""
+    from ModularChess.movements.Castling import Castling
+    from ModularChess.movements.EnPassant import EnPassant
+    from ModularChess.movements.Promotion import Promotion
+
+    tables = move.piece.board.tables
+    initial_position = next(data.initial_position for data in move.movements if data.piece is move.piece)
+    assert initial_position is not None
+    origin, destination = tables.square_index(initial_position), tables.square_index(move.destination)
+
+    flags = CAPTURE if move.captured_pieces() else 0
+    promotion = 0
+    if isinstance(move, Castling):
+        flags |= CASTLING
+    elif isinstance(move, EnPassant):
+        flags |= EN_PASSANT
+    elif isinstance(move, Promotion):
+        flags |= PROMOTION
+        promotion = move.promotable_piece.valid_pieces_type.index(type(move.promoted_piece))
+    return pack_move(origin, destination, flags, promotion)
+
+
+def decode_move(game_mode: "GameMode", code: int) -> "Movement":
+    """
+    Builds the movement of an encoded move in the current position of the game.
+
+    :param game_mode: Game where the move was generated
+    :param code: Encoded move
+    :return: Movement, already validated
+    """
+    from ModularChess.movements.BasicMovement import BasicMovement
+    from ModularChess.movements.Castling import Castling, CastlablePiece
+    from ModularChess.movements.EnPassant import EnPassant
+    from ModularChess.movements.Promotion import Promotion, PromotablePiece
+
+    board = game_mode.board
+    piece = board.squares[code & SQUARE_MASK]
+    destination = (code >> DESTINATION_SHIFT) & SQUARE_MASK
+    flags = code & FLAGS_MASK
+    assert piece is not None
+
+    if flags & CASTLING:
+        return Castling(cast(CastlablePiece, piece), cast(CastlablePiece, board.squares[destination]),
+                        is_valid_move=True)
+    if flags & EN_PASSANT:
+        # The captured pawn is beside the capturing pawn, in the row of its origin and the column of the destination
+        tables = board.tables
+        captured = tables.square_index((tables.coordinates[code & SQUARE_MASK][0], *tables.coordinates[destination][1:]))
+        return EnPassant(piece, tables.positions[destination], board.squares[captured], is_valid_move=True)
+    if flags & PROMOTION:
+        promotable_piece = cast(PromotablePiece, piece)
+        return Promotion(promotable_piece, board.tables.positions[destination],
+                         promotable_piece.valid_pieces_type[code >> PROMOTION_SHIFT], is_valid_move=True)
+    return BasicMovement(piece, board.tables.positions[destination], is_valid_move=True)
@@ -1,7 +1,7 @@
 import abc
 from dataclasses import dataclass
 from enum import Enum
-from typing import Optional, List, Any, no_type_check, TYPE_CHECKING, cast
+from typing import Optional, List, Any, no_type_check, TYPE_CHECKING, cast, Callable
 
 import numpy as np
 
@@ -54,6 +54,8 @@ class MovementData:
 
 
 class Movement(metaclass=abc.ABCMeta):
+    # Number of moves added to the pieces updated by the movement
+    n_moves_increment = 1
 
     @abc.abstractmethod
     def __init__(self, movements: List[MovementData], piece: Optional["Piece"] = None,
@@ -96,6 +98,7 @@ class Movement(metaclass=abc.ABCMeta):
         return hash(self.movements)
 
     def move(self) -> None:
+        # The board updates its Zobrist key for every addition, removal and update of a piece
         for move in self.movements:
             move_type = move.type
             if move_type == MovementType.ADDITION:
@@ -107,7 +110,7 @@ class Movement(metaclass=abc.ABCMeta):
                 move.piece.board.remove_piece(move.piece)
             else:
                 assert move.destination_position is not None
-                move.piece.board.move_piece(move.piece, move.destination_position)
+                move.piece.board.move_piece(move.piece, move.destination_position, self.n_moves_increment)
 
         # TODO: SAVE FEM, allowing reconstruction of board
         self.is_check = False  # self._will_be_check()
@@ -120,6 +123,31 @@ class Movement(metaclass=abc.ABCMeta):
             self._is_valid_move = self._check_valid_move()
         return self._is_valid_move
 
+    def disambiguation(self, is_rival: Optional[Callable[["Piece"], bool]] = None) -> str:
+        """
+        Coordinates of the origin of the piece (its file, its rank or both) needed to tell the move apart from the moves
+        of other pieces of the same type to the same destination, as in the standard algebraic notation. The other
+        pieces are found in the attack maps of the board, so moves which aren't attacks (i.e. pawn advances) are never
+        ambiguous. Only for 2D boards and before the move is made.
+
+        :param is_rival: Filters the other pieces (i.e. the ones which can legally move to the destination)
+        """
+        board = self.piece.board
+        destination = board.square_index(self.destination)
+        if destination not in board.piece_attacks.get(id(self.piece), ()):
+            return ""
+        rivals = [piece for piece in board.square_attackers[destination].values() if piece is not self.piece and
+                  type(piece) is type(self.piece) and piece.player == self.player and
+                  (is_rival is None or is_rival(piece))]
+        if not rivals:
+            return ""
+        origin = self.piece.position
+        if all(rival.position[1] != origin[1] for rival in rivals):
+            return str(origin)[0]
+        if all(rival.position[0] != origin[0] for rival in rivals):
+            return str(origin)[1:]
+        return str(origin)
+
     def piece_is_captured(self) -> bool:
         return any(self.player.can_capture(move.piece.player) for move in self.movements)
 
@@ -138,12 +166,9 @@ class Movement(metaclass=abc.ABCMeta):
 
 
 class InverseMovement(Movement):
+    # Reduces number of moves (if piece has moved)
+    n_moves_increment = -1
+
     def __init__(self, move: Movement):
         super().__init__([MovementData(move.piece, move.destination_position, move.initial_position)
                           for move in reversed(move.movements)], piece=move.piece)
-
-    def move(self) -> None:
-        super().move()
-        for piece, initial_position, destination_position in self.movements:
-            if initial_position is not None and destination_position is not None:
-                piece.n_moves -= 2  # Reduces number of moves (if piece has moved)
@@ -0,0 +1,64 @@
+import argparse
+import sys
+from typing import List, Optional, Type, Union
+
+from ModularChess.controller.BitBoard import BitBoard
+from ModularChess.controller.Board import Board
+from ModularChess.controller.Player import Player
+from ModularChess.game_modes.Classical import Classical
+from ModularChess.game_modes.Cube import Cube
+from ModularChess.game_modes.Perft import CLASSICAL_SUITE, CUBE_SUITE, play_moves
+
+# Game mode of the positions of each suite
+SUITES = ((Classical, CLASSICAL_SUITE), (Cube, CUBE_SUITE))
+
+
+def create_game_mode(board_type: Type[Board], moves: List[str],
+                     game_type: Type[Union[Classical, Cube]] = Classical) -> Union[Classical, Cube]:
+    game_mode = game_type(Player("White"), Player("Black"), board_type)
+    game_mode.generate_board()
+    play_moves(game_mode, moves)
+    return game_mode
+
+
+def run_suite(depth: int, board_type: Type[Board]) -> bool:
+    """
+    Runs the perft of every position of the suites (`Classical` and `Cube`) up to the depth, comparing it with the
+    reference counts.
+    """
+    passed = True
+    for game_type, suite in SUITES:
+        for position in suite:
+            game_mode = create_game_mode(board_type, list(position.moves), game_type)
+            for current_depth, expected_nodes in enumerate(position.nodes[:depth], start=1):
+                result = game_mode.perft(current_depth)
+                status = "OK" if result.nodes == expected_nodes else f"FAILED (expected {expected_nodes})"
+                passed &= result.nodes == expected_nodes
+                print(f"{position.name:<20} depth {current_depth}: {result.nodes:>10} nodes "
+                      f"{result.nodes_per_second:>10.0f} nodes/s {status}")
+    return passed
+
+
+def main(args: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Counts the nodes of the tree of legal moves of a Classical game.")
+    parser.add_argument("depth", type=int, help="number of plies to explore")
+    parser.add_argument("--divide", action="store_true", help="show the nodes after each legal move")
+    parser.add_argument("--moves", nargs="*", default=[],
+                        help="moves played from the initial position in coordinates notation (e2e4)")
+    parser.add_argument("--bitboard", action="store_true", help="use the BitBoard backend")
+    parser.add_argument("--suite", action="store_true",
+                        help="run the benchmark suite (Classical and 3D positions) up to the depth, comparing it with "
+                             "the reference counts")
+    arguments = parser.parse_args(args)
+    board_type = BitBoard if arguments.bitboard else Board
+
+    if arguments.suite:
+        return 0 if run_suite(arguments.depth, board_type) else 1
+
+    game_mode = create_game_mode(board_type, arguments.moves)
+    print(game_mode.perft(arguments.depth, arguments.divide))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
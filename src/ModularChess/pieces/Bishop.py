@@ -1,16 +1,15 @@
-import itertools
 import os
 from typing import List, TYPE_CHECKING, TextIO, cast
 
 import numpy as np
-import numpy.typing as npt
 
 from ModularChess.movements.BasicMovement import BasicMovement
+from ModularChess.movements.MoveEncoding import encode_destinations
 from ModularChess.pieces.Piece import Piece
-from ModularChess.utils.Position import Position
 
 if TYPE_CHECKING:
     from ModularChess.movements.Movement import Movement
+    from ModularChess.utils.Position import Position
 
 
 class Bishop(Piece):
@@ -24,32 +23,20 @@ class Bishop(Piece):
     def get_piece_valid_moves(self) -> List["Movement"]:
         return Bishop.get_bishop_valid_moves(self)
 
-    @classmethod
-    def get_bishop_valid_moves(cls, piece: "Piece") -> List["Movement"]:
-        moves: List["Movement"] = []
-
-        for a, b in itertools.permutations(np.identity(piece.board.dimensions, dtype=int), 2):
-
-            # Transforms binary inputs to integer and checks a > b. Avoiding already seen permutations
-            if a.dot(2 ** np.arange(a.size)[::-1]) > b.dot(2 ** np.arange(b.size)[::-1]):
-                vector: npt.NDArray[np.int_] = a + b
-
-                for direction in ((1, 1), (1, -1), (-1, 1), (-1, -1)):
-                    # Changes vector to the possible 4 directions in 2D
-                    index = np.where(vector)
-                    vector[index] = direction
+    def get_encoded_moves(self) -> List[int]:
+        tables = self.board.tables
+        square = tables.square_index(self.position)
+        return encode_destinations(self, square, self.get_ray_destinations(tables.bishop_rays[square]))
 
-                    direction_array: npt.NDArray[np.int_] = np.array([piece.board.size - 1 if el > 0 else 0 for el in
-                                                                      direction])
-                    magnitude: npt.NDArray[np.int_] = np.min(np.abs(direction_array - piece.position[index]))
+    def get_attacked_squares(self) -> List[int]:
+        tables = self.board.tables
+        return self.get_ray_attacks(tables.bishop_rays[tables.square_index(self.position)])
 
-                    end_position: Position = Position(piece.position + magnitude * vector)
-
-                    min_iterable = piece.position.create_lineal_path(end_position)
-                    moves += [BasicMovement(piece, pos, is_valid_move=True) for pos in
-                              piece.__can_move_to__(min_iterable)]
-
-        return moves
+    @classmethod
+    def get_bishop_valid_moves(cls, piece: "Piece") -> List["Movement"]:
+        tables = piece.board.tables
+        destinations = piece.get_ray_destinations(tables.bishop_rays[tables.square_index(piece.position)])
+        return [BasicMovement(piece, tables.positions[square], is_valid_move=True) for square in destinations]
 
     # noinspection PyTypeChecker
     @classmethod
@@ -64,7 +51,7 @@ class Bishop(Piece):
             return []
 
         # Checks pieces in the path
-        if any([piece.board[pos] for pos in piece.position.create_lineal_path(new_position)][:-1]):
+        if not piece.board.is_path_clear(piece.position, new_position):
             return []
 
         # Checks if destination is not empty or there is an enemy piece
@@ -2,15 +2,15 @@ import os
 from typing import List, TYPE_CHECKING, TextIO
 
 import numpy as np
-import numpy.typing as npt
 
 import ModularChess.pieces.Rook as Rook
 from ModularChess.movements.BasicMovement import BasicMovement
 from ModularChess.movements.Castling import CastlablePiece, Castling
+from ModularChess.movements.MoveEncoding import encode_destinations, pack_move, CASTLING
 from ModularChess.utils.Exceptions import InvalidMoveException, InvalidPathException
-from ModularChess.utils.Position import Position
 
 if TYPE_CHECKING:
+    from ModularChess.utils.Position import Position
     from ModularChess.movements.Movement import Movement
     from ModularChess.controller.Player import Player
     from ModularChess.controller.Board import Board
@@ -38,15 +38,15 @@ class King(CastlablePiece):
 
         # Checks pieces in the path
         try:
-            if any([self.board[pos] for pos in self.position.create_lineal_path(other_piece.position)][:-1]):
+            if not self.board.is_path_clear(self.position, other_piece.position):
                 return False
         except InvalidPathException:
             return False
 
-        # Checks during the path of the king
+        # The king can't castle out of, through or into check
         return not any(
-            self.board.can_enemy_piece_capture_position(pos, self.player)
-            for pos in self.position.create_lineal_path(destination)
+            self.board.is_square_attacked(self.board.square_index(pos), self.player)
+            for pos in [self.position, *self.position.create_lineal_path(destination)]
         )
 
     def check_piece_valid_move(self, new_position: "Position") -> List["Movement"]:
@@ -72,21 +72,10 @@ class King(CastlablePiece):
         return [BasicMovement(self, new_position, is_valid_move=True)]
 
     def get_piece_valid_moves(self) -> List["Movement"]:
-        moves: List["Movement"] = []
-
-        for i in range(1, 2 ** len(self.position)):
-            binary = [int(x) for x in bin(i)[2:]]
-            vector: npt.NDArray[np.int_] = np.array([0] * (len(self.position) - len(binary)) + binary)
-
-            n_1s: npt.NDArray[np.bool_] = vector == 1
-            for j in range(2 ** np.sum(n_1s)):
-                binary = [int(x) for x in bin(j)[2:]]
-                direction: npt.NDArray[np.int_] = np.array([0] * (sum(n_1s) - len(binary)) + binary)
-
-                vector[n_1s] = np.where(direction == 1, -1, 1)
-                position: Position = Position(vector) + self.position
-                if self.board.is_position_inside(position) and self.board.can_capture_or_move(self, position):
-                    moves.append(BasicMovement(self, position, is_valid_move=True))
+        tables = self.board.tables
+        destinations = self.get_jump_destinations(tables.king_jumps[tables.square_index(self.position)])
+        moves: List["Movement"] = [BasicMovement(self, tables.positions[square], is_valid_move=True)
+                                   for square in destinations]
 
         # Finds possible castling positions
         if self.n_moves == 0:
@@ -96,6 +85,23 @@ class King(CastlablePiece):
                     moves.append(move)
         return moves
 
+    def get_encoded_moves(self) -> List[int]:
+        tables = self.board.tables
+        square = tables.square_index(self.position)
+        moves = encode_destinations(self, square, self.get_jump_destinations(tables.king_jumps[square]))
+
+        # Castling moves are only built when the king hasn't moved
+        if self.n_moves == 0:
+            for piece in self.get_possible_castlable_pieces():
+                move = Castling(self, piece)
+                if move.check_valid_move():
+                    moves.append(pack_move(square, tables.square_index(piece.position), CASTLING))
+        return moves
+
+    def get_attacked_squares(self) -> List[int]:
+        tables = self.board.tables
+        return list(tables.king_jumps[tables.square_index(self.position)])
+
     @staticmethod
     def piece_unicode() -> str:
         return "♔"
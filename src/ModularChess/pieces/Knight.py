@@ -1,15 +1,15 @@
-import itertools
 import os
 from typing import List, TYPE_CHECKING, TextIO
 
 import numpy as np
 
 from ModularChess.movements.BasicMovement import BasicMovement
+from ModularChess.movements.MoveEncoding import encode_destinations
 from ModularChess.pieces.Piece import Piece
-from ModularChess.utils.Position import Position
 
 if TYPE_CHECKING:
     from ModularChess.movements.Movement import Movement
+    from ModularChess.utils.Position import Position
 
 
 class Knight(Piece):
@@ -25,19 +25,18 @@ class Knight(Piece):
         return [BasicMovement(self, new_position, is_valid_move=True)]
 
     def get_piece_valid_moves(self) -> List["Movement"]:
-        moves: List["Movement"] = []
-
-        for a, b in itertools.permutations(np.identity(self.board.dimensions, dtype=int), 2):
-
-            # Transforms binary inputs to integer and checks a > b. Avoiding already seen permutations
-            if a.dot(2 ** np.arange(a.size)[::-1]) > b.dot(2 ** np.arange(b.size)[::-1]):
-                for i in [-2, 2]:
-                    for j in [-1, 1]:
-                        for move in (Position(i * a + j * b), Position(j * a + i * b)):
-                            move += self.position
-                            if self.board.is_position_inside(move) and self.board.can_capture_or_move(self, move):
-                                moves.append(BasicMovement(self, move, is_valid_move=True))
-        return moves
+        tables = self.board.tables
+        destinations = self.get_jump_destinations(tables.knight_jumps[tables.square_index(self.position)])
+        return [BasicMovement(self, tables.positions[square], is_valid_move=True) for square in destinations]
+
+    def get_encoded_moves(self) -> List[int]:
+        tables = self.board.tables
+        square = tables.square_index(self.position)
+        return encode_destinations(self, square, self.get_jump_destinations(tables.knight_jumps[square]))
+
+    def get_attacked_squares(self) -> List[int]:
+        tables = self.board.tables
+        return list(tables.knight_jumps[tables.square_index(self.position)])
 
     @staticmethod
     def piece_unicode() -> str:
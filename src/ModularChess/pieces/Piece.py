@@ -1,10 +1,11 @@
 import abc
 import os
-from typing import TYPE_CHECKING, List, Iterable, TextIO
+from typing import TYPE_CHECKING, List, Iterable, TextIO, Sequence
 
 import numpy as np
 
 from ModularChess.movements.BasicMovement import BasicMovement
+from ModularChess.movements.MoveEncoding import encode_move
 
 if TYPE_CHECKING:
     from ModularChess.movements.Movement import Movement
@@ -49,6 +50,25 @@ class Piece(metaclass=abc.ABCMeta):
     def get_piece_valid_moves(self) -> List["Movement"]:
         pass
 
+    def get_encoded_moves(self) -> List[int]:
+        """
+        Moves of the piece encoded as integers, see `~movements.MoveEncoding`. By default, it encodes the moves of
+        `get_piece_valid_moves`, pieces can override it to avoid building the movements.
+
+        :return: Encoded moves
+        """
+        return [encode_move(move) for move in self.get_piece_valid_moves()]
+
+    def get_attacked_squares(self) -> List[int]:
+        """
+        Squares the piece attacks (where it could capture a piece), including the squares of pieces of the same player.
+        Used by the board to maintain its attack maps, so it can't depend on the game state. By default, the piece
+        doesn't attack any square.
+
+        :return: Square indices of the attacked squares
+        """
+        return []
+
     def __can_move_to__(self, positions: Iterable["Position"]) -> Iterable["Position"]:
         """
         Auxiliary method to filter positions generated by `~utils.Position.Position.create_lineal_path`, so path doesn't
@@ -71,6 +91,35 @@ class Piece(metaclass=abc.ABCMeta):
             else:
                 return
 
+    def get_ray_destinations(self, rays: Iterable[Sequence[int]]) -> List[int]:
+        """
+        Auxiliary method to walk the rays precomputed in `~utils.MoveTables.MoveTables`, see `Board.ray_destinations`.
+
+        :param rays: Square indices of each ray, ordered from the nearest square
+        :return: Square indices where the piece can move
+        """
+        return self.board.ray_destinations(self.player, rays)
+
+    def get_ray_attacks(self, rays: Iterable[Sequence[int]]) -> List[int]:
+        """
+        Auxiliary method to walk the rays precomputed in `~utils.MoveTables.MoveTables`, including the first piece found
+        in each ray, see `Board.ray_attacks`.
+
+        :param rays: Square indices of each ray, ordered from the nearest square
+        :return: Square indices attacked by the piece
+        """
+        return self.board.ray_attacks(rays)
+
+    def get_jump_destinations(self, jumps: Iterable[int]) -> List[int]:
+        """
+        Auxiliary method to filter the jumps precomputed in `~utils.MoveTables.MoveTables`, see
+        `Board.jump_destinations`.
+
+        :param jumps: Square indices reached by the jumps
+        :return: Square indices where the piece can move
+        """
+        return self.board.jump_destinations(self.player, jumps)
+
     @staticmethod
     @abc.abstractmethod
     def abbreviation() -> str:
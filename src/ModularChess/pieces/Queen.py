@@ -1,6 +1,7 @@
 import os
 from typing import List, TYPE_CHECKING, TextIO
 
+from ModularChess.movements.MoveEncoding import encode_destinations
 from ModularChess.pieces.Bishop import Bishop
 from ModularChess.pieces.Piece import Piece
 from ModularChess.pieces.Rook import Rook
@@ -21,6 +22,17 @@ class Queen(Piece):
     def get_piece_valid_moves(self) -> List["Movement"]:
         return Bishop.get_bishop_valid_moves(self) + Rook.get_rook_valid_moves(self)
 
+    def get_encoded_moves(self) -> List[int]:
+        tables = self.board.tables
+        square = tables.square_index(self.position)
+        return encode_destinations(self, square, self.get_ray_destinations(tables.bishop_rays[square]) +
+                                   self.get_ray_destinations(tables.rook_rays[square]))
+
+    def get_attacked_squares(self) -> List[int]:
+        tables = self.board.tables
+        square = tables.square_index(self.position)
+        return self.get_ray_attacks(tables.bishop_rays[square]) + self.get_ray_attacks(tables.rook_rays[square])
+
     @staticmethod
     def piece_unicode() -> str:
         return "♕"
@@ -6,6 +6,7 @@ import numpy as np
 import ModularChess.pieces.King as King
 from ModularChess.movements.BasicMovement import BasicMovement
 from ModularChess.movements.Castling import CastlablePiece
+from ModularChess.movements.MoveEncoding import encode_destinations
 from ModularChess.utils.Exceptions import InvalidMoveException
 
 if TYPE_CHECKING:
@@ -43,18 +44,20 @@ class Rook(CastlablePiece):
     def get_piece_valid_moves(self) -> List["Movement"]:
         return Rook.get_rook_valid_moves(self)
 
-    @classmethod
-    def get_rook_valid_moves(cls, piece: "Piece") -> List["Movement"]:
-        # TODO: Redo
-        moves: List["Movement"] = []
+    def get_encoded_moves(self) -> List[int]:
+        tables = self.board.tables
+        square = tables.square_index(self.position)
+        return encode_destinations(self, square, self.get_ray_destinations(tables.rook_rays[square]))
 
-        for i, max_index in enumerate(piece.board.shape):
-            min_iterable = piece.position.create_lineal_path(piece.position.copy_and_replace(i, 0))
-            moves += [BasicMovement(piece, pos, is_valid_move=True) for pos in piece.__can_move_to__(min_iterable)]
-            max_iterable = piece.position.create_lineal_path(piece.position.copy_and_replace(i, max_index))
-            moves += [BasicMovement(piece, pos, is_valid_move=True) for pos in piece.__can_move_to__(max_iterable)]
+    def get_attacked_squares(self) -> List[int]:
+        tables = self.board.tables
+        return self.get_ray_attacks(tables.rook_rays[tables.square_index(self.position)])
 
-        return moves
+    @classmethod
+    def get_rook_valid_moves(cls, piece: "Piece") -> List["Movement"]:
+        tables = piece.board.tables
+        destinations = piece.get_ray_destinations(tables.rook_rays[tables.square_index(piece.position)])
+        return [BasicMovement(piece, tables.positions[square], is_valid_move=True) for square in destinations]
 
     @classmethod
     def lineal_check_move(cls, piece: "Piece", new_position: "Position") -> List["Movement"]:
@@ -68,7 +71,7 @@ class Rook(CastlablePiece):
             return []
 
         # Checks pieces in the path
-        if any([piece.board[pos] for pos in piece.position.create_lineal_path(new_position)][:-1]):
+        if not piece.board.is_path_clear(piece.position, new_position):
             return []
 
         # Checks if destination is not empty or there is an enemy piece
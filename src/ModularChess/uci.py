@@ -0,0 +1,279 @@
+import math
+import os
+import sys
+import threading
+from typing import Callable, Dict, List, Optional, TextIO, TYPE_CHECKING
+
+from ModularChess.artificial_intelligence.BasicAI import BasicAI
+from ModularChess.artificial_intelligence.BasicEvaluator import BasicEvaluator
+from ModularChess.artificial_intelligence.ParallelAI import ParallelAI
+from ModularChess.artificial_intelligence.SearchStatistics import SearchStatistics
+from ModularChess.controller.Player import Player
+from ModularChess.game_modes.Classical import Classical, STARTING_FEN
+from ModularChess.game_modes.Perft import move_name
+from ModularChess.movements.Castling import Castling
+from ModularChess.pieces.King import King
+from ModularChess.utils.Exceptions import InvalidMoveException, InvalidArgumentsError
+
+if TYPE_CHECKING:
+    from ModularChess.movements.Movement import Movement
+
+ENGINE_NAME = "ModularChess"
+ENGINE_AUTHOR = "Ferran Sanchez Llado"
+# Depth of the searches limited only by time
+MAX_DEPTH = 64
+DEFAULT_HASH = 16
+MAX_HASH = 4096
+# Score reported for positions where the evaluator returns an infinite score (i.e. checkmates)
+MAX_CENTIPAWNS = 32000
+
+
+def uci_move_name(move: "Movement") -> str:
+    """Long algebraic notation of UCI: like `move_name`, but castling moves use the destination of the king."""
+    if isinstance(move, Castling):
+        king = next(data for data in move.movements if isinstance(data.piece, King))
+        return str(king.initial_position) + str(king.destination_position)
+    return move_name(move)
+
+
+def find_uci_move(game_mode: Classical, name: str) -> "Movement":
+    """
+    Finds the legal move of the current player with the UCI name.
+
+    :raises InvalidMoveException: if there isn't a legal move with the name
+    """
+    moves: List["Movement"] = game_mode.generate_moves()
+    for move in moves:
+        if uci_move_name(move) == name:
+            return move
+    raise InvalidMoveException(f"Illegal move {name}")
+
+
+def parse_go(tokens: List[str]) -> Dict[str, int]:
+    """Numeric parameters of the go command (i.e. depth, movetime, wtime) and its flags (infinite, ponder) as 1."""
+    parameters: Dict[str, int] = {}
+    iterator = iter(tokens)
+    for token in iterator:
+        if token in ("infinite", "ponder"):
+            parameters[token] = 1
+        elif token in ("depth", "movetime", "wtime", "btime", "winc", "binc", "movestogo", "nodes", "mate"):
+            parameters[token] = int(next(iterator, "0"))
+    return parameters
+
+
+class UCIEngine:
+    """
+    Universal Chess Interface over `Classical` and `BasicAI`. Commands are handled in the calling thread and searches
+    run in a worker thread, so `stop` and `ponderhit` are answered while searching. Searches use iterative deepening,
+    with a time budget from `movetime` or the clocks (see `BasicAI.allocate_time`). With more than one thread (the
+    Threads option), searches limited only by depth are split across processes by `ParallelAI`, which can't be stopped.
+    """
+
+    def __init__(self, output: Callable[[str], None] = lambda line: print(line, flush=True)):
+        """
+        :param output: Writes a line to the GUI
+        """
+        self.output = output
+        self.output_lock = threading.Lock()
+        self.hash_size = DEFAULT_HASH
+        self.threads = 1
+        # The same players are kept for every position, as the search keeps state between moves
+        self.white, self.black = Player("White", (255, 255, 255)), Player("Black", (0, 0, 0))
+        self.game_mode = Classical.from_fen(STARTING_FEN, self.white, self.black)
+        self.ai = BasicAI(MAX_DEPTH, self.game_mode.current_player_turn, BasicEvaluator(self.game_mode),
+                          self.hash_size, callback=self.send_info)
+        self.parallel_ai: Optional[ParallelAI] = None
+
+        self.search_thread: Optional[threading.Thread] = None
+        # Set when the search of an infinite or ponder search can finish (stop or ponderhit)
+        self.release = threading.Event()
+        self.ponder_budget: Optional[float] = None
+        self.ponder_timer: Optional[threading.Timer] = None
+        self.reported_depth = 0
+
+    def send(self, line: str) -> None:
+        with self.output_lock:
+            self.output(line)
+
+    def send_info(self, statistics: SearchStatistics) -> None:
+        """Callback of the search: sends the nodes and speed, and the score and best move after each iteration."""
+        info = f"info depth {max(statistics.depth, 1)} nodes {statistics.nodes + statistics.quiescence_nodes} " \
+               f"nps {statistics.nps:.0f} time {statistics.elapsed * 1000:.0f}"
+        if statistics.depth > self.reported_depth and statistics.score is not None and \
+                statistics.best_move is not None:
+            # The iteration has just finished, so the game is in the root position
+            self.reported_depth = statistics.depth
+            score = statistics.score
+            centipawns = int(math.copysign(MAX_CENTIPAWNS, score)) if math.isinf(score) else round(score * 100)
+            move = uci_move_name(self.game_mode.decode_move(statistics.best_move))
+            info += f" score cp {centipawns} pv {move}"
+        self.send(info)
+
+    def handle(self, line: str) -> bool:
+        """
+        Handles a command of the GUI, unknown commands are ignored.
+
+        :return: False if the engine must quit
+        """
+        tokens = line.split()
+        if not tokens:
+            return True
+        command, arguments = tokens[0], tokens[1:]
+        if command == "uci":
+            self.send(f"id name {ENGINE_NAME}")
+            self.send(f"id author {ENGINE_AUTHOR}")
+            self.send(f"option name Hash type spin default {DEFAULT_HASH} min 1 max {MAX_HASH}")
+            self.send(f"option name Threads type spin default 1 min 1 max {os.cpu_count() or 1}")
+            self.send("option name Ponder type check default false")
+            self.send("uciok")
+        elif command == "isready":
+            self.send("readyok")
+        elif command == "ucinewgame":
+            self.stop()
+            self.ai.new_game()
+            self.game_mode.load_fen(STARTING_FEN)
+        elif command == "setoption":
+            self.set_option(arguments)
+        elif command == "position":
+            self.stop()
+            self.set_position(arguments)
+        elif command == "go":
+            self.stop()
+            self.go(parse_go(arguments))
+        elif command == "stop":
+            self.stop()
+        elif command == "ponderhit":
+            self.ponder_hit()
+        elif command == "quit":
+            self.stop()
+            if self.parallel_ai is not None:
+                self.parallel_ai.close()
+            return False
+        return True
+
+    def set_option(self, arguments: List[str]) -> None:
+        if "name" not in arguments or "value" not in arguments:
+            return
+        name = " ".join(arguments[arguments.index("name") + 1:arguments.index("value")]).lower()
+        value = " ".join(arguments[arguments.index("value") + 1:])
+        self.stop()
+        if name == "hash":
+            self.hash_size = min(max(int(value), 1), MAX_HASH)
+            self.ai = BasicAI(MAX_DEPTH, self.ai.player, self.ai.evaluator, self.hash_size, callback=self.send_info)
+        elif name == "threads":
+            self.threads = max(int(value), 1)
+            if self.parallel_ai is not None:
+                self.parallel_ai.close()
+                self.parallel_ai = None
+
+    def set_position(self, arguments: List[str]) -> None:
+        """Sets up the position in the game, which is reused. With an invalid FEN, the previous position is kept."""
+        moves = arguments[arguments.index("moves") + 1:] if "moves" in arguments else []
+        fen = STARTING_FEN
+        if arguments and arguments[0] == "fen":
+            fen = " ".join(arguments[1:arguments.index("moves")] if "moves" in arguments else arguments[1:])
+        game_mode = self.game_mode
+        previous_fen = game_mode.to_fen()
+        try:
+            game_mode.load_fen(fen)
+        except InvalidArgumentsError as exception:
+            game_mode.load_fen(previous_fen)
+            self.send(f"info string {exception}")
+            return
+
+        try:
+            for name in moves:
+                game_mode.move(find_uci_move(game_mode, name))
+        except InvalidMoveException as exception:
+            self.send(f"info string {exception}")
+
+    def go(self, parameters: Dict[str, int]) -> None:
+        game_mode = self.game_mode
+        white = game_mode.current_player_turn is game_mode.white
+        remaining, increment = parameters.get("wtime" if white else "btime"), parameters.get("winc" if white else "binc", 0)
+        if "movetime" in parameters:
+            budget = parameters["movetime"] / 1000
+        elif remaining is not None:
+            budget = BasicAI.allocate_time(remaining / 1000, increment / 1000,
+                                           parameters.get("movestogo", self.ai.moves_to_go))
+        else:
+            budget = float('inf')
+        depth = parameters.get("depth", MAX_DEPTH)
+
+        infinite = "infinite" in parameters or "ponder" in parameters
+        self.ponder_budget = budget if "ponder" in parameters else None
+        if infinite:
+            budget = float('inf')
+        self.release.clear()
+        self.reported_depth = 0
+
+        if self.threads > 1 and math.isinf(budget) and not infinite and "depth" in parameters:
+            target = self.parallel_search
+        else:
+            target = self.search
+        self.search_thread = threading.Thread(target=target, args=(depth, budget, infinite), daemon=True)
+        self.search_thread.start()
+
+    def search(self, depth: int, budget: float, infinite: bool) -> None:
+        ai = self.ai
+        ai.set_player(self.game_mode.current_player_turn)
+        ai.evaluator, ai.max_depth = BasicEvaluator(self.game_mode), depth
+        move = ai.iterative_deepening(budget)
+        if infinite:
+            # The best move can't be sent before the GUI stops the search
+            self.release.wait()
+        self.send_best_move(move)
+
+    def parallel_search(self, depth: int, budget: float, infinite: bool) -> None:
+        if self.parallel_ai is None:
+            self.parallel_ai = ParallelAI(depth, self.game_mode.current_player_turn, BasicEvaluator(self.game_mode),
+                                          self.threads, self.hash_size)
+        ai = self.parallel_ai
+        ai.set_player(self.game_mode.current_player_turn)
+        ai.evaluator, ai.max_depth = BasicEvaluator(self.game_mode), depth
+        try:
+            move: Optional["Movement"] = ai.search()[0]
+        except InvalidMoveException:
+            move = None
+        self.send_info(ai.statistics)
+        self.send_best_move(move)
+
+    def send_best_move(self, move: Optional["Movement"]) -> None:
+        self.send(f"bestmove {uci_move_name(move) if move is not None else '0000'}")
+
+    def stop(self) -> None:
+        """Stops the current search and waits until its best move is sent."""
+        if self.ponder_timer is not None:
+            self.ponder_timer.cancel()
+            self.ponder_timer = None
+        if self.search_thread is None:
+            return
+        self.release.set()
+        # The search resets the flag when it starts, so it's set until the thread finishes
+        while self.search_thread.is_alive():
+            self.ai.stop()
+            self.search_thread.join(0.01)
+        self.search_thread = None
+
+    def ponder_hit(self) -> None:
+        """The GUI played the pondered move: the search continues as a normal search, with its time budget."""
+        budget, self.ponder_budget = self.ponder_budget, None
+        if self.search_thread is None or budget is None:
+            return
+        self.release.set()
+        if not math.isinf(budget):
+            self.ponder_timer = threading.Timer(budget, self.ai.stop)
+            self.ponder_timer.start()
+
+
+def main(input_stream: TextIO = sys.stdin) -> int:
+    engine = UCIEngine()
+    for line in input_stream:
+        if not engine.handle(line):
+            break
+    engine.stop()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
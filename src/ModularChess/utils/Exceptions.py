@@ -20,3 +20,7 @@ class TimerError(ModularChessException):
 
 class InvalidPathException(ModularChessException):
     pass
+
+
+class SearchTimeoutException(ModularChessException):
+    pass
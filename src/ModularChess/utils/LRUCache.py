@@ -0,0 +1,76 @@
+from collections import OrderedDict
+from typing import Generic, Hashable, Optional, TypeVar
+
+from ModularChess.utils.Exceptions import InvalidArgumentsError
+
+VT = TypeVar('VT')  # value type
+
+
+class LRUCache(Generic[VT]):
+    """
+    Dictionary with a maximum number of elements. When it's full, adding a new element removes the least recently used
+    one. It counts the hits and misses of the lookups.
+    """
+
+    def __init__(self, capacity: int = 128):
+        if capacity < 1:
+            raise InvalidArgumentsError("Capacity must be a positive integer")
+        self._capacity = capacity
+        self.elements: "OrderedDict[Hashable, VT]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    @capacity.setter
+    def capacity(self, capacity: int) -> None:
+        if capacity < 1:
+            raise InvalidArgumentsError("Capacity must be a positive integer")
+        self._capacity = capacity
+        while len(self.elements) > capacity:
+            self.elements.popitem(last=False)
+
+    def get(self, key: Hashable) -> Optional[VT]:
+        """
+        Returns the value of the key (marking it as the most recently used) or None if it's not in the cache.
+
+        :param key: Key to look up
+        :return: Value or None
+        """
+        value = self.elements.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.elements.move_to_end(key)
+        return value
+
+    def put(self, key: Hashable, value: VT) -> None:
+        self.elements[key] = value
+        self.elements.move_to_end(key)
+        if len(self.elements) > self._capacity:
+            self.elements.popitem(last=False)
+
+    def discard(self, key: Hashable) -> None:
+        self.elements.pop(key, None)
+
+    def clear(self) -> None:
+        self.elements.clear()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.elements
+
+    def __len__(self) -> int:
+        return len(self.elements)
+
+    def __repr__(self) -> str:
+        return f"LRUCache(capacity={self._capacity}, size={len(self)}, hits={self.hits}, misses={self.misses})"
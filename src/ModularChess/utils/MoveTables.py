@@ -0,0 +1,118 @@
+import itertools
+from functools import lru_cache
+from typing import Tuple, List, Sequence, Union, Dict
+
+import numpy as np
+
+from ModularChess.utils.Position import Position
+
+Vector = Tuple[int, ...]
+
+
+class MoveTables:
+    """
+    Geometry of a board shape precomputed for every square. Squares are flattened to integer indices in row-major order
+    (same as `~controller.BitBoard.BitBoard`), and for every square it stores the ordered squares of each ray of the
+    sliding pieces and the destinations of the jumping pieces, so move generation only iterates integer lists.
+    """
+
+    def __init__(self, shape: Tuple[int, ...]):
+        self.shape = shape
+        self.dimensions = len(shape)
+        self.strides: Vector = tuple(int(np.prod(shape[i + 1:])) for i in range(self.dimensions))
+        self.n_squares = int(np.prod(shape))
+
+        self.coordinates: List[Vector] = [tuple(int(coord) for coord in index) for index in np.ndindex(*shape)]
+        self.positions: List[Position] = [Position(coordinates) for coordinates in self.coordinates]
+        for position in self.positions:
+            # Positions are shared between pieces and movements, so they can't be modified in place
+            position.flags.writeable = False
+
+        self.rook_directions = self.lineal_directions(self.dimensions)
+        self.bishop_directions = self.two_lineal_directions(self.dimensions)
+        self.knight_vectors = self.knight_jumps_vectors(self.dimensions)
+        self.king_vectors = self.adjacent_vectors(self.dimensions)
+        # Squares reached by each translation, filled as they are requested (i.e. the pawn moves)
+        self.translations: Dict[Tuple[int, Vector], int] = {}
+
+        self.rook_rays = [self.create_rays(square, self.rook_directions) for square in range(self.n_squares)]
+        self.bishop_rays = [self.create_rays(square, self.bishop_directions) for square in range(self.n_squares)]
+        self.knight_jumps = [self.create_jumps(square, self.knight_vectors) for square in range(self.n_squares)]
+        self.king_jumps = [self.create_jumps(square, self.king_vectors) for square in range(self.n_squares)]
+
+    def square_index(self, position: Union[Position, Sequence[int]]) -> int:
+        """Index of a position inside the board."""
+        coordinates = position.tolist() if isinstance(position, np.ndarray) else position
+        return sum(coord * stride for coord, stride in zip(coordinates, self.strides))
+
+    def translate(self, square: int, vector: Vector) -> int:
+        """Index of the square reached by moving from `square` with `vector`, or -1 if it's outside the board."""
+        destination = self.translations.get((square, vector))
+        if destination is None:
+            coordinates = [coord + step for coord, step in zip(self.coordinates[square], vector)]
+            if any(not 0 <= coord < size for coord, size in zip(coordinates, self.shape)):
+                destination = -1
+            else:
+                destination = self.square_index(coordinates)
+            self.translations[square, vector] = destination
+        return destination
+
+    def create_rays(self, square: int, directions: Sequence[Vector]) -> Tuple[Tuple[int, ...], ...]:
+        rays = []
+        for direction in directions:
+            ray = []
+            current = self.translate(square, direction)
+            while current != -1:
+                ray.append(current)
+                current = self.translate(current, direction)
+            if ray:
+                rays.append(tuple(ray))
+        return tuple(rays)
+
+    def create_jumps(self, square: int, vectors: Sequence[Vector]) -> Tuple[int, ...]:
+        return tuple(destination for destination in (self.translate(square, vector) for vector in vectors)
+                     if destination != -1)
+
+    @staticmethod
+    def lineal_directions(dimensions: int) -> List[Vector]:
+        """Directions moving in only one axis."""
+        directions = []
+        for axis in range(dimensions):
+            for step in (-1, 1):
+                vector = [0] * dimensions
+                vector[axis] = step
+                directions.append(tuple(vector))
+        return directions
+
+    @staticmethod
+    def two_lineal_directions(dimensions: int) -> List[Vector]:
+        """Diagonal directions moving the same distance in exactly two axis."""
+        directions = []
+        for a, b in itertools.combinations(range(dimensions), 2):
+            for step_a, step_b in itertools.product((1, -1), repeat=2):
+                vector = [0] * dimensions
+                vector[a], vector[b] = step_a, step_b
+                directions.append(tuple(vector))
+        return directions
+
+    @staticmethod
+    def knight_jumps_vectors(dimensions: int) -> List[Vector]:
+        """Jumps moving two squares in an axis and one square in another axis."""
+        vectors = []
+        for a, b in itertools.permutations(range(dimensions), 2):
+            for step_a, step_b in itertools.product((2, -2), (1, -1)):
+                vector = [0] * dimensions
+                vector[a], vector[b] = step_a, step_b
+                vectors.append(tuple(vector))
+        return vectors
+
+    @staticmethod
+    def adjacent_vectors(dimensions: int) -> List[Vector]:
+        """Moves of one square in any number of axis."""
+        return [vector for vector in itertools.product((-1, 0, 1), repeat=dimensions) if any(vector)]
+
+
+@lru_cache(maxsize=None)
+def get_move_tables(shape: Tuple[int, ...]) -> MoveTables:
+    """Tables of the shape, built the first time they are requested and shared by all boards with the same shape."""
+    return MoveTables(tuple(shape))
@@ -0,0 +1,48 @@
+import hashlib
+from typing import Dict, Tuple, Hashable, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ModularChess.controller.Player import Player
+    from ModularChess.pieces.Piece import Piece
+
+
+class Zobrist:
+    """
+    Random 64-bit keys used to hash positions. The key of a position is the XOR of the keys of every piece in its
+    square, the player to move and the en passant state, so it can be updated incrementally when pieces are added,
+    removed or moved. Keys are created the first time they are needed, and derived from the seed and the components of
+    the key (instead of a random generator), so every process obtains the same keys for any board shape or number of
+    players.
+    """
+
+    def __init__(self, seed: int = 0):
+        self.seed = seed
+        self.keys: Dict[Tuple[Hashable, ...], int] = {}
+
+    def key(self, *components: Hashable) -> int:
+        key = self.keys.get(components)
+        if key is None:
+            digest = hashlib.blake2b(repr((self.seed,) + components).encode(), digest_size=8).digest()
+            key = self.keys[components] = int.from_bytes(digest, "little")
+        return key
+
+    def piece_key(self, piece: "Piece", square: int) -> int:
+        """
+        Key of a piece in a square. Unmoved castlable pieces have a different key, so the castling rights are part of
+        the position key.
+        """
+        from ModularChess.movements.Castling import CastlablePiece
+
+        return self.key("piece", type(piece).__name__, piece.player.name, piece.player.color, square,
+                        isinstance(piece, CastlablePiece) and piece.n_moves == 0)
+
+    def player_key(self, player: "Player") -> int:
+        """Key of the player to move."""
+        return self.key("player", player.name, player.color)
+
+    def en_passant_key(self, file: int) -> int:
+        """Key of the file where an en passant capture can be made."""
+        return self.key("en_passant", file)
+
+
+ZOBRIST = Zobrist()
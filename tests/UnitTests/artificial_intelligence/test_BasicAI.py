@@ -0,0 +1,168 @@
+import unittest
+from datetime import timedelta
+from typing import List
+from unittest import mock
+
+from ModularChess.artificial_intelligence.BasicAI import BasicAI
+from ModularChess.artificial_intelligence.BasicEvaluator import BasicEvaluator
+from ModularChess.artificial_intelligence.SearchStatistics import SearchStatistics, Phase
+from ModularChess.controller.Board import Board
+from ModularChess.controller.Player import Player
+from ModularChess.controller.Timer import Timer
+from ModularChess.game_modes.Classical import Classical
+from ModularChess.game_modes.Perft import play_moves, move_name, find_move
+from ModularChess.utils.Exceptions import InvalidMoveException
+
+
+class TestBasicAI(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.game_mode = Classical(Player("White"), Player("Black"), Board)
+        self.game_mode.generate_board()
+        # The white queen can be captured by the bishop
+        play_moves(self.game_mode, ["e2e4", "d7d5", "d1g4"])
+        self.timer = Timer(timedelta(seconds=30), timedelta(seconds=1), lambda: None)
+
+    def test_fixed_depth(self) -> None:
+        ai = BasicAI(2, self.game_mode.black, BasicEvaluator(self.game_mode))
+        self.assertEqual("c8g4", move_name(ai.get_next_move()))
+
+    def test_time_budget(self) -> None:
+        ai = BasicAI(2, self.game_mode.black, BasicEvaluator(self.game_mode), timer=self.timer, moves_to_go=10)
+        self.assertAlmostEqual(30 / 10 + 1, ai.time_budget())
+        ai.moves_to_go = 1
+        self.assertAlmostEqual(30 / 2, ai.time_budget())
+
+    def test_iterative_deepening(self) -> None:
+        ai = BasicAI(3, self.game_mode.black, BasicEvaluator(self.game_mode), timer=self.timer)
+        self.assertEqual("c8g4", move_name(ai.get_next_move()))
+        self.assertEqual(3, ai.search_depth)
+
+    def test_aborted_iteration(self) -> None:
+        ai = BasicAI(5, self.game_mode.black, BasicEvaluator(self.game_mode))
+        key, n_moves = self.game_mode.position_key, len(self.game_mode.moves)
+        # The first iteration is always completed, the second one is aborted
+        move = ai.iterative_deepening(0)
+        assert move is not None
+        self.assertEqual("c8g4", move_name(move))
+        self.assertEqual(2, ai.search_depth)
+        self.assertEqual((key, n_moves), (self.game_mode.position_key, len(self.game_mode.moves)))
+        self.assertIs(self.game_mode.black, self.game_mode.current_player_turn)
+        self.assertIsNone(ai.deadline)
+
+    def test_quiescence(self) -> None:
+        game_mode = Classical(Player("White"), Player("Black"), Board)
+        game_mode.generate_board()
+        # Every pawn the queen can capture is defended
+        play_moves(game_mode, ["e2e4", "d7d5", "e4d5", "d8d5", "b1c3"])
+        ai = BasicAI(1, game_mode.black, BasicEvaluator(game_mode), quiescence=False)
+        self.assertEqual(("d5g2", 1), (move_name(ai.get_next_move()), ai.score()))
+        for delta_margin in (None, 1.):
+            ai = BasicAI(1, game_mode.black, BasicEvaluator(game_mode), delta_margin=delta_margin)
+            self.assertNotIn(move_name(ai.get_next_move()), ("d5g2", "d5d2", "d5a2"))
+            self.assertEqual(0, ai.score())
+
+    def test_delta_pruning(self) -> None:
+        ai = BasicAI(1, self.game_mode.black, BasicEvaluator(self.game_mode), delta_margin=2.)
+        capture = find_move(self.game_mode, "c8g4")
+        # The queen (9) plus the margin can raise the score up to 11
+        self.assertFalse(ai.is_futile(capture, 0., 10., True))
+        self.assertTrue(ai.is_futile(capture, 0., 11., True))
+        self.assertFalse(ai.is_futile(capture, 0., -10., False))
+        self.assertTrue(ai.is_futile(capture, 0., -11., False))
+        ai.delta_margin = None
+        self.assertFalse(ai.is_futile(capture, 0., 11., True))
+
+    def test_selectivity(self) -> None:
+        ai = BasicAI(4, self.game_mode.black, BasicEvaluator(self.game_mode), null_move=False,
+                     late_move_reductions=False, aspiration_window=None)
+        self.assertEqual("c8g4", move_name(ai.get_next_move()))
+        statistics = ai.statistics
+        self.assertEqual((0, 0, 0), (statistics.null_move_searches, statistics.reduced_searches,
+                                     statistics.aspiration_searches))
+
+        ai = BasicAI(4, self.game_mode.black, BasicEvaluator(self.game_mode))
+        self.assertEqual("c8g4", move_name(ai.get_next_move()))
+        self.assertGreater(ai.statistics.reduced_searches, 0)
+        self.assertGreater(ai.statistics.null_move_searches, 0)
+        self.assertEqual([], self.game_mode.null_moves)
+
+    def test_null_move_guards(self) -> None:
+        ai = BasicAI(4, self.game_mode.black, BasicEvaluator(self.game_mode))
+        self.assertTrue(ai.can_null_move(3))
+        # Not at the root nor without depth left after the reduction
+        self.assertFalse(ai.can_null_move(4))
+        self.assertFalse(ai.can_null_move(2))
+        self.game_mode.make_null_move()
+        self.assertFalse(ai.can_null_move(3))
+        self.game_mode.undo_null_move()
+        ai.null_move = False
+        self.assertFalse(ai.can_null_move(3))
+
+        # In check and with only pawns and kings
+        game_mode = Classical(Player("White"), Player("Black"), Board)
+        game_mode.generate_board()
+        play_moves(game_mode, ["e2e4", "f7f6", "d1h5"])
+        self.assertFalse(BasicAI(4, game_mode.black, BasicEvaluator(game_mode)).can_null_move(3))
+        for piece_type in (game_mode.Rook, game_mode.Knight, game_mode.Bishop, game_mode.Queen):  # type: ignore
+            for piece in list(game_mode.board.pieces[game_mode.white][piece_type]):
+                game_mode.board.remove_piece(piece)
+        play_moves(game_mode, ["g7g6"])
+        self.assertFalse(BasicAI(4, game_mode.white, BasicEvaluator(game_mode)).can_null_move(3))
+
+    def test_aspiration_windows(self) -> None:
+        ai = BasicAI(3, self.game_mode.black, BasicEvaluator(self.game_mode), timer=self.timer,
+                     quiescence=False, aspiration_window=0.1)
+        self.assertEqual("c8g4", move_name(ai.get_next_move()))
+        self.assertEqual(2, ai.statistics.aspiration_searches)
+        # Without quiescence, the score of each iteration changes with the captures of the last ply
+        self.assertGreater(ai.statistics.aspiration_researches, 0)
+
+    def test_statistics(self) -> None:
+        ai = BasicAI(3, self.game_mode.black, BasicEvaluator(self.game_mode))
+        move, statistics = ai.search()
+        self.assertEqual("c8g4", move_name(move))
+        self.assertEqual(3, statistics.depth)
+        self.assertGreater(statistics.nodes, 0)
+        self.assertGreater(statistics.quiescence_nodes, 0)
+        self.assertGreater(statistics.nps, 0)
+        self.assertGreater(statistics.cutoffs, 0)
+        self.assertLessEqual(statistics.first_move_cutoffs, statistics.cutoffs)
+        self.assertEqual(0, sum(statistics.phase_times.values()))
+        # The positions are stored in the transposition table by the previous search
+        self.assertGreater(ai.search()[1].transposition_hits, 0)
+
+    def test_profile(self) -> None:
+        reports: List[SearchStatistics] = []
+        evaluator = BasicEvaluator(self.game_mode)
+        ai = BasicAI(3, self.game_mode.black, evaluator, profile=True, callback=reports.append, callback_nodes=20)
+        statistics = ai.search()[1]
+        for phase in Phase:
+            self.assertGreater(statistics.phase_times[phase], 0)
+        self.assertLess(sum(statistics.phase_times.values()), statistics.elapsed)
+        # The profiled methods are restored
+        self.assertNotIn("score", evaluator.__dict__)
+        self.assertNotIn("generate_encoded_moves", self.game_mode.__dict__)
+        self.assertGreater(len(reports), 2)
+        self.assertIs(statistics, reports[-1])
+
+    def test_moves_not_validated(self) -> None:
+        # The searched moves are legal, so they are made without validating them again
+        ai = BasicAI(3, self.game_mode.black, BasicEvaluator(self.game_mode))
+        with mock.patch.object(self.game_mode, "check_valid_move", wraps=self.game_mode.check_valid_move) as check:
+            self.assertEqual("c8g4", move_name(ai.get_next_move()))
+        self.assertEqual(0, check.call_count)
+        self.assertEqual(3, len(self.game_mode.moves))
+        self.assertIs(self.game_mode.black, self.game_mode.current_player_turn)
+
+    def test_no_moves(self) -> None:
+        game_mode = Classical(Player("White"), Player("Black"), Board)
+        game_mode.generate_board()
+        # Fool's mate
+        play_moves(game_mode, ["f2f3", "e7e5", "g2g4", "d8h4"])
+        ai = BasicAI(2, game_mode.white, BasicEvaluator(game_mode), timer=self.timer)
+        self.assertRaises(InvalidMoveException, ai.get_next_move)
+
+
+if __name__ == '__main__':
+    unittest.main()
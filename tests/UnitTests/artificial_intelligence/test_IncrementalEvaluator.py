@@ -0,0 +1,100 @@
+import random
+import unittest
+
+import numpy as np
+
+from ModularChess.artificial_intelligence.BasicAI import BasicAI
+from ModularChess.artificial_intelligence.BasicEvaluator import BasicEvaluator
+from ModularChess.artificial_intelligence.IncrementalEvaluator import IncrementalEvaluator, advancement, \
+    centralization
+from ModularChess.controller.BitBoard import BitBoard
+from ModularChess.controller.Board import Board
+from ModularChess.controller.Player import Player
+from ModularChess.game_modes.Classical import Classical
+from ModularChess.game_modes.Perft import CLASSICAL_SUITE, play_moves
+
+
+class TestIncrementalEvaluator(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.game_mode = Classical(Player("White"), Player("Black"), Board)
+        self.game_mode.generate_board()
+
+    def full_evaluation(self, evaluator: IncrementalEvaluator) -> dict:
+        board = self.game_mode.board
+        return {player: sum(evaluator.piece_values(piece)[board.tables.square_index(piece.position)]
+                            for pieces in board.pieces[player].values() for piece in pieces)
+                for player in self.game_mode.players}
+
+    def test_tables(self) -> None:
+        table = centralization(1.)((4, 4, 4))
+        self.assertEqual((4, 4, 4), table.shape)
+        self.assertEqual(0, table[0, 0, 0])
+        self.assertEqual(table.max(), table[1, 2, 1])
+        np.testing.assert_allclose([0, 0.5 / 3, 1 / 3, 0.5], advancement(0.5)((4, 2))[:, 1])
+
+    def test_material(self) -> None:
+        evaluator = IncrementalEvaluator(self.game_mode, {})
+        basic_evaluator = BasicEvaluator(self.game_mode)
+        play_moves(self.game_mode, CLASSICAL_SUITE[4].moves + ("h7g8q",))
+        for player in self.game_mode.players:
+            self.assertEqual(basic_evaluator.evaluate_player(player), evaluator.evaluate_player(player))
+        self.assertEqual(basic_evaluator.score(self.game_mode.white), evaluator.score(self.game_mode.white))
+
+    def test_flipped_tables(self) -> None:
+        evaluator = IncrementalEvaluator(self.game_mode)
+        # The initial position is symmetric
+        self.assertAlmostEqual(evaluator.evaluate_player(self.game_mode.white),
+                               evaluator.evaluate_player(self.game_mode.black))
+        play_moves(self.game_mode, ["e2e4"])
+        self.assertGreater(evaluator.evaluate_player(self.game_mode.white),
+                           evaluator.evaluate_player(self.game_mode.black))
+
+    def test_moves_and_undo(self) -> None:
+        rng = random.Random(0)
+        for board_type in (Board, BitBoard):
+            self.game_mode = Classical(Player("White"), Player("Black"), board_type)
+            self.game_mode.generate_board()
+            evaluator = IncrementalEvaluator(self.game_mode)
+            initial_scores = dict(evaluator.scores)
+            for _ in range(100):
+                moves = self.game_mode.generate_moves()
+                if not moves:
+                    break
+                self.game_mode.move(rng.choice(moves))
+                for player, score in self.full_evaluation(evaluator).items():
+                    self.assertAlmostEqual(score, evaluator.evaluate_player(player))
+            self.game_mode.undo_move(len(self.game_mode.moves))
+            for player, score in initial_scores.items():
+                self.assertAlmostEqual(score, evaluator.evaluate_player(player))
+
+    def test_restart(self) -> None:
+        # The evaluator keeps observing the board after the game is restarted
+        evaluator = IncrementalEvaluator(self.game_mode)
+        play_moves(self.game_mode, ["e2e4", "d7d5", "e4d5"])
+        self.game_mode.restart()
+        self.game_mode.generate_board()
+        self.assertEqual([], self.game_mode.moves)
+        self.assertAlmostEqual(IncrementalEvaluator(self.game_mode).score(), evaluator.score())
+        play_moves(self.game_mode, ["e2e4", "d7d5", "e4d5"])
+        self.assertAlmostEqual(IncrementalEvaluator(self.game_mode).score(), evaluator.score())
+        self.assertGreater(evaluator.score(self.game_mode.white), 0)
+
+    def test_detach(self) -> None:
+        evaluator = IncrementalEvaluator(self.game_mode)
+        self.assertIn(evaluator, self.game_mode.board.observers)
+        evaluator.detach()
+        self.assertNotIn(evaluator, self.game_mode.board.observers)
+
+    def test_search(self) -> None:
+        play_moves(self.game_mode, ["e2e4", "d7d5", "d1g4"])
+        evaluator = IncrementalEvaluator(self.game_mode)
+        scores = dict(evaluator.scores)
+        ai = BasicAI(2, self.game_mode.black, evaluator)
+        self.assertEqual("Bxg4", str(ai.get_next_move()))
+        for player, score in scores.items():
+            self.assertAlmostEqual(score, evaluator.evaluate_player(player))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+import unittest
+
+import numpy as np
+
+from ModularChess.artificial_intelligence.BasicEvaluator import BasicEvaluator
+from ModularChess.artificial_intelligence.MonteCarloAI import MonteCarloAI, MCTSTree, NO_NODE
+from ModularChess.artificial_intelligence.PlaneEvaluator import PlaneEvaluator
+from ModularChess.artificial_intelligence.RandomAI import RandomAI
+from ModularChess.controller.Board import Board
+from ModularChess.controller.Player import Player
+from ModularChess.game_modes.Classical import Classical
+from ModularChess.game_modes.Perft import play_moves, move_name
+from ModularChess.utils.Exceptions import InvalidMoveException, InvalidArgumentsError
+
+
+class TestMCTSTree(unittest.TestCase):
+
+    def test_expand_and_select(self) -> None:
+        tree = MCTSTree(2)
+        tree.expand(0, [10, 11, 12], 0, np.ones(3))
+        self.assertEqual(4, len(tree))
+        self.assertEqual(slice(1, 4), tree.children(0))
+        tree.visits[[0, 1, 2]] = [2, 1, 1]
+        tree.value[[1, 2]] = [1, 0]
+        # The unvisited child is selected first, then the best one
+        self.assertEqual(3, tree.select_child(0, 1., False))
+        tree.visits[[0, 3]] = [3, 1]
+        self.assertEqual(1, tree.select_child(0, 1., False))
+        self.assertEqual(1, tree.most_visited_child())
+        self.assertEqual(2, tree.find_child(0, 11))
+        self.assertEqual(NO_NODE, tree.find_child(0, 13))
+
+        tree.expand(3, [], 1, np.ones(0))
+        self.assertTrue(tree.terminal[3])
+
+    def test_subtree(self) -> None:
+        tree = MCTSTree()
+        tree.expand(0, [10, 11], 0, np.ones(2))
+        tree.expand(2, [20, 21], 1, np.ones(2))
+        tree.expand(4, [30], 0, np.ones(1))
+        tree.visits[:6] = [6, 1, 5, 1, 3, 2]
+        subtree = tree.subtree(2)
+        self.assertEqual(4, len(subtree))
+        self.assertEqual([11, 20, 21, 30], subtree.code[:4].tolist())
+        self.assertEqual([5, 1, 3, 2], subtree.visits[:4].tolist())
+        self.assertEqual([NO_NODE, 0, 0, 2], subtree.parent[:4].tolist())
+        self.assertEqual([1, NO_NODE, 3, NO_NODE], subtree.first_child[:4].tolist())
+
+
+class TestMonteCarloAI(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.game_mode = Classical(Player("White"), Player("Black"), Board)
+        self.game_mode.generate_board()
+        # The white queen can be captured by the bishop
+        play_moves(self.game_mode, ["e2e4", "d7d5", "d1g4"])
+
+    def test_capture(self) -> None:
+        state = self.game_mode.position_key, len(self.game_mode.moves), self.game_mode.last_capture
+        for evaluator in (BasicEvaluator(self.game_mode), PlaneEvaluator(self.game_mode)):
+            for puct in (False, True):
+                ai = MonteCarloAI(self.game_mode.black, evaluator, 200, rollout_depth=2, puct=puct, seed=0)
+                self.assertEqual("c8g4", move_name(ai.get_next_move()))
+                self.assertEqual(200, ai.tree.visits[0])
+                # The captures searched aren't recorded as the last capture of the game
+                self.assertEqual(state, (self.game_mode.position_key, len(self.game_mode.moves),
+                                         self.game_mode.last_capture))
+
+    def test_checkmate(self) -> None:
+        game_mode = Classical(Player("White"), Player("Black"), Board)
+        game_mode.generate_board()
+        play_moves(game_mode, ["f2f3", "e7e5", "g2g4"])
+        ai = MonteCarloAI(game_mode.black, BasicEvaluator(game_mode), 200, rollout_depth=2, seed=0)
+        mate = ai.get_next_move()
+        self.assertEqual("d8h4", move_name(mate))
+        node = ai.tree.most_visited_child()
+        self.assertEqual(ai.tree.visits[node], ai.tree.value[node])
+
+        game_mode.move(mate)
+        ai = MonteCarloAI(game_mode.white, BasicEvaluator(game_mode), 8)
+        self.assertRaises(InvalidMoveException, ai.get_next_move)
+
+    def test_tree_reuse(self) -> None:
+        ai = MonteCarloAI(self.game_mode.black, BasicEvaluator(self.game_mode), 200, rollout_depth=2, seed=0)
+        self.game_mode.move(ai.get_next_move())
+        # Most of the visits of the reply are in the subtree of the capture
+        reply = ai.tree.most_visited_child(ai.tree.most_visited_child())
+        visits = ai.tree.visits[reply]
+        self.game_mode.move(self.game_mode.decode_move(int(ai.tree.code[reply])))
+        ai.update_root()
+        self.assertEqual(visits, ai.tree.visits[0])
+
+        ai.reuse_tree = False
+        ai.update_root()
+        self.assertEqual(1, len(ai.tree))
+
+    def test_rollout_policy(self) -> None:
+        evaluator = BasicEvaluator(self.game_mode)
+        ai = MonteCarloAI(self.game_mode.black, evaluator, 100, rollout_depth=2, batch_size=1,
+                          rollout_policy=RandomAI(self.game_mode.black, evaluator))
+        self.assertIn(ai.get_next_move(), self.game_mode.generate_moves())
+
+    def test_parallel(self) -> None:
+        self.assertRaises(InvalidArgumentsError, MonteCarloAI, self.game_mode.black, BasicEvaluator(self.game_mode),
+                          workers=0)
+        ai = MonteCarloAI(self.game_mode.black, BasicEvaluator(self.game_mode), 200, rollout_depth=2, workers=2,
+                          seed=0)
+        try:
+            self.assertEqual("c8g4", move_name(ai.get_next_move()))
+        finally:
+            ai.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+from typing import List, Optional
+from unittest import mock
+
+from ModularChess.artificial_intelligence.MoveOrdering import MoveOrdering, mvv_lva, sort_captures
+from ModularChess.controller.Board import Board
+from ModularChess.controller.Player import Player
+from ModularChess.game_modes.Classical import Classical
+from ModularChess.game_modes.Perft import play_moves, move_name, find_move
+from ModularChess.movements.MoveEncoding import encode_move
+
+
+class TestMoveOrdering(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.game_mode = Classical(Player("White"), Player("Black"), Board)
+        self.game_mode.generate_board()
+        # Black can capture the queen with the bishop (c8g4) or the pawn with the pawn (d5e4)
+        play_moves(self.game_mode, ["e2e4", "d7d5", "d1g4"])
+        self.move_ordering = MoveOrdering()
+
+    def names(self, ply: int = 0, hash_move: Optional[str] = None) -> List[str]:
+        code = None if hash_move is None else encode_move(find_move(self.game_mode, hash_move))
+        return [move_name(move) for _, move in self.move_ordering.order(self.game_mode, ply, code)]
+
+    def test_mvv_lva(self) -> None:
+        self.assertGreater(mvv_lva(9, 1), mvv_lva(9, 3))
+        self.assertGreater(mvv_lva(3, 9), mvv_lva(1, 1))
+        self.assertGreater(mvv_lva(0, 1, 9), mvv_lva(5, 1))
+
+    def test_captures_first(self) -> None:
+        names = self.names()
+        self.assertEqual(len(self.game_mode.generate_moves()), len(names))
+        self.assertEqual(["c8g4", "d5e4"], names[:2])
+        self.assertEqual(names[:2], [move_name(move) for move in sort_captures(self.game_mode.generate_captures())])
+
+    def test_hash_move(self) -> None:
+        names = self.names(hash_move="h7h6")
+        self.assertEqual("h7h6", names[0])
+        self.assertEqual(1, names.count("h7h6"))
+
+    def test_killers_and_history(self) -> None:
+        for name in ("a7a6", "b7b6", "h7h5"):
+            self.move_ordering.update(encode_move(find_move(self.game_mode, name)), 1, 1, 2)
+        # Captures don't become killers
+        self.move_ordering.update(encode_move(find_move(self.game_mode, "c8g4")), 1, 1, 2)
+        self.assertEqual(["h7h5", "b7b6"], self.names(1)[2:4])
+        # The history of the quiet moves is shared by all the plies
+        self.assertEqual(["a7a6", "b7b6", "h7h5"], sorted(self.names(0)[2:5]))
+
+        self.move_ordering.new_search()
+        self.assertFalse(self.move_ordering.killers)
+        self.assertEqual({2}, set(self.move_ordering.history.values()))
+
+        self.move_ordering.new_game()
+        self.assertFalse(self.move_ordering.history)
+
+    def test_history_of_other_game(self) -> None:
+        # The history is kept by the index of the player, so other games (with other players) can use it
+        self.move_ordering.update(encode_move(find_move(self.game_mode, "h7h5")), 1, 1, 2)
+        game_mode = Classical(Player("White"), Player("Black"), Board)
+        game_mode.generate_board()
+        play_moves(game_mode, ["e2e4", "d7d5", "d1g4"])
+        self.assertEqual("h7h5", move_name(list(self.move_ordering.order(game_mode, 0))[2][1]))
+
+    def test_lazy_decoding(self) -> None:
+        with mock.patch.object(self.game_mode, "decode_move", wraps=self.game_mode.decode_move) as decode_move:
+            moves = self.move_ordering.order(self.game_mode, 0)
+            self.assertEqual("c8g4", move_name(next(moves)[1]))
+            self.assertEqual(1, decode_move.call_count)
+
+
+if __name__ == '__main__':
+    unittest.main()
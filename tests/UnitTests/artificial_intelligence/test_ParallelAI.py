@@ -0,0 +1,69 @@
+import unittest
+
+from ModularChess.artificial_intelligence.BasicAI import BasicAI
+from ModularChess.artificial_intelligence.BasicEvaluator import BasicEvaluator
+from ModularChess.artificial_intelligence.ParallelAI import ParallelAI, GameSetup, SearchSettings, _get_worker_ai
+from ModularChess.controller.BitBoard import BitBoard
+from ModularChess.controller.Board import Board
+from ModularChess.controller.Player import Player
+from ModularChess.game_modes.Classical import Classical
+from ModularChess.game_modes.Perft import CLASSICAL_SUITE, play_moves, move_name
+from ModularChess.utils.Exceptions import InvalidArgumentsError
+
+
+class TestParallelAI(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.game_mode = Classical(Player("White"), Player("Black"), Board)
+        self.game_mode.generate_board()
+        # The white queen can be captured by the bishop
+        play_moves(self.game_mode, ["e2e4", "d7d5", "d1g4"])
+
+    def test_game_setup(self) -> None:
+        for position in CLASSICAL_SUITE:
+            for board_type in (Board, BitBoard):
+                game_mode = Classical(Player("White"), Player("Black"), board_type)
+                game_mode.generate_board()
+                play_moves(game_mode, position.moves)
+                rebuilt = GameSetup.from_game_mode(game_mode).build()
+                self.assertIsInstance(rebuilt.board, board_type)
+                self.assertEqual(game_mode.position_key, rebuilt.position_key)
+                self.assertEqual(len(game_mode.generate_moves()), len(rebuilt.generate_moves()))
+
+    def test_worker_ai(self) -> None:
+        setup = GameSetup.from_game_mode(self.game_mode)
+        settings = SearchSettings(BasicEvaluator, 3, 1, True, None, True, True, 1)
+        ai = _get_worker_ai(setup, settings)
+        self.assertIs(ai, _get_worker_ai(setup, settings))
+        # New settings build a new AI, which keeps the transposition table
+        deeper_ai = _get_worker_ai(setup, SearchSettings(BasicEvaluator, 4, 1, False, None, True, True, 1))
+        self.assertIsNot(ai, deeper_ai)
+        self.assertEqual((4, False), (deeper_ai.max_depth, deeper_ai.quiescence))
+        self.assertIs(ai.transposition_table, deeper_ai.transposition_table)
+
+    def test_workers(self) -> None:
+        self.assertRaises(InvalidArgumentsError, ParallelAI, 2, self.game_mode.black, BasicEvaluator(self.game_mode), 0)
+        self.assertGreaterEqual(ParallelAI(2, self.game_mode.black, BasicEvaluator(self.game_mode)).workers, 1)
+
+    def test_one_worker(self) -> None:
+        ai = ParallelAI(3, self.game_mode.black, BasicEvaluator(self.game_mode), 1)
+        basic_ai = BasicAI(3, self.game_mode.black, BasicEvaluator(self.game_mode))
+        self.assertEqual(move_name(basic_ai.get_next_move()), move_name(ai.get_next_move()))
+        self.assertIsNone(ai.executor)
+
+    def test_parallel_search(self) -> None:
+        ai = ParallelAI(3, self.game_mode.black, BasicEvaluator(self.game_mode), 2, 1)
+        try:
+            move, statistics = ai.search()
+            self.assertEqual("c8g4", move_name(move))
+            # Nodes of the workers and the root
+            self.assertGreater(statistics.nodes, len(self.game_mode.generate_moves()))
+            n_moves = len(self.game_mode.moves)
+            self.game_mode.move(ai.get_next_move())
+            self.assertEqual(n_moves + 1, len(self.game_mode.moves))
+        finally:
+            ai.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
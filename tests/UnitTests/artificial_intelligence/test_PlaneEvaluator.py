@@ -0,0 +1,87 @@
+import unittest
+
+import numpy as np
+
+from ModularChess.artificial_intelligence.IncrementalEvaluator import IncrementalEvaluator
+from ModularChess.artificial_intelligence.PlaneEvaluator import PlaneEvaluator
+from ModularChess.controller.BitBoard import BitBoard
+from ModularChess.controller.Board import Board
+from ModularChess.controller.Player import Player
+from ModularChess.game_modes.Classical import Classical
+from ModularChess.game_modes.Perft import play_moves
+
+MOVES = ["e2e4", "d7d5", "e4d5", "d8d5", "b1c3", "d5a5", "d2d4", "c7c6", "g1f3", "c8g4"]
+
+
+class TestPlaneEvaluator(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.game_mode = Classical(Player("White"), Player("Black"), Board)
+        self.game_mode.generate_board()
+
+    def test_material_and_tables(self) -> None:
+        # Without the positional terms it's the same evaluation as the incremental evaluator
+        evaluator = PlaneEvaluator(self.game_mode, mobility_weight=0, king_safety_weight=0, doubled_pawn_weight=0,
+                                   isolated_pawn_weight=0)
+        incremental = IncrementalEvaluator(self.game_mode)
+        for name in MOVES:
+            play_moves(self.game_mode, [name])
+            self.assertAlmostEqual(incremental.score(), evaluator.score())
+        self.game_mode.undo_move(len(MOVES))
+        self.assertAlmostEqual(0, evaluator.score())
+
+    def test_incremental_planes(self) -> None:
+        for board_type in (Board, BitBoard):
+            game_mode = Classical(Player("White"), Player("Black"), board_type)
+            game_mode.generate_board()
+            evaluator = PlaneEvaluator(game_mode)
+            play_moves(game_mode, MOVES)
+            planes = evaluator.planes.copy()
+            evaluator.attach()
+            np.testing.assert_array_equal(planes, evaluator.planes)
+
+    def test_restart(self) -> None:
+        # The evaluator keeps observing the board after the game is restarted
+        evaluator = PlaneEvaluator(self.game_mode)
+        play_moves(self.game_mode, ["e2e4", "d7d5", "e4d5"])
+        self.game_mode.restart()
+        self.game_mode.generate_board()
+        self.assertEqual([], self.game_mode.moves)
+        self.assertAlmostEqual(PlaneEvaluator(self.game_mode).score(), evaluator.score())
+        play_moves(self.game_mode, ["e2e4", "d7d5", "e4d5"])
+        self.assertAlmostEqual(PlaneEvaluator(self.game_mode).score(), evaluator.score())
+        self.assertGreater(evaluator.score(self.game_mode.white), 0)
+
+    def test_symmetric_position(self) -> None:
+        evaluator = PlaneEvaluator(self.game_mode)
+        self.assertAlmostEqual(0, evaluator.score())
+        white, black = (score for _, score in evaluator.evaluate())
+        self.assertAlmostEqual(white, black)
+
+    def test_mobility(self) -> None:
+        evaluator = PlaneEvaluator(self.game_mode, king_safety_weight=0, tables={})
+        play_moves(self.game_mode, ["e2e4"])
+        # The bishop attacks c4, b5 and a6, the queen g4 and h5 and the pawn d5 and f5 (d3 and f3 are still attacked)
+        self.assertAlmostEqual(7 * evaluator.mobility_weight, evaluator.score(self.game_mode.white))
+
+    def test_pawn_structure(self) -> None:
+        evaluator = PlaneEvaluator(self.game_mode, mobility_weight=0, king_safety_weight=0, tables={})
+        # White has doubled pawns in the c-file and an isolated pawn in the a-file, and a pawn more than black
+        play_moves(self.game_mode, ["b2b4", "c7c5", "b4c5"])
+        white, black = (score for _, score in evaluator.evaluate())
+        self.assertAlmostEqual(1 - evaluator.doubled_pawn_weight - evaluator.isolated_pawn_weight, white - black)
+
+    def test_batch(self) -> None:
+        evaluator = PlaneEvaluator(self.game_mode)
+        snapshots, scores = [], []
+        for name in MOVES:
+            play_moves(self.game_mode, [name])
+            snapshots.append(evaluator.snapshot())
+            scores.append(evaluator.score(self.game_mode.white))
+        np.testing.assert_allclose(scores, evaluator.score_snapshots(snapshots, self.game_mode.white))
+        self.assertEqual((len(MOVES), 2), evaluator.evaluate_snapshots(snapshots).shape)
+        self.assertEqual((0, 2), evaluator.evaluate_snapshots([]).shape)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import unittest
+
+from ModularChess.artificial_intelligence.BasicAI import BasicAI
+from ModularChess.artificial_intelligence.BasicEvaluator import BasicEvaluator
+from ModularChess.artificial_intelligence.TranspositionTable import TranspositionTable, Bound, ENTRY_TYPE
+from ModularChess.controller.Board import Board
+from ModularChess.controller.Player import Player
+from ModularChess.game_modes.Classical import Classical
+from ModularChess.game_modes.Perft import play_moves, move_name
+from ModularChess.utils.Exceptions import InvalidArgumentsError
+
+
+class TestTranspositionTable(unittest.TestCase):
+
+    def test_size(self) -> None:
+        table = TranspositionTable(1)
+        self.assertEqual(2 ** 20 // (2 * ENTRY_TYPE.itemsize), table.n_buckets)
+        self.assertLessEqual(table.size_mb, 1)
+        self.assertRaises(InvalidArgumentsError, TranspositionTable, 0)
+
+    def test_probe_and_store(self) -> None:
+        table = TranspositionTable(0.01)
+        self.assertIsNone(table.probe(12345))
+        table.store(12345, 3, 1.5, Bound.LOWER, 42)
+        entry = table.probe(12345)
+        assert entry is not None
+        self.assertEqual((3, 1.5, Bound.LOWER, 42), (entry.depth, entry.score, entry.bound, entry.move))
+        self.assertEqual((1, 1, 0.5), (table.hits, table.misses, table.hit_rate))
+
+        table.store(2 ** 63 + 7, 0, float("-inf"), Bound.UPPER)
+        entry = table.probe(2 ** 63 + 7)
+        assert entry is not None
+        self.assertEqual((float("-inf"), None), (entry.score, entry.move))
+
+        table.clear()
+        self.assertEqual(0, len(table))
+        self.assertIsNone(table.probe(12345))
+
+    def test_replacement(self) -> None:
+        table = TranspositionTable(0.01)
+        keys = [7 + index * table.n_buckets for index in range(4)]
+        table.store(keys[0], 5, 0., Bound.EXACT)
+        # Shallower searches go to the always-replace entry
+        table.store(keys[1], 2, 0., Bound.EXACT)
+        table.store(keys[2], 1, 0., Bound.EXACT)
+        self.assertIsNotNone(table.probe(keys[0]))
+        self.assertIsNone(table.probe(keys[1]))
+        self.assertIsNotNone(table.probe(keys[2]))
+        # Deeper searches replace the depth-preferred entry
+        table.store(keys[3], 6, 0., Bound.EXACT)
+        self.assertIsNone(table.probe(keys[0]))
+        self.assertIsNotNone(table.probe(keys[3]))
+        self.assertEqual(2, table.replacements)
+
+    def test_cutoff_score(self) -> None:
+        table = TranspositionTable(0.01)
+        for bound, expected in ((Bound.EXACT, (1., 1., 1.)), (Bound.LOWER, (None, 1., None)),
+                                (Bound.UPPER, (None, None, 1.))):
+            table.store(1, 1, 1., bound)
+            entry = table.probe(1)
+            assert entry is not None
+            self.assertEqual(expected, (entry.cutoff_score(0., 2.), entry.cutoff_score(0., 1.),
+                                        entry.cutoff_score(1., 2.)))
+
+
+class TestBasicAITranspositionTable(unittest.TestCase):
+
+    def test_search(self) -> None:
+        game_mode = Classical(Player("White"), Player("Black"), Board)
+        game_mode.generate_board()
+        play_moves(game_mode, ["e2e4", "d7d5", "d1g4"])
+        ai = BasicAI(3, game_mode.black, BasicEvaluator(game_mode), 1)
+
+        self.assertEqual("c8g4", move_name(ai.get_next_move()))
+        score = ai.score()
+        hits = ai.transposition_table.hits
+        self.assertGreater(len(ai.transposition_table), 0)
+        # The second search reuses the results of the first one
+        self.assertEqual(score, ai.score())
+        self.assertGreater(ai.transposition_table.hits, hits)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,214 @@
+import random
+import unittest
+
+from ModularChess.controller.BitBoard import BitBoard
+from ModularChess.controller.Board import Board
+from ModularChess.controller.Player import Player
+from ModularChess.game_modes.Classical import Classical
+from ModularChess.game_modes.Perft import play_moves
+from ModularChess.pieces.Bishop import Bishop
+from ModularChess.pieces.Empty import Empty
+from ModularChess.pieces.King import King
+from ModularChess.pieces.Knight import Knight
+from ModularChess.pieces.Queen import Queen
+from ModularChess.pieces.Rook import Rook
+from ModularChess.utils.Exceptions import InvalidArgumentsError, InvalidPositionError, InvalidPathException
+from ModularChess.utils.Position import Position
+
+
+class TestBitBoard(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.board = BitBoard()
+        self.player = Player("test")
+        self.piece_position = Position("e4")
+        self.piece = Empty(self.board, self.player, self.piece_position)
+
+    def test_invalid_shape(self):
+        self.assertRaises(InvalidArgumentsError, BitBoard, (8,))
+
+    def test_uneven_board(self):
+        board = BitBoard((5, 5, 3))
+        self.assertTrue(board.is_position_inside(Position([2, 4, 1])))
+        self.assertTrue(board.is_position_outside(Position([2, 4, 3])))
+        self.assertEqual(3, board.dimensions)
+        self.assertEqual(-1, board.size)
+        self.assertEqual(2 * 15 + 4 * 3 + 1, board.square_index(Position([2, 4, 1])))
+        self.assertEqual((5, 5, 3), board.board.shape)
+
+    def test_add_piece(self):
+        self.board.add_piece(self.piece)
+
+        self.assertEqual(self.piece, self.board[self.piece_position])
+        self.assertEqual(self.piece, self.board[(3, 4)])
+        self.assertEqual(self.piece, self.board.pieces[self.player][Empty][0])
+        self.assertEqual(1 << 28, self.board.occupied)
+        self.assertEqual(1 << 28, self.board.players_occupancy[self.player])
+        self.assertEqual(1 << 28, self.board.occupancy[self.player][Empty])
+
+    def test_remove_piece(self):
+        self.board.add_piece(self.piece)
+        self.board.remove_piece(self.piece)
+
+        self.assertIsNone(self.board[self.piece_position])
+        self.assertListEqual([], self.board.pieces[self.player][Empty])
+        self.assertEqual(0, self.board.occupied)
+        self.assertEqual(0, self.board.occupancy[self.player][Empty])
+        self.assertTrue(self.board.is_empty())
+
+    def test_move_piece(self):
+        self.board.add_piece(self.piece)
+        new_position = Position("a1")
+        self.board.move_piece(self.piece, new_position)
+
+        self.assertIsNone(self.board[self.piece_position])
+        self.assertEqual(self.piece, self.board[new_position])
+        self.assertEqual(1, self.board.occupied)
+        self.assertEqual(1, self.board.occupancy[self.player][Empty])
+        self.assertEqual(1, self.piece.n_moves)
+
+    def test_capturable_mask(self):
+        enemy, ally = Player("enemy"), Player("ally")
+        self.board.add_piece(self.piece)
+        self.board.add_piece(Empty(self.board, enemy, Position("a1")))
+        self.board.add_piece(Empty(self.board, ally, Position("b1")))
+        # Without enemies, every player but the allies can be captured
+        self.assertEqual(1 | 2, self.board.capturable_mask(self.player))
+
+        Player.join_allies([self.player, ally], [self.player, ally, enemy])
+        Player.join_allies([enemy], [self.player, ally, enemy])
+        self.assertEqual(1, self.board.capturable_mask(self.player))
+        self.assertEqual(1 << 28 | 2, self.board.capturable_mask(enemy))
+
+    def test_attack_queries(self):
+        white, black = Player("White"), Player("Black")
+        game_modes = Classical(white, black), Classical(white, black, BitBoard)
+        for game_mode in game_modes:
+            game_mode.generate_board()
+            play_moves(game_mode, ["e2e4", "d7d5", "f1b5", "b8c6"])
+        board, bit_board = (game_mode.board for game_mode in game_modes)
+
+        for player in (white, black):
+            self.assertEqual(sum(1 << square for square, count in enumerate(board.attacks[player]) if count),
+                             bit_board.attacked[player])
+        for square in range(64):
+            for player in (white, black):
+                self.assertEqual(board.is_square_attacked(square, player), bit_board.is_square_attacked(square, player))
+                self.assertEqual({str(piece.position) for piece in board.get_square_attackers(square, player)},
+                                 {str(piece.position) for piece in bit_board.get_square_attackers(square, player)})
+
+        bishop = bit_board[Position("b5")]
+        self.assertTrue(bit_board.can_capture(bishop, Position("c6")))
+        self.assertFalse(bit_board.can_capture(bishop, Position("e1")))
+        self.assertFalse(bit_board.can_capture(bishop, Position("d3")))
+        self.assertTrue(bit_board.can_capture_or_move(bishop, Position("d3")))
+        self.assertFalse(bit_board.can_capture_or_move(bishop, Position("e1")))
+
+    def test_position_outside(self):
+        self.assertRaises(InvalidPositionError, self.board.__getitem__, Position([8, 0]))
+        self.assertRaises(InvalidPositionError, self.board.__getitem__, Position([0, -1]))
+        self.assertTrue(self.board.is_position_outside(Position([-1, 3])))
+        self.assertFalse(self.board.is_position_outside(self.piece_position))
+        self.assertTrue(self.board.is_position_inside(self.piece_position))
+        self.assertFalse(self.board.is_position_inside(Position([3, 8])))
+
+    def test_square_index(self):
+        for index in range(64):
+            self.assertEqual(index, self.board.square_index(self.board.square_position(index)))
+
+        board = BitBoard((4, 3, 5, 2))
+        for index in range(4 * 3 * 5 * 2):
+            self.assertEqual(index, board.square_index(board.square_position(index)))
+
+    def test_path(self):
+        blocker = Empty(self.board, self.player, Position("e6"))
+        self.board.add_piece(blocker)
+        self.board.add_piece(self.piece)
+
+        self.assertTrue(self.board.is_path_clear(Position("e1"), Position("e4")))
+        self.assertFalse(self.board.is_path_clear(Position("e1"), Position("e5")))
+        self.assertTrue(self.board.is_path_clear(Position("e4"), Position("e6")))
+        self.assertFalse(self.board.is_path_clear(Position("e4"), Position("e7")))
+        self.assertTrue(self.board.is_path_clear(Position("a1"), Position("h8")))
+        self.assertFalse(self.board.is_path_clear(Position("a8"), Position("h1")))
+        self.assertRaises(InvalidPathException, self.board.is_path_clear, Position("a1"), Position("b3"))
+
+        rays = self.board.tables.rook_rays[self.board.square_index(self.piece_position)]
+        destinations = {str(self.board.square_position(square)) for square in
+                        self.board.ray_destinations(self.player, rays)}
+        self.assertIn("e5", destinations)
+        self.assertNotIn("e6", destinations)
+        self.assertIn("e1", destinations)
+        attacked = {str(self.board.square_position(square)) for square in self.board.ray_attacks(rays)}
+        self.assertIn("e6", attacked)
+        self.assertNotIn("e7", attacked)
+
+        # Pieces of other players can be captured
+        enemy = Player("enemy")
+        self.board.add_piece(Empty(self.board, enemy, Position("e2")))
+        destinations = {str(self.board.square_position(square)) for square in
+                        self.board.ray_destinations(self.player, rays)}
+        self.assertIn("e2", destinations)
+        self.assertNotIn("e1", destinations)
+        jumps = self.board.tables.knight_jumps[self.board.square_index(Position("c4"))]
+        destinations = {str(self.board.square_position(square)) for square in
+                        self.board.jump_destinations(self.player, jumps)}
+        self.assertIn("e3", destinations)
+        self.assertIn("d2", destinations)
+        self.board.add_piece(Empty(self.board, self.player, Position("e3")))
+        self.board.add_piece(Empty(self.board, enemy, Position("d2")))
+        destinations = {str(self.board.square_position(square)) for square in
+                        self.board.jump_destinations(self.player, jumps)}
+        self.assertNotIn("e3", destinations)
+        self.assertIn("d2", destinations)
+
+    def test_board_array(self):
+        self.board.add_piece(self.piece)
+        self.assertEqual((8, 8), self.board.board.shape)
+        self.assertIs(self.piece, self.board.board[3, 4])
+
+    def test_same_moves_as_board(self):
+        white, black = Player("White"), Player("Black")
+        classical = Classical(white, black)
+        classical.generate_board()
+        bit_classical = Classical(white, black, BitBoard)
+        bit_classical.generate_board()
+
+        self.assertIsInstance(classical.board, Board)
+        self.assertIsInstance(bit_classical.board, BitBoard)
+        self.assertEqual(str(classical.board), str(bit_classical.board))
+
+        for player in (white, black):
+            for piece_type, pieces in classical.board.pieces[player].items():
+                bit_pieces = bit_classical.board.pieces[player][piece_type]
+                for piece, bit_piece in zip(pieces, bit_pieces):
+                    self.assertEqual({str(move.destination) for move in classical.generate_moves_of_a_piece(piece)},
+                                     {str(move.destination) for move in
+                                      bit_classical.generate_moves_of_a_piece(bit_piece)})
+
+    def test_same_moves_as_board_multidimensional(self):
+        rng = random.Random(0)
+        white, black = Player("White"), Player("Black")
+        Player.join_allies([white], [white, black])
+        Player.join_allies([black], [white, black])
+
+        for shape in ((8, 8, 8), (4, 5, 3, 4)):
+            boards = Board(shape), BitBoard(shape)
+            squares = rng.sample(range(len(boards[1].squares)), 40)
+            pieces_types = [Rook, Bishop, Knight, King, Queen]
+
+            for i, index in enumerate(squares):
+                position = boards[1].square_position(index)
+                for board in boards:
+                    piece = pieces_types[i % 5](board, (white, black)[i % 2], position)
+                    piece.n_moves = 1  # Castling is not defined for more than 2 dimensions
+                    board.add_piece(piece)
+
+            for index in squares:
+                board_piece, bit_board_piece = (board[boards[1].square_position(index)] for board in boards)
+                self.assertEqual({str(move.destination) for move in board_piece.get_piece_valid_moves()},
+                                 {str(move.destination) for move in bit_board_piece.get_piece_valid_moves()})
+
+
+if __name__ == '__main__':
+    unittest.main()
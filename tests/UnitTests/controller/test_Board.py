@@ -1,8 +1,12 @@
+import random
 import unittest
 
 from ModularChess.controller.Board import Board
 from ModularChess.controller.Player import Player
+from ModularChess.game_modes.Classical import Classical
 from ModularChess.pieces.Empty import Empty
+from ModularChess.pieces.Knight import Knight
+from ModularChess.pieces.Rook import Rook
 from ModularChess.utils.Position import Position
 
 
@@ -51,10 +55,66 @@ class TestBoard(unittest.TestCase):
         self.assertEqual(self.piece, self.board.pieces[self.player][Empty][0])
         self.assertEqual(1, self.piece.n_moves)
 
-    # TODO
-    @unittest.skip("Depends on pieces")
+    def test_add_pieces(self):
+        game_mode = Classical(Player("White"), Player("Black"))
+        game_mode.generate_board()
+        pieces = [piece for piece in game_mode.board.squares if piece is not None]
+
+        board = Board()
+        board.add_pieces(pieces)
+        self.assertEqual(game_mode.board.zobrist_key, board.zobrist_key)
+        self.assertEqual(dict(game_mode.board.attacks), dict(board.attacks))
+        self.assertEqual(pieces, [piece for piece in board.squares if piece is not None])
+
+        board.clear()
+        self.assertTrue(board.is_empty())
+        self.assertEqual(0, board.zobrist_key)
+        self.assertEqual({}, board.pieces)
+
     def test_can_enemy_piece_capture(self):
-        self.fail()
+        board = Board()
+        enemy = Player("enemy")
+        Player.join_allies([self.player], [self.player, enemy])
+        Player.join_allies([enemy], [self.player, enemy])
+
+        piece = Empty(board, self.player, Position("e4"))
+        rook = Rook(board, enemy, Position("e8"))
+        knight = Knight(board, enemy, Position("b1"))
+        for board_piece in (piece, rook, knight):
+            board.add_piece(board_piece)
+
+        self.assertIs(rook, board.can_enemy_piece_capture_piece(piece))
+        self.assertIsNone(board.can_enemy_piece_capture_position(Position("e3"), self.player))
+        self.assertIs(knight, board.can_enemy_piece_capture_position(Position("c3"), self.player))
+        self.assertIsNone(board.can_enemy_piece_capture_position(Position("c3"), enemy))
+
+        board.move_piece(piece, Position("d4"))
+        self.assertIsNone(board.can_enemy_piece_capture_piece(piece))
+        self.assertIs(rook, board.can_enemy_piece_capture_position(Position("e1"), self.player))
+
+        board.remove_piece(rook)
+        self.assertFalse(board.is_square_attacked(board.square_index(Position("e1")), self.player))
+
+    def test_attack_maps(self):
+        rng = random.Random(0)
+        white, black = Player("White"), Player("Black")
+        game_mode = Classical(white, black)
+        game_mode.generate_board()
+
+        for _ in range(40):
+            moves = game_mode.generate_moves()
+            if not moves:
+                break
+            game_mode.move(rng.choice(moves))
+
+            # Attacks computed from scratch must match the incremental attack maps
+            for player in (white, black):
+                expected = [0] * 64
+                for pieces in game_mode.board.pieces[player].values():
+                    for piece in pieces:
+                        for square in piece.get_attacked_squares():
+                            expected[square] += 1
+                self.assertListEqual(expected, game_mode.board.attacks[player])
 
     def test_can_capture_or_move(self):
         self.board.add_piece(self.piece)
@@ -0,0 +1,209 @@
+import random
+import unittest
+
+from ModularChess.controller.BitBoard import BitBoard
+from ModularChess.controller.Player import Player
+from ModularChess.game_modes.Classical import Classical, STARTING_FEN
+from ModularChess.game_modes.GameMode import GameMode
+from ModularChess.game_modes.Perft import play_moves, move_name, find_move
+from ModularChess.utils.Exceptions import InvalidMoveException, InvalidArgumentsError
+from ModularChess.utils.Position import Position
+
+
+class TestClassicalLegalMoves(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.white = Player("White")
+        self.black = Player("Black")
+        self.game_mode = Classical(self.white, self.black)
+
+    def add(self, piece_type: type, player: Player, position: str, n_moves: int = 1) -> None:
+        piece = piece_type(self.game_mode.board, player, Position(position))
+        piece.n_moves = n_moves
+        self.game_mode.board.add_piece(piece)
+
+    def legal_moves(self):
+        return {str(move.piece.position) + str(move.destination) for move in self.game_mode.generate_legal_moves()}
+
+    def test_pinned_piece(self):
+        self.add(self.game_mode.King, self.white, "e1")
+        self.add(self.game_mode.Rook, self.white, "e2")
+        self.add(self.game_mode.Bishop, self.white, "d2")
+        self.add(self.game_mode.Rook, self.black, "e8")
+        self.add(self.game_mode.Bishop, self.black, "a5")
+        self.add(self.game_mode.King, self.black, "h8")
+
+        safety = self.game_mode.king_safety(self.white)
+        self.assertListEqual([], safety.checkers)
+        self.assertEqual(2, len(safety.pins))
+
+        moves = self.legal_moves()
+        self.assertIn("e2e8", moves)
+        self.assertIn("d2a5", moves)
+        self.assertNotIn("e2d2", moves)
+        self.assertNotIn("d2e3", moves)
+
+    def test_check(self):
+        self.add(self.game_mode.King, self.white, "e1")
+        self.add(self.game_mode.Rook, self.white, "a2")
+        self.add(self.game_mode.Knight, self.white, "g1")
+        self.add(self.game_mode.Rook, self.black, "e8")
+        self.add(self.game_mode.King, self.black, "h8")
+
+        safety = self.game_mode.king_safety(self.white)
+        self.assertEqual(1, len(safety.checkers))
+        self.assertSetEqual({"a2e2", "g1e2", "e1d1", "e1d2", "e1f1", "e1f2"}, self.legal_moves())
+
+    def test_double_check(self):
+        self.add(self.game_mode.King, self.white, "e1")
+        self.add(self.game_mode.Rook, self.white, "h1")
+        self.add(self.game_mode.Queen, self.white, "a3")
+        self.add(self.game_mode.Rook, self.black, "e8")
+        self.add(self.game_mode.Knight, self.black, "d3")
+        self.add(self.game_mode.King, self.black, "h8")
+
+        self.assertEqual(2, len(self.game_mode.king_safety(self.white).checkers))
+        self.assertSetEqual({"e1d1", "e1d2", "e1f1"}, self.legal_moves())
+
+    def test_pawn_check(self):
+        self.add(self.game_mode.King, self.white, "e1")
+        self.add(self.game_mode.ClassicalPawn, self.black, "d2")
+        self.add(self.game_mode.King, self.black, "e8")
+
+        self.assertEqual(1, len(self.game_mode.king_safety(self.white).checkers))
+        self.assertEqual(0, len(self.game_mode.king_safety(self.black).checkers))
+
+    def test_no_castling_in_check(self):
+        self.add(self.game_mode.King, self.white, "e1", n_moves=0)
+        self.add(self.game_mode.Rook, self.white, "h1", n_moves=0)
+        self.add(self.game_mode.Rook, self.black, "e8")
+        self.add(self.game_mode.King, self.black, "a8")
+
+        self.assertNotIn("e1h1", self.legal_moves())
+        self.assertIn("e1f1", self.legal_moves())
+
+    def test_same_moves_as_make_undo(self):
+        rng = random.Random(0)
+        self.game_mode.generate_board()
+        for _ in range(60):
+            moves = self.game_mode.generate_legal_moves()
+            self.assertSetEqual({str(move) for move in GameMode.generate_legal_moves(self.game_mode)},
+                                {str(move) for move in moves})
+            if not moves:
+                break
+            self.game_mode.move(rng.choice(moves))
+
+    def test_captures(self):
+        self.add(self.game_mode.King, self.white, "e1")
+        self.add(self.game_mode.Rook, self.white, "e2")
+        self.add(self.game_mode.ClassicalPawn, self.white, "b7")
+        self.add(self.game_mode.Knight, self.white, "h1")
+        self.add(self.game_mode.Rook, self.black, "e8")
+        self.add(self.game_mode.Knight, self.black, "a8")
+        self.add(self.game_mode.Queen, self.black, "h3")
+        self.add(self.game_mode.King, self.black, "g8")
+        captures = {str(move.piece.position) + str(move.destination) for move in self.game_mode.generate_captures()}
+        # The pinned rook can only capture the pinning rook, the pawn captures or promotes (to any piece type)
+        self.assertSetEqual({"e2e8", "b7a8", "b7b8"}, captures)
+
+    def test_same_captures_as_filtered_moves(self):
+        rng = random.Random(1)
+        self.game_mode.generate_board()
+        for _ in range(80):
+            self.assertSetEqual({str(move) for move in GameMode.generate_captures(self.game_mode)},
+                                {str(move) for move in self.game_mode.generate_captures()})
+            moves = self.game_mode.generate_legal_moves()
+            if not moves:
+                break
+            self.game_mode.move(rng.choice(moves))
+
+    def test_null_move(self):
+        self.game_mode.generate_board()
+        play_moves(self.game_mode, ["e2e4", "d7d5", "e4e5", "f7f5"])
+        key = self.game_mode.position_key
+        # The en passant capture is lost after passing the turn
+        self.game_mode.make_null_move()
+        self.assertIs(self.black, self.game_mode.current_player_turn)
+        self.assertTrue(self.game_mode.last_move_is_null())
+        self.assertIsNone(self.game_mode.en_passant_pawn())
+        self.game_mode.move(find_move(self.game_mode, "a7a6"))
+        self.assertFalse(self.game_mode.last_move_is_null())
+        self.assertRaises(InvalidMoveException, self.game_mode.undo_null_move)
+        self.game_mode.undo_move(1)
+        self.game_mode.undo_null_move()
+        self.assertEqual((key, self.white), (self.game_mode.position_key, self.game_mode.current_player_turn))
+        self.assertIn("e5f6", {move_name(move) for move in self.game_mode.generate_moves()})
+
+    def test_is_in_check(self):
+        self.add(self.game_mode.King, self.white, "e1")
+        self.add(self.game_mode.King, self.black, "e8")
+        self.add(self.game_mode.Rook, self.black, "a1")
+        self.assertTrue(self.game_mode.is_in_check())
+        self.assertFalse(self.game_mode.is_in_check(self.black))
+
+
+class TestClassicalFEN(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.white = Player("White")
+        self.black = Player("Black")
+        self.game_mode = Classical(self.white, self.black)
+        self.game_mode.generate_board()
+
+    def test_to_fen(self):
+        self.assertEqual(STARTING_FEN, self.game_mode.to_fen())
+        play_moves(self.game_mode, ["e2e4", "c7c5", "g1f3"])
+        self.assertEqual("rnbqkbnr/pp1ppppp/8/2p5/4P3/5N2/PPPP1PPP/RNBQKB1R b KQkq - 1 2", self.game_mode.to_fen())
+        play_moves(self.game_mode, ["d7d5", "e1e2"])
+        self.assertEqual("rnbqkbnr/pp2pppp/8/2pp4/4P3/5N2/PPPPKPPP/RNBQ1B1R b kq - 1 3", self.game_mode.to_fen())
+        play_moves(self.game_mode, ["h7h5", "f3e5", "h8h6"])
+        self.assertEqual("rnbqkbn1/pp2ppp1/7r/2ppN2p/4P3/8/PPPPKPPP/RNBQ1B1R w q - 2 5", self.game_mode.to_fen())
+        self.game_mode.undo_move(6)
+        self.assertEqual("rnbqkbnr/pp1ppppp/8/2p5/4P3/8/PPPP1PPP/RNBQKBNR w KQkq c6 0 2", self.game_mode.to_fen())
+
+    def test_round_trip(self):
+        play_moves(self.game_mode, ["e2e4", "d7d5", "e4e5", "f7f5", "e1e2"])
+        for fen in (STARTING_FEN, self.game_mode.to_fen(), "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1",
+                    "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1",
+                    "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8"):
+            self.assertEqual(fen, Classical.from_fen(fen).to_fen())
+
+    def test_same_position(self):
+        play_moves(self.game_mode, ["e2e4", "d7d5", "e4e5", "f7f5", "h2h4", "b8c6", "h1h3"])
+        game_mode = Classical.from_fen(self.game_mode.to_fen(), Player("White"), Player("Black"), BitBoard)
+        self.assertEqual(self.game_mode.position_key, game_mode.position_key)
+        # The en passant capture and the castling rights are kept
+        self.assertEqual({move_name(move) for move in self.game_mode.generate_moves()},
+                         {move_name(move) for move in game_mode.generate_moves()})
+        self.assertEqual(self.game_mode.perft(2).nodes, game_mode.perft(2).nodes)
+
+    def test_load_fen(self):
+        # Loading a position keeps the players, the board and its observers
+        board = self.game_mode.board
+        self.game_mode.load_fen("4k3/8/8/8/8/8/4P3/4K3 b - - 3 40")
+        self.assertIs(board, self.game_mode.board)
+        self.assertIs(self.black, self.game_mode.current_player_turn)
+        self.assertEqual([], self.game_mode.moves)
+        self.assertEqual(3, self.game_mode.halfmove_clock())
+        self.assertEqual(40, self.game_mode.fullmove_number())
+        self.assertEqual(3, len([piece for piece in board.squares if piece is not None]))
+        play_moves(self.game_mode, ["e8d7", "e2e4"])
+        self.assertEqual("8/3k4/8/8/4P3/8/8/4K3 b - e3 0 41", self.game_mode.to_fen())
+        # The pawn advanced in the initial row, so it can advance two squares
+        self.game_mode.load_fen("4k3/8/8/8/8/8/4P3/4K3 w - -")
+        self.assertIn("e2e4", {move_name(move) for move in self.game_mode.generate_moves()})
+        # The pawn which advanced two squares before the position can be captured en passant
+        self.game_mode.load_fen("4k3/8/8/3pP3/8/8/8/4K3 w - d6 0 1")
+        play_moves(self.game_mode, ["e5d6"])
+        self.assertEqual("4k3/8/3P4/8/8/8/8/4K3 b - - 0 1", self.game_mode.to_fen())
+
+    def test_invalid_fen(self):
+        for fen in ("", "8/8/8/8/8/8/8 w - - 0 1", "8/8/8/8/8/8/8/9 w - - 0 1", "4k3/8/8/8/8/8/8/4K3 x - - 0 1",
+                    "4k3/8/8/8/8/8/8/4K3 w K - 0 1", "4k3/8/8/8/8/8/8/4K2R w X - 0 1",
+                    "4k3/8/8/8/8/8/8/4K3 w - e3 0 1", "4k3/8/8/8/4P3/8/8/4K3 w - e3 0 1",
+                    "4k3/8/8/8/8/8/8/4K3 w - - a 1", "4k3/8/8/8/8/8/8/4X3 w - - 0 1"):
+            self.assertRaises(InvalidArgumentsError, Classical.from_fen, fen)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import random
+import unittest
+from typing import List
+
+import numpy as np
+
+from ModularChess.controller.Board import Board
+from ModularChess.controller.Player import Player
+from ModularChess.game_modes.Classical import Classical
+from ModularChess.game_modes.ClassicalBatch import ClassicalBatch, shift, EN_PASSANT_PAWN, TURN, UNMOVED
+from ModularChess.game_modes.Perft import CLASSICAL_SUITE, play_moves
+from ModularChess.movements.MoveEncoding import pack_move, CAPTURE, PROMOTION
+
+
+class TestClassicalBatch(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.batch = ClassicalBatch()
+
+    @staticmethod
+    def create_game(moves: List[str]) -> Classical:
+        game_mode = Classical(Player("White"), Player("Black"), Board)
+        game_mode.generate_board()
+        play_moves(game_mode, moves)
+        return game_mode
+
+    @staticmethod
+    def random_games(n_games: int, max_plies: int) -> List[Classical]:
+        games = []
+        for seed in range(n_games):
+            rng = random.Random(seed)
+            game_mode = TestClassicalBatch.create_game([])
+            for _ in range(rng.randint(0, max_plies)):
+                codes = game_mode.generate_encoded_legal_moves()
+                if not codes:
+                    break
+                game_mode.move(game_mode.decode_move(rng.choice(codes)))
+            games.append(game_mode)
+        return games
+
+    def assert_same_moves(self, games: List[Classical]) -> None:
+        boards, codes = self.batch.generate_encoded_moves(self.batch.pack(games))
+        self.assertTrue((np.diff(boards) >= 0).all())
+        for index, game_mode in enumerate(games):
+            self.assertCountEqual(game_mode.generate_encoded_legal_moves(), codes[boards == index].tolist())
+
+    def test_shift(self) -> None:
+        array = np.zeros((1, 3, 3), dtype=np.bool_)
+        array[0, 1, 1] = array[0, 2, 2] = True
+        shifted = shift(array, (1, -1))
+        self.assertEqual([(0, 2, 0)], [tuple(index) for index in np.argwhere(shifted)])
+
+    def test_pack(self) -> None:
+        game_mode = self.create_game(["e2e4", "a7a6", "e4e5", "d7d5"])
+        planes = self.batch.pack([game_mode])
+        self.assertEqual((1, 8, 8, 15), planes.shape)
+        self.assertEqual(32, planes[0, ..., :UNMOVED].sum())
+        self.assertEqual(32 - 3, planes[0, ..., UNMOVED].sum())
+        self.assertEqual([(4, 3)], [tuple(index) for index in np.argwhere(planes[0, ..., EN_PASSANT_PAWN])])
+        self.assertFalse(planes[0, ..., TURN].any())
+
+    def test_suite_positions(self) -> None:
+        self.assert_same_moves([self.create_game(list(position.moves)) for position in CLASSICAL_SUITE])
+
+    def test_random_positions(self) -> None:
+        self.assert_same_moves(self.random_games(24, 80))
+
+    def test_make_moves(self) -> None:
+        for game_mode in self.random_games(6, 60):
+            planes = self.batch.pack([game_mode])
+            boards, codes = self.batch.generate_encoded_moves(planes)
+            new_planes = self.batch.make_moves(planes, boards, codes)
+            for code, after in zip(codes.tolist(), new_planes):
+                game_mode.move(game_mode.decode_move(code))
+                self.assertTrue((self.batch.pack([game_mode])[0] == after).all(), code)
+                game_mode.undo_move(1)
+
+    def test_legal_move_masks(self) -> None:
+        game_mode = self.create_game(CLASSICAL_SUITE[4].moves)
+        masks = self.batch.legal_move_masks(self.batch.pack([game_mode]))
+        codes = game_mode.generate_encoded_legal_moves()
+        # The 4 promotions of the pawn capturing the knight (h7g8) share the mask
+        self.assertEqual(len(codes) - 3, masks.sum())
+        self.assertIn(pack_move(6 * 8 + 7, 7 * 8 + 6, PROMOTION | CAPTURE), codes)
+        self.assertTrue(masks[0, 6 * 8 + 7, 7 * 8 + 6])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+import unittest
+
+from ModularChess.controller.Player import Player
+from ModularChess.game_modes.Cube import Cube
+from ModularChess.game_modes.GameMode import GameState
+from ModularChess.game_modes.Perft import play_moves
+from ModularChess.pieces.King import King
+from ModularChess.utils.Exceptions import InvalidArgumentsError
+
+
+class TestCube(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.game_mode = Cube(Player("First"), Player("Second"))
+        self.game_mode.generate_board()
+
+    def test_board(self):
+        self.assertEqual((4, 4, 4), self.game_mode.board.shape)
+        self.assertEqual(10, sum(len(pieces) for player_pieces in self.game_mode.board.pieces.values()
+                                 for pieces in player_pieces.values()))
+        self.assertEqual(GameState.STARTING, self.game_mode.check_game_state()[0])
+        self.assertEqual(43, len(self.game_mode.generate_moves()))
+
+        self.game_mode.restart()
+        self.assertTrue(self.game_mode.board.is_empty())
+        self.assertIs(self.game_mode.first, self.game_mode.current_player_turn)
+
+    def test_record(self):
+        self.assertEqual("R0 B2 K5 N10 R15 r48 b50 k53 n58 r63 0", self.game_mode.to_fen())
+        play_moves(self.game_mode, ["(0, 0, 0)(1, 0, 0)"])
+        fen = self.game_mode.to_fen()
+        self.assertTrue(fen.endswith(" 1"))
+
+        game_mode = Cube.from_fen(fen)
+        self.assertEqual(fen, game_mode.to_fen())
+        self.assertIs(game_mode.second, game_mode.current_player_turn)
+        self.assertEqual(self.game_mode.position_key, game_mode.position_key)
+        self.assertEqual(1, game_mode.board.pieces[game_mode.first][King][0].n_moves)
+
+        for invalid in ("", "R0", "R0 2", "Q0 0", "R64 0", "R-1 0", "Rx 0"):
+            self.assertRaises(InvalidArgumentsError, Cube.from_fen, invalid)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+import multiprocessing
+import os
+import tempfile
+import unittest
+from dataclasses import replace
+
+from ModularChess.game_modes.Classical import Classical, STARTING_FEN
+from ModularChess.game_modes.GameDatabase import GameDatabase
+from ModularChess.game_modes.Perft import play_moves, move_name
+from ModularChess.game_modes.PositionRecord import PositionRecord
+from ModularChess.utils.Exceptions import InvalidArgumentsError
+
+KIWIPETE = "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"
+GAMES = [(STARTING_FEN, ["e2e4", "e7e5", "g1f3", "b8c6", "f1b5"]),
+         (KIWIPETE, ["e1h1", "a6e2", "c3e2", "h3g2"]),
+         (STARTING_FEN, ["d2d4", "d7d5"]),
+         (STARTING_FEN, [])]
+
+
+def append_games(path: str, n_games: int) -> None:
+    with GameDatabase(path) as database:
+        for _ in range(n_games):
+            game_mode = Classical.from_fen(STARTING_FEN)
+            play_moves(game_mode, ["e2e4", "e7e5"])
+            database.append(game_mode, {"Process": str(os.getpid())})
+
+
+class TestGameDatabase(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "games.db")
+        self.database = GameDatabase(self.path)
+
+    def tearDown(self) -> None:
+        self.database.close()
+        self.directory.cleanup()
+
+    def append_games(self) -> None:
+        for round_number, (fen, moves) in enumerate(GAMES):
+            game_mode = Classical.from_fen(fen)
+            play_moves(game_mode, moves)
+            position = game_mode.to_fen()
+            self.assertEqual(round_number, self.database.append(game_mode, {"Round": str(round_number),
+                                                                            "White": "A & B"}))
+            self.assertEqual(position, game_mode.to_fen())
+
+    def test_records(self) -> None:
+        self.assertEqual(0, len(self.database))
+        with self.assertRaises(IndexError):
+            self.database[0]
+        self.append_games()
+        self.assertEqual(4, len(self.database))
+
+        record = self.database[1]
+        self.assertEqual({"Round": "1", "White": "A & B"}, record.headers)
+        self.assertEqual(4, len(record.moves))
+        self.assertEqual(KIWIPETE, record.start.build().to_fen())
+        self.assertEqual((), self.database[-1].moves)
+        self.assertEqual(["0", "1", "2", "3"], [record.headers["Round"] for record in self.database])
+        # The starting positions are stored once
+        self.assertIs(self.database[0].start, self.database[2].start)
+
+        # Games appended by other databases are seen by the readers
+        with GameDatabase(self.path) as database:
+            database.append_moves(PositionRecord.from_game_mode(Classical.from_fen(STARTING_FEN)).to_bytes(), [])
+        self.assertEqual({}, self.database[4].headers)
+
+    def test_replay(self) -> None:
+        self.append_games()
+        game_mode = Classical.from_fen(STARTING_FEN)
+        for index in (0, 2, 1, 0, 3):
+            fen, moves = GAMES[index]
+            self.assertEqual(moves, [move_name(move) for move in self.database.replay(game_mode, index)])
+            expected = Classical.from_fen(fen)
+            play_moves(expected, moves)
+            self.assertEqual(expected.to_fen(), game_mode.to_fen())
+
+    def test_corrupted_start(self) -> None:
+        record = PositionRecord.from_game_mode(Classical.from_fen(STARTING_FEN))
+        start = record.to_bytes()
+        self.database.append_moves(replace(record, game_type=print).to_bytes(), [])
+        self.database.append_moves(start[:4] + start[4:].replace(b"Classical", b"Classicak", 1), [])
+        self.database.append_moves(start[:-10], [])
+        game_mode = Classical.from_fen(STARTING_FEN)
+        for index in range(3):
+            with self.assertRaises(InvalidArgumentsError):
+                self.database[index]
+            with self.assertRaises(InvalidArgumentsError):
+                list(self.database.replay(game_mode, index))
+
+    def test_processes(self) -> None:
+        processes = [multiprocessing.Process(target=append_games, args=(self.path, 10)) for _ in range(3)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        self.assertEqual(30, len(self.database))
+        self.assertEqual(3, len({record.headers["Process"] for record in self.database}))
+        self.assertTrue(all(len(record.moves) == 2 for record in self.database))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import unittest
+
+from ModularChess.controller.Player import Player
+from ModularChess.game_modes.Classical import Classical
+from ModularChess.movements.BasicMovement import BasicMovement
+from ModularChess.utils.Position import Position
+
+
+class TestGameModeCache(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.white = Player("White")
+        self.black = Player("Black")
+        self.game_mode = Classical(self.white, self.black)
+        self.game_mode.generate_board()
+
+    @staticmethod
+    def play(game_mode: Classical, *moves: str) -> None:
+        for move in moves:
+            piece = game_mode.board[Position(move[:2])]
+            assert piece is not None
+            game_mode.move(BasicMovement(piece, Position(move[2:])))
+
+    def test_hit_and_miss(self):
+        moves = self.game_mode.generate_moves()
+        self.assertIs(moves, self.game_mode.generate_moves())
+        self.assertEqual((1, 1), (self.game_mode.generate_moves_cache.hits, self.game_mode.generate_moves_cache.misses))
+
+        self.play(self.game_mode, "e2e4")
+        self.game_mode.generate_moves()
+        self.game_mode.undo_move(1)
+        self.assertIs(moves, self.game_mode.generate_moves())
+        self.assertEqual(2, len(self.game_mode.generate_moves_cache))
+
+    def test_transposition(self):
+        self.play(self.game_mode, "g1f3", "b8c6", "b1c3")
+        moves = self.game_mode.generate_moves()
+        self.game_mode.undo_move(3)
+
+        self.play(self.game_mode, "b1c3", "b8c6", "g1f3")
+        self.assertIs(moves, self.game_mode.generate_moves())
+
+    def test_cache_per_game(self):
+        other_game_mode = Classical(self.white, self.black)
+        other_game_mode.generate_board()
+        moves = self.game_mode.generate_moves()
+        other_moves = other_game_mode.generate_moves()
+
+        self.assertIsNot(moves, other_moves)
+        self.assertTrue(all(move.piece.board is other_game_mode.board for move in other_moves))
+
+    def test_shared_cache(self):
+        other_game_mode = Classical(self.white, self.black)
+        other_game_mode.generate_board()
+        self.game_mode.generate_moves()
+        other_game_mode.generate_moves_cache = self.game_mode.generate_moves_cache
+
+        # Same position, but the cached moves belong to the pieces of another board
+        other_moves = other_game_mode.generate_moves()
+        self.assertTrue(all(move.piece.board is other_game_mode.board for move in other_moves))
+        self.assertIs(other_moves, self.game_mode.generate_moves_cache.get((other_game_mode.position_key, (), ())))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import io
+import unittest
+
+from ModularChess.game_modes.Classical import Classical, STARTING_FEN
+from ModularChess.game_modes.PGN import PGNGame, read_games, write_game, game_from_game_mode
+from ModularChess.game_modes.SAN import san_to_move
+from ModularChess.utils.Exceptions import InvalidArgumentsError
+
+COLLECTION = """[Event "Casual \\"blitz\\""]
+[White "A"]
+[Black "B"]
+[Result "1-0"]
+
+1. e4 e5 2. Nf3 {A comment
+in two lines} Nc6 (2... d6 3. d4 (3. Bc4)) 3. Bc4!? $1 Nf6?? ; Rest of the line
+4. Ng5 d5 5.exd5 Nxd5 1-0
+
+[Event "Endgame"]
+[SetUp "1"]
+[FEN "4k3/8/8/8/8/8/8/R3K3 b Q - 0 30"]
+
+30... Kd7 31. O-O-O+ *
+% Escaped line
+1. f3 e5 2. g4 Qh4# 0-1
+"""
+
+
+class TestPGN(unittest.TestCase):
+
+    def test_read_games(self) -> None:
+        games = read_games(io.StringIO(COLLECTION))
+        first = next(games)
+        self.assertEqual('Casual "blitz"', first.headers["Event"])
+        self.assertEqual(["e4", "e5", "Nf3", "Nc6", "Bc4", "Nf6", "Ng5", "d5", "exd5", "Nxd5"], first.moves)
+        self.assertEqual("1-0", first.result)
+
+        second, third = games
+        self.assertEqual(["Kd7", "O-O-O+"], second.moves)
+        self.assertEqual("8/3k4/8/8/8/8/8/2KR4 b - - 2 31", second.to_game_mode().to_fen())
+        self.assertEqual({}, third.headers)
+        self.assertEqual("0-1", third.result)
+
+        with self.assertRaises(InvalidArgumentsError):
+            list(read_games(io.StringIO('[Event "Unterminated]\n')))
+
+    def test_write_game(self) -> None:
+        game = PGNGame({"Event": "Endgame", "FEN": "4k3/8/8/8/8/8/8/R3K3 b Q - 0 30"}, ["Kd7", "O-O-O+"])
+        stream = io.StringIO()
+        write_game(stream, game)
+        lines = stream.getvalue().splitlines()
+        self.assertEqual(['[Event "Endgame"]', '[Site "?"]', '[Date "????.??.??"]', '[Round "?"]', '[White "?"]',
+                          '[Black "?"]', '[Result "*"]'], lines[:7])
+        self.assertEqual("30... Kd7 31. O-O-O+ *", lines[-2])
+
+        game = next(read_games(io.StringIO(COLLECTION)))
+        game.moves *= 10
+        stream = io.StringIO()
+        write_game(stream, game)
+        self.assertTrue(all(len(line) <= 80 for line in stream.getvalue().splitlines()))
+        self.assertEqual(game.moves, next(read_games(io.StringIO(stream.getvalue()))).moves)
+
+    def test_game_from_game_mode(self) -> None:
+        game_mode = Classical.from_fen(STARTING_FEN)
+        for san in ("f3", "e5", "g4", "Qh4"):
+            game_mode.move(san_to_move(game_mode, san))
+        game = game_from_game_mode(game_mode, {"Event": "Self-play"})
+        self.assertEqual(["f3", "e5", "g4", "Qh4#"], game.moves)
+        self.assertEqual("0-1", game.result)
+        self.assertNotIn("FEN", game.headers)
+        self.assertEqual(4, len(game_mode.moves))
+
+        game_mode = PGNGame({"FEN": "4k3/8/8/8/8/8/8/R3K3 b Q - 0 30"}, ["Kd7", "O-O-O+"]).to_game_mode()
+        game = game_from_game_mode(game_mode)
+        self.assertEqual("4k3/8/8/8/8/8/8/R3K3 b Q - 0 30", game.headers["FEN"])
+        self.assertEqual("*", game.result)
+
+
+if __name__ == '__main__':
+    unittest.main()
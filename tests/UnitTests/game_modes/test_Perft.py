@@ -0,0 +1,76 @@
+import unittest
+from typing import Type
+
+from ModularChess.controller.BitBoard import BitBoard
+from ModularChess.controller.Board import Board
+from ModularChess.controller.Player import Player
+from ModularChess.game_modes.Classical import Classical
+from ModularChess.game_modes.Cube import Cube
+from ModularChess.game_modes.Perft import CLASSICAL_SUITE, CUBE_SUITE, play_moves, move_name
+from ModularChess.perft import main
+from ModularChess.utils.Exceptions import InvalidArgumentsError, InvalidMoveException
+
+
+class TestPerft(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.white = Player("White")
+        self.black = Player("Black")
+
+    def create_classical(self, board_type: Type[Board] = Board) -> Classical:
+        game_mode = Classical(self.white, self.black, board_type)
+        game_mode.generate_board()
+        return game_mode
+
+    def test_classical_suite(self):
+        for position in CLASSICAL_SUITE:
+            for board_type in (Board, BitBoard):
+                game_mode = self.create_classical(board_type)
+                play_moves(game_mode, position.moves)
+                self.assertEqual(position.nodes[:2], tuple(game_mode.perft(depth).nodes for depth in (1, 2)),
+                                 position.name)
+
+    def test_initial_position(self):
+        self.assertEqual(8902, self.create_classical().perft(3).nodes)
+
+    def test_divide(self):
+        game_mode = self.create_classical()
+        play_moves(game_mode, ("e2e4", "e7e5"))
+        key, player, n_moves = game_mode.position_key, game_mode.current_player_turn, len(game_mode.moves)
+
+        result = game_mode.perft(2, divide=True)
+        self.assertEqual(29, len(result.divide))
+        self.assertEqual(sum(result.divide.values()), result.nodes)
+        self.assertEqual(29, result.divide["g1f3"])
+        self.assertGreater(result.nodes_per_second, 0)
+
+        self.assertEqual(key, game_mode.position_key)
+        self.assertIs(player, game_mode.current_player_turn)
+        self.assertEqual(n_moves, len(game_mode.moves))
+        self.assertEqual(1, game_mode.perft(0).nodes)
+        self.assertIs(self.black, next(game_mode.order))
+
+    def test_invalid_depth(self):
+        self.assertRaises(InvalidArgumentsError, self.create_classical().perft, -1)
+
+    def test_move_name(self):
+        game_mode = self.create_classical()
+        self.assertIn("e2e4", {move_name(move) for move in game_mode.generate_moves()})
+        self.assertRaises(InvalidMoveException, play_moves, game_mode, ["e2e5"])
+
+    def test_multidimensional(self):
+        # Both backends must agree on the counts of the 3D suite
+        for position in CUBE_SUITE:
+            for board_type in (Board, BitBoard):
+                game_mode = Cube(self.white, self.black, board_type)
+                game_mode.generate_board()
+                self.assertEqual(position.nodes[:2], tuple(game_mode.perft(depth).nodes for depth in (1, 2)),
+                                 position.name)
+
+    def test_command(self):
+        self.assertEqual(0, main(["1", "--moves", "e2e4"]))
+        self.assertEqual(0, main(["1", "--suite", "--bitboard"]))
+
+
+if __name__ == '__main__':
+    unittest.main()
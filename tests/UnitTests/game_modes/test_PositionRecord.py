@@ -0,0 +1,142 @@
+import unittest
+from dataclasses import replace
+from itertools import cycle
+from typing import Type, List, Tuple
+from unittest.mock import patch
+
+from ModularChess.controller.BitBoard import BitBoard
+from ModularChess.controller.Board import Board
+from ModularChess.controller.Player import Player
+from ModularChess.game_modes.Classical import Classical
+from ModularChess.game_modes.GameMode import GameMode, GameState
+from ModularChess.game_modes.Perft import play_moves, move_name
+from ModularChess.game_modes.PositionRecord import PositionRecord
+from ModularChess.movements.Movement import Movement
+from ModularChess.pieces.King import King
+from ModularChess.pieces.Knight import Knight
+from ModularChess.pieces.Rook import Rook
+from ModularChess.utils.Exceptions import InvalidArgumentsError
+from ModularChess.utils.Position import Position
+
+
+class Teams(GameMode):
+    """Game mode of three players on a 3D board, where the first and the last players are allies."""
+
+    def __init__(self, first: Player, second: Player, third: Player, board_type: Type[Board] = Board):
+        players = [first, second, third]
+        Player.join_allies([first, third], players)
+        Player.join_allies([second], players)
+        super().__init__(board_type((3, 4, 5)), cycle(players), players, [Rook, Knight, King])
+
+    def generate_board(self) -> None:
+        for player, level in zip(self.players, range(3)):
+            for piece_type, row, column in ((Rook, 0, 0), (Knight, 1, 2), (King, 3, 4)):
+                piece = piece_type(self.board, player, Position([level, row, column]))
+                piece.n_moves = 1
+                self.board.add_piece(piece)
+
+    def check_game_state(self) -> Tuple[GameState, List[Player]]:
+        return GameState.PLAYING, []
+
+    def check_valid_move(self, move: Movement) -> bool:
+        return True
+
+    def restart(self) -> None:
+        pass
+
+    def to_fen(self) -> str:
+        """There isn't a FEN notation of this game, the text of its `PositionRecord` is used instead."""
+        return PositionRecord.from_game_mode(self).to_text()
+
+    @classmethod
+    def from_fen(cls, fen: str) -> "GameMode":
+        return PositionRecord.from_text(fen).build()
+
+
+class TestPositionRecord(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.game_mode = Classical(Player("White", (255, 255, 255)), Player("Black", (0, 0, 0)))
+        self.game_mode.generate_board()
+        # Black can capture en passant
+        play_moves(self.game_mode, ["e2e4", "d7d5", "e4e5", "f7f5", "h2h4", "d5d4", "c2c4"])
+
+    def assertSamePosition(self, expected: GameMode, game_mode: GameMode) -> None:
+        self.assertEqual(expected.position_key, game_mode.position_key)
+        self.assertEqual(expected.to_fen(), game_mode.to_fen())
+        self.assertEqual({move_name(move) for move in expected.generate_moves()},
+                         {move_name(move) for move in game_mode.generate_moves()})
+
+    def test_classical(self):
+        record = PositionRecord.from_game_mode(self.game_mode)
+        self.assertEqual((26, 0, 7), record.state)
+        for copy in (record, PositionRecord.from_text(record.to_text()), PositionRecord.from_bytes(record.to_bytes())):
+            self.assertEqual(record, copy)
+            game_mode = copy.build()
+            self.assertEqual([], game_mode.moves)
+            self.assertSamePosition(self.game_mode, game_mode)
+        self.assertIn("d4c3", {move_name(move) for move in game_mode.generate_moves()})
+        self.assertTrue(record.to_text().startswith("ModularChess.game_modes.Classical.Classical "
+                                                    "ModularChess.controller.Board.Board 8x8 "
+                                                    "White:255.255.255/Black:0.0.0 0/1 1 "))
+
+    def test_apply(self):
+        game_mode = Classical(Player("White", (255, 255, 255)), Player("Black", (0, 0, 0)), BitBoard)
+        game_mode.generate_board()
+        PositionRecord.from_game_mode(self.game_mode).apply(game_mode)
+        self.assertSamePosition(self.game_mode, game_mode)
+        self.assertIsInstance(game_mode.board, BitBoard)
+
+        self.assertRaises(InvalidArgumentsError, PositionRecord.from_game_mode(self.game_mode).apply,
+                          Teams(Player("1"), Player("2"), Player("3")))
+
+    def test_teams(self):
+        game_mode = Teams(Player("First"), Player("Second team"), Player("Third"))
+        game_mode.generate_board()
+        game_mode.move(game_mode.generate_moves()[0])
+        record = PositionRecord.from_game_mode(game_mode)
+        self.assertEqual(((0, 2), (1,)), record.teams)
+        self.assertEqual((3, 4, 5), record.shape)
+        self.assertEqual(1, record.turn)
+        self.assertIn("Second%20team", record.to_text())
+        self.assertEqual(game_mode.position_key, Teams.from_fen(game_mode.to_fen()).position_key)
+
+        for copy in (PositionRecord.from_text(record.to_text()), PositionRecord.from_bytes(record.to_bytes())):
+            self.assertEqual(record, copy)
+            built = copy.build()
+            first, second, third = built.players
+            self.assertEqual([first, third], first.allies)
+            self.assertEqual([second], third.enemies)
+            self.assertIs(second, built.current_player_turn)
+            self.assertEqual(game_mode.position_key, built.position_key)
+            self.assertEqual(sorted(piece.n_moves for pieces in game_mode.board.pieces.values()
+                                    for type_pieces in pieces.values() for piece in type_pieces),
+                             sorted(piece.n_moves for pieces in built.board.pieces.values()
+                                    for type_pieces in pieces.values() for piece in type_pieces))
+
+    def test_invalid(self):
+        text = PositionRecord.from_game_mode(self.game_mode).to_text()
+        for invalid in ("", text.replace("Classical.Classical", "Classical.Unknown"), text.replace(" 8x8 ", " 8xa "),
+                        text.rsplit(" ", 1)[0]):
+            self.assertRaises(InvalidArgumentsError, PositionRecord.from_text, invalid)
+        data = PositionRecord.from_game_mode(self.game_mode).to_bytes()
+        for invalid_data in (b"", data[:-10], b"XXXX" + data[4:]):
+            self.assertRaises(InvalidArgumentsError, PositionRecord.from_bytes, invalid_data)
+
+    def test_foreign_types(self):
+        record = PositionRecord.from_game_mode(self.game_mode)
+        text = record.to_text()
+        invalid_data = [replace(record, game_type=print).to_bytes(), replace(record, board_type=Classical).to_bytes()]
+        with patch("builtins.print") as mocked_print:
+            for invalid in ("builtins.print builtins.print 8x8 a:1.1.1 0 0 - - -",
+                            text.replace("ModularChess.controller.Board.Board", "builtins.print"),
+                            text.replace("ModularChess.game_modes.Classical.Classical", "ModularChess.controller.Board.Board"),
+                            text.replace("ModularChess.game_modes.Classical.Classical", "os.path")):
+                self.assertRaises(InvalidArgumentsError, PositionRecord.from_text, invalid)
+            for data in invalid_data:
+                self.assertRaises(InvalidArgumentsError, PositionRecord.from_bytes, data)
+            mocked_print.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+
+from ModularChess.game_modes.Classical import Classical, STARTING_FEN
+from ModularChess.game_modes.Perft import move_name
+from ModularChess.game_modes.SAN import move_to_san, san_to_move
+from ModularChess.utils.Exceptions import InvalidMoveException
+
+KIWIPETE = "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"
+
+
+class TestSAN(unittest.TestCase):
+
+    def test_round_trip(self) -> None:
+        for fen in (KIWIPETE, "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8",
+                    "4k3/8/8/3pP3/8/8/8/4K3 w - d6 0 1"):
+            game_mode = Classical.from_fen(fen)
+            for move in game_mode.generate_moves():
+                self.assertEqual(move_name(move), move_name(san_to_move(game_mode, move_to_san(game_mode, move))))
+            self.assertEqual(fen, game_mode.to_fen())
+
+    def test_notation(self) -> None:
+        game_mode = Classical.from_fen(KIWIPETE)
+        sans = {move_to_san(game_mode, move) for move in game_mode.generate_moves()}
+        self.assertTrue({"O-O", "O-O-O", "dxe6", "gxh3", "Bxa6", "Qxf6", "Nxf7", "a4"} <= sans)
+
+        game_mode = Classical.from_fen("rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8")
+        sans = {move_to_san(game_mode, move) for move in game_mode.generate_moves()}
+        self.assertTrue({"Nbc3", "Nec3", "dxc8=Q", "dxc8=N", "Kxf2"} <= sans)
+
+    def test_disambiguation(self) -> None:
+        game_mode = Classical.from_fen("R6R/8/8/8/8/8/8/R3k2K w - - 0 1")
+        sans = {move_to_san(game_mode, move) for move in game_mode.generate_moves()}
+        self.assertTrue({"R1a2", "R8a2#", "Rab8+", "Rhb8+", "Rh2#", "Rxe1"} <= sans)
+        self.assertEqual("a8a5", move_name(san_to_move(game_mode, "R8a5+")))
+        self.assertEqual("h8h2", move_name(san_to_move(game_mode, "Rh2")))
+
+    def test_pinned_piece(self) -> None:
+        # The knight of d5 is pinned, so the knight of c6 doesn't need disambiguation
+        game_mode = Classical.from_fen("r1bq1b1r/ppp3pp/2n1k3/3n4/2B5/2N2Q2/PPPP1PPP/R1B1K2R b KQ - 5 8")
+        move = san_to_move(game_mode, "Nb4")
+        self.assertEqual("c6b4", move_name(move))
+        self.assertEqual("Nb4", move_to_san(game_mode, move))
+        self.assertEqual("c6b4", move_name(san_to_move(game_mode, "Ncb4")))
+
+    def test_invalid(self) -> None:
+        game_mode = Classical.from_fen(STARTING_FEN)
+        for san in ("e5", "Ke2", "O-O", "Nd2", "Z9", ""):
+            with self.assertRaises(InvalidMoveException):
+                san_to_move(game_mode, san)
+        self.assertEqual("e2e4", move_name(san_to_move(game_mode, "e4!?")))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+
+from ModularChess.controller.Player import Player
+from ModularChess.game_modes.Classical import Classical
+from ModularChess.game_modes.Perft import play_moves
+from ModularChess.movements.BasicMovement import BasicMovement
+from ModularChess.movements.Castling import Castling
+from ModularChess.movements.EnPassant import EnPassant
+from ModularChess.movements.MoveEncoding import CAPTURE, CASTLING, EN_PASSANT, PROMOTION, decode_move, \
+    destination_square, encode_move, move_flags, origin_square, pack_move, promotion_index
+from ModularChess.movements.Promotion import Promotion
+from ModularChess.utils.Position import Position
+
+
+class TestMoveEncoding(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.white = Player("White")
+        self.black = Player("Black")
+        self.game_mode = Classical(self.white, self.black)
+        self.game_mode.generate_board()
+
+    def test_pack_move(self):
+        code = pack_move(12, 28, CAPTURE | PROMOTION, 3)
+        self.assertEqual(12, origin_square(code))
+        self.assertEqual(28, destination_square(code))
+        self.assertEqual(CAPTURE | PROMOTION, move_flags(code))
+        self.assertEqual(3, promotion_index(code))
+
+        # Squares of boards bigger than 8x8
+        code = pack_move(4095, 511)
+        self.assertEqual((4095, 511, 0), (origin_square(code), destination_square(code), move_flags(code)))
+
+    def test_initial_position(self):
+        codes = self.game_mode.generate_encoded_moves()
+        self.assertEqual(20, len(codes))
+        self.assertIn(pack_move(12, 28), codes)
+        self.assertIs(codes, self.game_mode.generate_encoded_moves())
+
+    def test_decode_same_as_moves(self):
+        play_moves(self.game_mode, ("e2e4", "d7d5", "e4d5", "c7c5"))
+        moves = self.game_mode.generate_moves()
+        self.assertListEqual(moves, [decode_move(self.game_mode, code) for code in
+                                     self.game_mode.generate_encoded_legal_moves()])
+        for move in moves:
+            self.assertEqual(move, decode_move(self.game_mode, encode_move(move)))
+
+    def test_en_passant(self):
+        play_moves(self.game_mode, ("e2e4", "a7a6", "e4e5", "d7d5"))
+        codes = self.game_mode.generate_encoded_moves()
+        en_passant = next(code for code in codes if move_flags(code) & EN_PASSANT)
+        self.assertEqual(CAPTURE | EN_PASSANT, move_flags(en_passant))
+
+        move = self.game_mode.decode_move(en_passant)
+        self.assertIsInstance(move, EnPassant)
+        self.assertIs(self.game_mode.board[Position("d5")], move.captured_pieces()[0])
+
+    def test_castling(self):
+        play_moves(self.game_mode, ("e2e4", "e7e5", "g1f3", "b8c6", "f1c4", "g8f6", "d2d3", "f8c5"))
+        castling = [code for code in self.game_mode.generate_encoded_moves() if move_flags(code) & CASTLING]
+        self.assertListEqual([pack_move(4, 7, CASTLING)], castling)
+        self.assertIsInstance(self.game_mode.decode_move(castling[0]), Castling)
+
+    def test_promotion(self):
+        play_moves(self.game_mode, ("h2h4", "g7g5", "h4g5", "f8g7", "g5g6", "e7e6", "g6h7", "b8c6"))
+        promotions = [decode_move(self.game_mode, code) for code in self.game_mode.generate_encoded_moves()
+                      if move_flags(code) & PROMOTION]
+        self.assertEqual(4, len(promotions))
+        self.assertTrue(all(isinstance(move, Promotion) and move.captured_pieces() for move in promotions))
+        self.assertSetEqual({"Q", "R", "B", "N"}, {move.promoted_piece.abbreviation() for move in promotions})
+        self.assertNotIn(BasicMovement, {type(move) for move in promotions})
+
+
+if __name__ == '__main__':
+    unittest.main()
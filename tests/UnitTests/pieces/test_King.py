@@ -69,6 +69,13 @@ class TestKing(BaseTestPieces):
         self.assertIsEmpty(self.king.check_piece_valid_move(Position("g1")))
         self.assertIsNotEmpty(self.king.check_piece_valid_move(Position("a1")))
 
+    def test_king_in_check(self):
+        enemy_piece = Rook(self.board, self.other_player, Position("e8"))
+        self.board.add_piece(enemy_piece)
+
+        self.assertIsEmpty(self.king.check_piece_valid_move(Position("h1")))
+        self.assertIsEmpty(self.king.check_piece_valid_move(Position("a1")))
+
     def test_piece_in_path(self):
         ally_piece = Empty(self.board, self.main_player, Position("c1"))
         self.board.add_piece(ally_piece)
@@ -0,0 +1,127 @@
+import io
+import time
+import unittest
+from typing import List
+
+from ModularChess.uci import UCIEngine, main, parse_go
+from ModularChess.game_modes.Perft import move_name
+
+
+class TestUCIEngine(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.lines: List[str] = []
+        self.engine = UCIEngine(self.lines.append)
+
+    def tearDown(self) -> None:
+        self.engine.handle("quit")
+
+    def best_move(self) -> str:
+        if self.engine.search_thread is not None:
+            self.engine.search_thread.join()
+        return next(line for line in reversed(self.lines) if line.startswith("bestmove")).split()[1]
+
+    def test_handshake(self) -> None:
+        self.engine.handle("uci")
+        self.assertEqual("id name ModularChess", self.lines[0])
+        self.assertEqual("uciok", self.lines[-1])
+        self.assertTrue(any(line.startswith("option name Hash") for line in self.lines))
+        self.engine.handle("isready")
+        self.assertEqual("readyok", self.lines[-1])
+        self.assertFalse(self.engine.handle("quit"))
+
+    def test_position(self) -> None:
+        self.engine.handle("position startpos moves e2e4 e7e5 g1f3 b8c6 f1c4 g8f6 e1g1")
+        game_mode = self.engine.game_mode
+        self.assertEqual(7, len(game_mode.moves))
+        # Castling uses the destination of the king
+        self.assertEqual("e1h1", move_name(game_mode.moves[-1]))
+        self.assertIs(game_mode.black, game_mode.current_player_turn)
+
+        self.engine.handle("position startpos moves e2e5")
+        self.assertEqual("info string Illegal move e2e5", self.lines[-1])
+
+        fen = "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1"
+        self.engine.handle(f"position fen {fen} moves e1c1")
+        self.assertEqual("r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/2KR3R b kq - 1 1",
+                         self.engine.game_mode.to_fen())
+        self.engine.handle("position fen 8/8/8 w - - 0 1")
+        self.assertEqual("info string Invalid FEN 8/8/8 w - - 0 1", self.lines[-1])
+        # The previous position is kept
+        self.assertEqual("r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/2KR3R b kq - 1 1",
+                         self.engine.game_mode.to_fen())
+        self.assertIs(game_mode, self.engine.game_mode)
+
+    def test_go_depth(self) -> None:
+        # The white queen can be captured by the bishop
+        self.engine.handle("position startpos moves e2e4 d7d5 d1g4")
+        self.engine.handle("go depth 2")
+        self.assertEqual("c8g4", self.best_move())
+        info = [line for line in self.lines if " pv " in line]
+        self.assertEqual(2, len(info))
+        self.assertIn("nps", info[-1])
+        self.assertTrue(info[-1].startswith("info depth 2"))
+
+    def test_consecutive_searches(self) -> None:
+        # The second search keeps the state of the first one (history, stop flag) without breaking
+        for position in ("position startpos", "position startpos moves e2e4"):
+            self.lines.clear()
+            self.engine.handle(position)
+            self.engine.handle("go movetime 300")
+            self.best_move()
+            depths = [int(line.split()[2]) for line in self.lines if " pv " in line]
+            self.assertGreater(max(depths), 1)
+        self.assertIs(self.engine.game_mode.black, self.engine.game_mode.current_player_turn)
+
+    def test_searches_of_both_players(self) -> None:
+        # White without queen, the scores of the black search must not be reused by the white one
+        fen = "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNB1KBNR b KQkq - 0 1"
+        self.engine.handle(f"position fen {fen} moves e7e5 b1c3")
+        self.engine.handle("go depth 2")
+        self.best_move()
+        self.lines.clear()
+        self.engine.handle(f"position fen {fen} moves e7e5")
+        self.engine.handle("go depth 3")
+        self.best_move()
+        info = [line for line in self.lines if " pv " in line]
+        self.assertIn("score cp -900", info[-1])
+
+    def test_stop(self) -> None:
+        self.engine.handle("go infinite")
+        time.sleep(0.1)
+        start = time.perf_counter()
+        self.engine.handle("stop")
+        self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertIn(self.best_move(), ("a2a3", "a2a4", "b1a3", "b1c3", "b2b3", "b2b4", "c2c3", "c2c4", "d2d3", "d2d4",
+                                         "e2e3", "e2e4", "f2f3", "f2f4", "g1f3", "g1h3", "g2g3", "g2g4", "h2h3", "h2h4"))
+
+    def test_ponder(self) -> None:
+        self.engine.handle("go ponder movetime 50")
+        time.sleep(0.1)
+        # The best move isn't sent until the pondered move is played
+        self.assertFalse(any(line.startswith("bestmove") for line in self.lines))
+        self.engine.handle("ponderhit")
+        self.best_move()
+
+    def test_movetime(self) -> None:
+        start = time.perf_counter()
+        self.engine.handle("go wtime 1000 btime 1000 winc 10")
+        self.best_move()
+        self.assertLess(time.perf_counter() - start, 1)
+
+    def test_set_option(self) -> None:
+        self.engine.handle("setoption name Hash value 1")
+        self.assertEqual(1, self.engine.hash_size)
+        self.engine.handle("setoption name Threads value 2")
+        self.assertEqual(2, self.engine.threads)
+
+    def test_parse_go(self) -> None:
+        self.assertEqual({"wtime": 1000, "btime": 900, "movestogo": 5, "ponder": 1},
+                         parse_go("wtime 1000 btime 900 movestogo 5 ponder".split()))
+
+    def test_main(self) -> None:
+        self.assertEqual(0, main(io.StringIO("isready\nquit\n")))
+
+
+if __name__ == '__main__':
+    unittest.main()
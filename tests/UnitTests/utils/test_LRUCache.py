@@ -0,0 +1,49 @@
+import unittest
+
+from ModularChess.utils.Exceptions import InvalidArgumentsError
+from ModularChess.utils.LRUCache import LRUCache
+
+
+class TestLRUCache(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.cache: LRUCache[str] = LRUCache(2)
+
+    def test_invalid_capacity(self):
+        self.assertRaises(InvalidArgumentsError, LRUCache, 0)
+        with self.assertRaises(InvalidArgumentsError):
+            self.cache.capacity = -1
+
+    def test_get_and_put(self):
+        self.assertIsNone(self.cache.get("a"))
+        self.cache.put("a", "1")
+        self.assertEqual("1", self.cache.get("a"))
+        self.assertIn("a", self.cache)
+        self.assertEqual(1, len(self.cache))
+        self.assertEqual((1, 1), (self.cache.hits, self.cache.misses))
+        self.assertEqual(0.5, self.cache.hit_rate)
+
+    def test_eviction(self):
+        self.cache.put("a", "1")
+        self.cache.put("b", "2")
+        self.cache.get("a")  # "b" becomes the least recently used
+        self.cache.put("c", "3")
+
+        self.assertNotIn("b", self.cache)
+        self.assertIn("a", self.cache)
+        self.assertIn("c", self.cache)
+
+        self.cache.capacity = 1
+        self.assertListEqual(["c"], list(self.cache.elements))
+
+    def test_clear(self):
+        self.cache.put("a", "1")
+        self.cache.get("a")
+        self.cache.discard("b")
+        self.cache.clear()
+        self.assertEqual(0, len(self.cache))
+        self.assertEqual((0, 0), (self.cache.hits, self.cache.misses))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+
+from ModularChess.controller.Board import Board
+from ModularChess.utils.MoveTables import get_move_tables, MoveTables
+from ModularChess.utils.Position import Position
+
+
+class TestMoveTables(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.tables = get_move_tables((8, 8))
+        self.tables_3d = get_move_tables((8, 8, 8))
+
+    def test_cache(self):
+        self.assertIs(self.tables, get_move_tables((8, 8)))
+        self.assertIs(self.tables, Board().tables)
+        self.assertIsNot(self.tables, get_move_tables((8, 8, 8)))
+
+    def test_square_index(self):
+        self.assertEqual(0, self.tables.square_index(Position("a1")))
+        self.assertEqual(8 * 3 + 4, self.tables.square_index(Position("e4")))
+        self.assertEqual(64 * 1 + 8 * 2 + 3, self.tables_3d.square_index(Position([1, 2, 3])))
+        for square, position in enumerate(self.tables_3d.positions):
+            self.assertEqual(square, self.tables_3d.square_index(position))
+
+    def test_positions_are_read_only(self):
+        position = self.tables.positions[0]
+        with self.assertRaises(ValueError):
+            position += 1
+
+    def test_rook_rays(self):
+        rays = self.tables.rook_rays[self.tables.square_index(Position("a1"))]
+        self.assertEqual(2, len(rays))
+        a_file = ("a2", "a3", "a4", "a5", "a6", "a7", "a8")
+        self.assertIn(tuple(self.tables.square_index(Position(pos)) for pos in a_file), rays)
+        self.assertEqual(14, sum(len(ray) for ray in rays))
+        self.assertEqual(21, sum(len(ray) for ray in self.tables_3d.rook_rays[self.tables_3d.square_index((3, 3, 3))]))
+
+    def test_bishop_rays(self):
+        rays = self.tables.bishop_rays[self.tables.square_index(Position("d4"))]
+        self.assertEqual(4, len(rays))
+        self.assertEqual(13, sum(len(ray) for ray in rays))
+        self.assertEqual(12, len(self.tables_3d.bishop_directions))
+        self.assertEqual(39, sum(len(ray) for ray in self.tables_3d.bishop_rays[self.tables_3d.square_index((3, 3, 3))]))
+
+    def test_jumps(self):
+        self.assertEqual(2, len(self.tables.knight_jumps[0]))
+        self.assertEqual(8, len(self.tables.knight_jumps[self.tables.square_index(Position("d4"))]))
+        self.assertEqual(24, len(self.tables_3d.knight_jumps[self.tables_3d.square_index((3, 3, 3))]))
+
+        self.assertEqual(3, len(self.tables.king_jumps[0]))
+        self.assertEqual(8, len(self.tables.king_jumps[self.tables.square_index(Position("d4"))]))
+        self.assertEqual(26, len(self.tables_3d.king_jumps[self.tables_3d.square_index((3, 3, 3))]))
+
+    def test_uneven_shape(self):
+        tables = MoveTables((3, 5))
+        self.assertEqual(15, tables.n_squares)
+        self.assertEqual((5, 1), tables.strides)
+        self.assertEqual(6, sum(len(ray) for ray in tables.rook_rays[tables.square_index((1, 2))]))
+        self.assertEqual(4, sum(len(ray) for ray in tables.bishop_rays[tables.square_index((1, 2))]))
+
+
+if __name__ == '__main__':
+    unittest.main()
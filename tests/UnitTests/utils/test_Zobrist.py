@@ -0,0 +1,121 @@
+import unittest
+
+from ModularChess.controller.BitBoard import BitBoard
+from ModularChess.controller.Board import Board
+from ModularChess.controller.Player import Player
+from ModularChess.game_modes.Classical import Classical
+from ModularChess.movements.BasicMovement import BasicMovement
+from ModularChess.pieces.King import King
+from ModularChess.pieces.Knight import Knight
+from ModularChess.pieces.Rook import Rook
+from ModularChess.utils.Position import Position
+from ModularChess.utils.Zobrist import Zobrist, ZOBRIST
+
+
+def compute_zobrist_key(board: Board) -> int:
+    key = 0
+    for pieces in board.pieces.values():
+        for same_pieces in pieces.values():
+            for piece in same_pieces:
+                key ^= ZOBRIST.piece_key(piece, board.square_index(piece.position))
+    return key
+
+
+class TestZobrist(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.white = Player("White")
+        self.black = Player("Black")
+        self.game_mode = Classical(self.white, self.black)
+        self.game_mode.generate_board()
+
+    def play(self, *moves: str) -> None:
+        for move in moves:
+            piece = self.game_mode.board[Position(move[:2])]
+            assert piece is not None
+            self.game_mode.move(BasicMovement(piece, Position(move[2:])))
+
+    def test_deterministic_keys(self):
+        self.assertEqual(Zobrist().key("test", 1), Zobrist().key("test", 1))
+        self.assertNotEqual(Zobrist().key("test", 1), Zobrist().key("test", 2))
+        self.assertNotEqual(Zobrist(0).key("test", 1), Zobrist(1).key("test", 1))
+
+    def test_incremental_key(self):
+        self.assertNotEqual(0, self.game_mode.board.zobrist_key)
+        self.assertEqual(compute_zobrist_key(self.game_mode.board), self.game_mode.board.zobrist_key)
+
+        initial_key = self.game_mode.position_key
+        self.play("g1f3", "d7d5", "f3e5", "b8c6", "e5c6")
+        self.assertEqual(compute_zobrist_key(self.game_mode.board), self.game_mode.board.zobrist_key)
+
+        self.game_mode.undo_move(5)
+        self.assertEqual(initial_key, self.game_mode.position_key)
+
+    def test_side_to_move(self):
+        initial_key = self.game_mode.position_key
+        self.play("g1f3", "g8f6", "f3g1", "f6g8")
+        self.assertEqual(initial_key, self.game_mode.position_key)
+
+        self.play("g1f3")
+        self.assertNotEqual(initial_key, self.game_mode.position_key)
+        self.assertEqual(ZOBRIST.player_key(self.black), self.game_mode.position_key ^ self.game_mode.board.zobrist_key)
+
+    def test_transposition(self):
+        self.play("g1f3", "b8c6", "b1c3")
+        key = self.game_mode.position_key
+
+        other_game_mode = Classical(self.white, self.black)
+        other_game_mode.generate_board()
+        self.game_mode = other_game_mode
+        self.play("b1c3", "b8c6", "g1f3")
+        self.assertEqual(key, other_game_mode.position_key)
+
+    def test_castling_rights(self):
+        self.play("e2e4", "e7e5")
+        key = self.game_mode.position_key
+        self.play("e1e2", "e8e7", "e2e1", "e7e8")
+
+        self.assertNotEqual(key, self.game_mode.position_key)
+        self.assertEqual(compute_zobrist_key(self.game_mode.board), self.game_mode.board.zobrist_key)
+
+        self.game_mode.undo_move(4)
+        self.assertEqual(key, self.game_mode.position_key)
+
+    def test_en_passant(self):
+        self.play("g1f3")
+        key = self.game_mode.position_key
+        self.play("e7e5")
+        self.assertEqual(ZOBRIST.en_passant_key(4), self.game_mode.en_passant_key())
+
+        self.game_mode.undo_move(1)
+        self.play("e7e6")
+        self.assertEqual(0, self.game_mode.en_passant_key())
+        self.game_mode.undo_move(1)
+        self.assertEqual(key, self.game_mode.position_key)
+
+    def test_multidimensional_multiplayer(self):
+        players = [Player(str(i)) for i in range(3)]
+        for player in players:
+            Player.join_allies([player], players)
+
+        for board in (Board((4, 4, 4)), BitBoard((3, 4, 3, 5))):
+            pieces = [Rook(board, players[0], Position([0] * board.dimensions)),
+                      Knight(board, players[1], Position([1] * board.dimensions)),
+                      King(board, players[2], Position([2] * board.dimensions))]
+            for piece in pieces:
+                board.add_piece(piece)
+            key = board.zobrist_key
+            self.assertEqual(compute_zobrist_key(board), key)
+
+            move = pieces[0].get_piece_valid_moves()[0]
+            move.move()
+            self.assertNotEqual(key, board.zobrist_key)
+            self.assertEqual(compute_zobrist_key(board), board.zobrist_key)
+
+            move.inverse().move()
+            self.assertEqual(key, board.zobrist_key)
+            self.assertEqual(0, pieces[0].n_moves)
+
+
+if __name__ == '__main__':
+    unittest.main()